@@ -12,6 +12,14 @@ a = Analysis(
     binaries=[],
     datas=[
         ('Settings', 'Settings'),  # Include Settings directory
+        # Worker scripts (translation, Whisper) run as plain scripts with an external Python
+        ('actions/lb_files/subtitles/_translate_worker.py', 'actions/lb_files/subtitles'),
+        ('actions/lb_files/subtitles/translate_srt_argos.py', 'actions/lb_files/subtitles'),
+        ('actions/lb_files/subtitles/srt_cues.py', 'actions/lb_files/subtitles'),
+        ('actions/lb_files/subtitles/translation_memory.py', 'actions/lb_files/subtitles'),
+        ('actions/lb_files/subtitles/_whisper_worker.py', 'actions/lb_files/subtitles'),
+        ('actions/lb_files/subtitles/whisper_chunks.py', 'actions/lb_files/subtitles'),
+        ('actions/lb_files/subtitles/_sync_worker.py', 'actions/lb_files/subtitles'),
     ],
     hiddenimports=[
         # Core modules
@@ -23,6 +31,10 @@ a = Analysis(
         'utils.text_helpers',
         'utils.debug_helpers',
         'utils.settings_helpers',
+        'utils.media_probe',
+        'utils.scan_cache',
+        'utils.filter_index',
+        'utils.lang_index',
         'mkvapp',
         'mkvapp.lifecycle',
         'mkvapp.core',
@@ -50,6 +62,7 @@ a = Analysis(
         'widgets',
         'widgets.base_textbox',
         'widgets.filter_listbox',
+        'widgets.virtual_listbox',
         'widgets.config_frame',
         'widgets.debug_frame',
         'widgets.entry_factory',
@@ -67,8 +80,19 @@ a = Analysis(
         'actions.lb_files.videos',
         'actions.lb_files.videos.vids_mgr',
         'actions.lb_files.videos.video_inspector',
+        'actions.lb_files.videos.transcode_queue',
+        'actions.lb_files.videos.preflight',
+        'actions.lb_files.videos.remux_plan',
+        'actions.lb_files.videos.mkv_backend',
         'actions.lb_files.subtitles',
         'actions.lb_files.subtitles.sub_mgr',
+        'actions.lb_files.subtitles.srt_cues',
+        'actions.lb_files.subtitles.translation_memory',
+        'actions.lb_files.subtitles._worker_protocol',
+        'actions.lb_files.subtitles.translate_pool',
+        'actions.lb_files.subtitles.lang_detection',
+        'actions.lb_files.subtitles.whisper_server',
+        'actions.lb_files.subtitles.sync_service',
         'actions.tb_info',
         'actions.tb_folders',
         'actions.tb_debug',
@@ -105,6 +129,7 @@ a = Analysis(
         'subprocess',
         'pathlib',
         'json',
+        'sqlite3',
         'yaml',
         'logging',
         'functools',
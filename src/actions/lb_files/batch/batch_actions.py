@@ -159,6 +159,24 @@ def run_batch():
         label = queue_snapshot[step_idx]
         s.batch_current_label = label
 
+        # Consecutive stream-copy steps (Transform -> MKV, Remove All Subs, Embed Sub)
+        # run as one ffmpeg pass per file instead of one full rewrite per step
+        from actions.lb_files.videos.remux_plan import remux_run
+        end = remux_run(queue_snapshot, step_idx)
+        if end > step_idx:
+            from actions.lb_files.videos.vids_mgr import remux_combined
+            labels = queue_snapshot[step_idx:end]
+            s.batch_current_label = " + ".join(labels)
+            update_tbinfo(f"  ▶ [{step_idx+1}-{end}/{total}] {s.batch_current_label} (één pass) ...", "info")
+            s.batch_step_done = True
+            try:
+                remux_combined(labels)
+            except Exception as exc:
+                update_tbinfo(f"  ❌ [{step_idx+1}-{end}/{total}] Fout bij '{s.batch_current_label}': {exc}", "rood")
+                s.batch_step_done = True
+            s.app.after(POLL_INTERVAL_MS, lambda idx=end - 1, lbl=labels[-1]: _wait_done(idx, lbl))
+            return
+
         entry = global_menu_registry.get(label)
         if not entry or not callable(entry.get("func")):
             update_tbinfo(
@@ -1,4 +1,4 @@
 from .download import get_opensub_api_key, download_subtitles_for_selected, _download_subtitle_logic, _download_with_opensubtitles, _download_with_filebot, process_selected_files
 from .extract import extract_subtitles, extract_subtitles_from_directory, validate_mkvextract, extract_size, convert_to_mkv_cli, backup_original, process_file, process_directory
-from .sub_mgr import show_srt_file, copy_original, clean_subtitle, clean_directory, clean_and_fix_subtitles, subs_rename, sub_translate, sub_sync, sub_test, sub_extract, sub_all_extract, get_num_subs, subs_resync, check_language, random_line, lang_detect
+from .sub_mgr import show_srt_file, copy_original, clean_subtitle, clean_directory, clean_and_fix_subtitles, subs_rename, sub_translate, sub_sync, sub_test, sub_extract, sub_all_extract, get_num_subs, subs_resync, check_language, random_line, lang_detect, lang_detect_many
 from .whisper_srt import speech_to_srt
\ No newline at end of file
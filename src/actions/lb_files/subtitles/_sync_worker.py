@@ -0,0 +1,102 @@
+"""
+Standalone worker script for subtitle synchronisation with ffsubsync.
+Started once per Sync Srt run by sync_service.py; ffsubsync and numpy are
+imported once and every video's speech reference is decoded only once.
+
+The speech reference of a video is cached as .npz (ffsubsync's own
+--serialize-speech format) in the cache dir, keyed on path + size + mtime,
+so further SRTs for that video - in this run or a later one - are aligned
+against the cached reference without decoding the audio again.
+
+Protocol on stdin/stdout, one line each:
+  worker -> "READY"                             idle, waiting for a job
+  parent -> {"id", "video", "srt", "output"} as JSON, or an empty line to quit
+  worker -> "DONE:<id>:<cache|decoded>:<offset seconds>"
+  worker -> "ERROR:<id>:<message>"
+Other output is informational only.
+
+Args: cache_dir
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+
+# Cached references kept (a 2 hour film is well under 1 MB)
+MAX_CACHE_FILES = 200
+
+
+def cache_path(cache_dir, video):
+    st = os.stat(video)
+    key = f"{os.path.normcase(os.path.abspath(video))}|{st.st_size}|{st.st_mtime_ns}"
+    return os.path.join(cache_dir, hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest() + ".npz")
+
+
+def prune_cache(cache_dir, keep=MAX_CACHE_FILES):
+    try:
+        files = [os.path.join(cache_dir, f) for f in os.listdir(cache_dir) if f.endswith(".npz")]
+    except OSError:
+        return
+    files.sort(key=os.path.getmtime, reverse=True)
+    for path in files[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def run_ffsubsync(reference, srt, output, serialize=False):
+    """ffsubsync in-process; returns its result dict."""
+    from ffsubsync.ffsubsync import make_parser, run
+    argv = [reference, "-i", srt, "-o", output]
+    if serialize:
+        argv.append("--serialize-speech")
+    result = run(make_parser().parse_args(argv))
+    if result.get("retval", 1) != 0 or not os.path.exists(output):
+        raise RuntimeError(f"ffsubsync mislukt (code {result.get('retval')})")
+    return result
+
+
+def sync(job, cache_dir):
+    """(reference source, result) for one SRT."""
+    video, cached = job["video"], cache_path(cache_dir, job["video"])
+    if os.path.exists(cached):
+        os.utime(cached)
+        return "cache", run_ffsubsync(cached, job["srt"], job["output"])
+
+    # --serialize-speech writes <video>.npz next to the video; never touch a user's own file
+    side = os.path.splitext(video)[0] + ".npz"
+    serialize = not os.path.exists(side)
+    result = run_ffsubsync(video, job["srt"], job["output"], serialize)
+    if serialize and os.path.exists(side):
+        try:
+            shutil.move(side, cached)
+        except OSError as e:
+            print(f"WARN:Referentie niet gecachet: {e}", flush=True)
+        prune_cache(cache_dir)
+    return "decoded", result
+
+
+def main():
+    cache_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.getcwd(), "sync_cache")
+    os.makedirs(cache_dir, exist_ok=True)
+
+    while True:
+        print("READY", flush=True)
+        line = sys.stdin.readline()
+        if not line.strip():
+            break
+
+        job = json.loads(line)
+        try:
+            source, result = sync(job, cache_dir)
+            offset = result.get("offset_seconds") or 0.0
+            print(f"DONE:{job['id']}:{source}:{offset:.3f}", flush=True)
+        except Exception as e:
+            message = str(e).replace("\n", " ")
+            print(f"ERROR:{job['id']}:{message}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Standalone worker script for subtitle translation.
+Started (several at once) by translate_pool.py; each worker keeps its own
+loaded Argos models between jobs.
+
+Protocol on stdin/stdout, one line each:
+  worker -> "READY"                      idle, waiting for a job
+  parent -> {"id", "input", "output", "from", "to"} as JSON, or an empty line to quit
+  worker -> "PROGRESS:<id>:<current>:<total>"
+  worker -> "DONE:<id>:<memory hits>:<memory misses>"
+  worker -> "ERROR:<id>:<message>"
+Other output (model downloads, warnings) is informational only.
+
+Args: [translation memory db path or "-"]
+"""
+import json
+import os
+import sys
+
+
+def main():
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import translate_srt_argos as tsa
+
+    memory = None
+    if len(sys.argv) > 1 and sys.argv[1] != "-":
+        from translation_memory import TranslationMemory
+        memory = TranslationMemory(sys.argv[1])
+
+    while True:
+        print("READY", flush=True)
+        line = sys.stdin.readline()
+        if not line.strip():
+            break
+
+        job = json.loads(line)
+        job_id = job["id"]
+        reported = [-1]
+
+        def progress(current, total):
+            # Whole percents only: keeps the pipe quiet on long files
+            percent = current * 100 // total if total else 100
+            if percent != reported[0] or current == total:
+                reported[0] = percent
+                print(f"PROGRESS:{job_id}:{current}:{total}", flush=True)
+
+        try:
+            translation = tsa.load_translation_model(job["from"], job["to"])
+            if memory is not None:
+                memory.reset_stats()
+            tsa.translate_srt(job["input"], job["output"], translation, progress_callback=progress,
+                              memory=memory, lang_pair=(job["from"], job["to"]))
+            stats = memory.stats() if memory is not None else {"hits": 0, "misses": 0}
+            print(f"DONE:{job_id}:{stats['hits']}:{stats['misses']}", flush=True)
+        except Exception as e:
+            message = str(e).replace("\n", " ")
+            print(f"ERROR:{job_id}:{message}", flush=True)
+
+    if memory is not None:
+        memory.close()
+
+
+if __name__ == "__main__":
+    main()
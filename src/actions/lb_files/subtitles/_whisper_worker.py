@@ -1,13 +1,29 @@
 """
 Standalone worker script for faster-whisper transcription.
-Called as a subprocess by whisper_srt.py.
-Writes progress lines to stdout: "PROGRESS:0.45"
-Writes result to the output SRT path passed as argument.
-On error writes "ERROR:<message>" to stdout.
+Called as a subprocess by whisper_srt.py (crash isolation: Intel/CUDA DLL
+crashes end the worker, not the app).
+
+One-shot:  video_path out_srt model_size device language
+Resident:  --serve model_size device idle_timeout_seconds [chunk_workers]
+  The model is loaded once, then jobs are read from stdin:
+    worker -> "READY"                             idle, waiting for a job
+    parent -> {"video", "output", "language", "ffmpeg"} as JSON, or an empty line to quit
+  and each job reports like a one-shot run. After idle_timeout_seconds
+  without a job the worker writes "IDLE" and exits.
+  On CPU with chunk_workers > 1 and an ffmpeg path, a job is transcribed
+  in VAD chunks by that many parallel model workers (whisper_chunks.py);
+  finished chunks survive a crash and are reused by the next run.
+
+Writes progress lines to stdout: "PROGRESS:0.45", "LANG:en", "INFO:..",
+"WARN:..", then "DONE:<out_srt>" or "ERROR:<message>".
+Writes result to the output SRT path: streamed to <out_srt>.part with a
+<out_srt>.ckpt checkpoint, so a rerun on the same video resumes there.
 """
 import sys
 import os
-import datetime
+import json
+import queue
+import threading
 
 
 def format_timestamp(seconds: float) -> str:
@@ -19,60 +35,257 @@ def format_timestamp(seconds: float) -> str:
     return f"{h:02d}:{m:02d}:{s:02d},{millis:03d}"
 
 
-def main():
-    # Args: video_path out_srt model_size device language
-    if len(sys.argv) < 6:
-        print("ERROR:Missing arguments")
-        sys.exit(1)
+def load_model(model_size, device, workers=1):
+    """(model, device actually used); on CPU the cores are split over workers."""
+    from faster_whisper import WhisperModel
+    import torch
 
-    video_path = sys.argv[1]
-    out_srt    = sys.argv[2]
-    model_size = sys.argv[3]
-    device     = sys.argv[4]
-    language   = sys.argv[5] if sys.argv[5] != "None" else None
+    if device == "cuda" and not torch.cuda.is_available():
+        print("WARN:CUDA niet beschikbaar, gebruik CPU", flush=True)
+        device = "cpu"
+
+    compute_type = "float16" if device == "cuda" else "int8"
+    print(f"INFO:Model laden ({model_size} op {device.upper()})", flush=True)
+    if device == "cpu" and workers > 1:
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        return WhisperModel(model_size, device=device, compute_type=compute_type,
+                            cpu_threads=threads, num_workers=workers), device
+    return WhisperModel(model_size, device=device, compute_type=compute_type), device
+
+
+# Checkpoint after this many segments (and always at the end)
+CHECKPOINT_EVERY = 10
 
+
+def _fsync(f):
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def _load_checkpoint(ckpt_path, part_path, signature):
+    """Saved {"offset", "count", "end", "language"} when it matches this video."""
     try:
-        from faster_whisper import WhisperModel
-        import torch
+        with open(ckpt_path, encoding="utf-8") as f:
+            ckpt = json.load(f)
+        if ckpt.get("signature") == signature and os.path.getsize(part_path) >= ckpt["offset"]:
+            return ckpt
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
 
-        if device == "cuda" and not torch.cuda.is_available():
-            print("WARN:CUDA niet beschikbaar, gebruik CPU", flush=True)
-            device = "cpu"
+def _save_checkpoint(ckpt_path, data):
+    tmp = ckpt_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+        _fsync(f)
+    os.replace(tmp, ckpt_path)
 
-        compute_type = "float16" if device == "cuda" else "int8"
-        print(f"INFO:Model laden ({model_size} op {device.upper()})", flush=True)
 
-        model = WhisperModel(model_size, device=device, compute_type=compute_type)
+def transcribe(model, video_path, out_srt, language):
+    """Segments are appended to <out_srt>.part as they arrive; a checkpoint
+    (<out_srt>.ckpt) records how far the file is valid. A rerun on the same
+    video resumes after the last checkpointed segment. out_srt only appears
+    when the transcription is complete."""
+    part_path = out_srt + ".part"
+    ckpt_path = out_srt + ".ckpt"
+    st = os.stat(video_path)
+    signature = {"video": os.path.abspath(video_path), "size": st.st_size,
+                 "mtime_ns": st.st_mtime_ns, "language": language}
 
-        lang_str = language or "auto-detect"
-        print(f"INFO:Transcriberen ({lang_str}): {os.path.basename(video_path)}", flush=True)
+    ckpt = _load_checkpoint(ckpt_path, part_path, signature)
+    options = {}
+    if ckpt and ckpt["end"] > 0:
+        # Resume: the language is known, skip the audio that is already done
+        options["clip_timestamps"] = [ckpt["end"]]
+        language = ckpt["language"] or language
+        print(f"INFO:Hervat vanaf {format_timestamp(ckpt['end'])} "
+              f"({ckpt['count']} segmenten al klaar)", flush=True)
+    else:
+        ckpt = {"offset": 0, "count": 0, "end": 0.0, "language": None}
 
+    lang_str = language or "auto-detect"
+    print(f"INFO:Transcriberen ({lang_str}): {os.path.basename(video_path)}", flush=True)
+
+    try:
+        segments_gen, info = model.transcribe(video_path, language=language, beam_size=5, **options)
+    except TypeError:
+        # faster-whisper without clip_timestamps: start over
+        print("WARN:Hervatten niet ondersteund door deze faster-whisper, opnieuw beginnen", flush=True)
+        ckpt = {"offset": 0, "count": 0, "end": 0.0, "language": None}
         segments_gen, info = model.transcribe(video_path, language=language, beam_size=5)
-        duration = info.duration or 1.0
-
-        detected = info.language if not language else language
-        print(f"LANG:{detected}", flush=True)
-        print(f"INFO:Taal: {detected} ({info.language_probability:.0%})", flush=True)
-
-        lines = []
-        for i, seg in enumerate(segments_gen, start=1):
-            start = format_timestamp(seg.start)
-            end   = format_timestamp(seg.end)
-            text  = seg.text.strip()
-            lines.append(f"{i}\n{start} --> {end}\n{text}\n")
+    duration = info.duration or 1.0
+
+    detected = info.language if not language else language
+    print(f"LANG:{detected}", flush=True)
+    print(f"INFO:Taal: {detected} ({info.language_probability:.0%})", flush=True)
+
+    number = ckpt["count"]
+    with open(part_path, "r+b" if ckpt["offset"] else "wb") as f:
+        f.truncate(ckpt["offset"])
+        f.seek(ckpt["offset"])
+
+        def checkpoint(end):
+            _fsync(f)
+            _save_checkpoint(ckpt_path, {"signature": signature, "offset": f.tell(),
+                                         "count": number, "end": end, "language": detected})
+
+        end = ckpt["end"]
+        for seg in segments_gen:
+            text = seg.text.strip()
+            if seg.end <= ckpt["end"] or not text:
+                continue
+            number += 1
+            block = f"{number}\n{format_timestamp(seg.start)} --> {format_timestamp(seg.end)}\n{text}\n"
+            f.write((block if number == 1 else "\n" + block).encode("utf-8"))
+            end = seg.end
+            if number % CHECKPOINT_EVERY == 0:
+                checkpoint(end)
             progress = min(seg.end / duration, 0.99)
             print(f"PROGRESS:{progress:.4f}", flush=True)
+        checkpoint(end)
+
+    os.replace(part_path, out_srt)
+    os.remove(ckpt_path)
+    print(f"DONE:{out_srt}", flush=True)
+
+
+def transcribe_chunked(model, model_size, video_path, out_srt, language, ffmpeg, workers):
+    """VAD-gated transcription in parallel chunks, resumable per chunk."""
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+    import whisper_chunks as wc
+
+    st = os.stat(video_path)
+    signature = {"video": os.path.abspath(video_path), "size": st.st_size,
+                 "mtime_ns": st.st_mtime_ns, "model": model_size, "language": language}
+    store = wc.ChunkStore(os.path.splitext(out_srt)[0] + ".chunks", signature)
+
+    if store.chunks is None:
+        if not store.has_audio():
+            print("INFO:Audio extraheren (16 kHz mono)", flush=True)
+            wc.extract_audio(ffmpeg, video_path, store.pcm_path)
+        print("INFO:Spraakdetectie (VAD)", flush=True)
+        options = VadOptions(min_silence_duration_ms=500)
+        regions = wc.speech_regions(store.pcm_path, lambda audio: get_speech_timestamps(audio, options))
+        store.save_plan(wc.plan_chunks(regions, wc.pcm_duration(store.pcm_path)), language)
 
-        srt_content = "\n".join(lines)
-        with open(out_srt, "w", encoding="utf-8") as f:
-            f.write(srt_content)
+    chunks = store.chunks
+    todo = [i for i in range(len(chunks)) if not store.is_done(i)]
+    speech = sum(end - start for start, end in chunks) or 1.0
+    done = sum(chunks[i][1] - chunks[i][0] for i in range(len(chunks)) if i not in todo)
+    print(f"INFO:Transcriberen in {len(chunks)} delen ({speech / 60:.0f} min spraak van "
+          f"{wc.pcm_duration(store.pcm_path) / 60:.0f} min), {workers} workers: "
+          f"{os.path.basename(video_path)}", flush=True)
+    if len(todo) < len(chunks):
+        print(f"INFO:Hervat: {len(chunks) - len(todo)}/{len(chunks)} delen al klaar", flush=True)
 
-        print(f"DONE:{out_srt}", flush=True)
+    def run_chunk(index, lang):
+        start, end = chunks[index]
+        audio = wc.load_audio(store.pcm_path, start, end)
+        segments_gen, info = model.transcribe(audio, language=lang, beam_size=5)
+        segments = [(start + seg.start, min(end, start + seg.end), seg.text.strip())
+                    for seg in segments_gen]
+        store.save_chunk(index, segments)
+        return info
 
+    lang = store.language
+    if lang is None and todo:
+        # The first chunk decides the language for the others
+        info = run_chunk(todo[0], None)
+        lang = info.language
+        store.set_language(lang)
+        print(f"INFO:Taal: {lang} ({info.language_probability:.0%})", flush=True)
+        done += chunks[todo[0]][1] - chunks[todo[0]][0]
+        todo = todo[1:]
+    if not chunks:
+        print("WARN:Geen spraak gevonden", flush=True)
+    print(f"LANG:{lang or ''}", flush=True)
+    print(f"PROGRESS:{min(done / speech, 0.99):.4f}", flush=True)
+
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = {ex.submit(run_chunk, i, lang): i for i in todo}
+        for future in as_completed(futures):
+            future.result()
+            start, end = chunks[futures[future]]
+            done += end - start
+            print(f"PROGRESS:{min(done / speech, 0.99):.4f}", flush=True)
+
+    store.write_srt(out_srt)
+    store.remove()
+    print(f"DONE:{out_srt}", flush=True)
+
+
+def _report_error(e):
+    import traceback
+    traceback.print_exc()
+    print(f"ERROR:{str(e).replace(chr(10), ' ')}", flush=True)
+
+
+def serve(model_size, device, idle_timeout, chunk_workers=1):
+    try:
+        model, device = load_model(model_size, device, chunk_workers)
+    except Exception as e:
+        _report_error(e)
+        sys.exit(1)
+
+    # stdin is read on a thread so waiting for a job can time out
+    lines = queue.Queue()
+
+    def reader():
+        for line in sys.stdin:
+            lines.put(line)
+        lines.put("")
+
+    threading.Thread(target=reader, daemon=True).start()
+
+    while True:
+        print("READY", flush=True)
+        try:
+            line = lines.get(timeout=idle_timeout)
+        except queue.Empty:
+            print("IDLE", flush=True)
+            break
+        if not line.strip():
+            break
+        try:
+            job = json.loads(line)
+            if device == "cpu" and chunk_workers > 1 and job.get("ffmpeg"):
+                transcribe_chunked(model, model_size, job["video"], job["output"],
+                                   job.get("language"), job["ffmpeg"], chunk_workers)
+            else:
+                transcribe(model, job["video"], job["output"], job.get("language"))
+        except Exception as e:
+            _report_error(e)
+
+    # Model cleanup can take minutes; nothing is left to flush
+    sys.stdout.flush()
+    os._exit(0)
+
+
+def main():
+    if len(sys.argv) >= 4 and sys.argv[1] == "--serve":
+        idle_timeout = float(sys.argv[4]) if len(sys.argv) > 4 else 300.0
+        chunk_workers = int(sys.argv[5]) if len(sys.argv) > 5 else 1
+        serve(sys.argv[2], sys.argv[3], idle_timeout, chunk_workers)
+        return
+
+    # Args: video_path out_srt model_size device language
+    if len(sys.argv) < 6:
+        print("ERROR:Missing arguments")
+        sys.exit(1)
+
+    video_path = sys.argv[1]
+    out_srt    = sys.argv[2]
+    model_size = sys.argv[3]
+    device     = sys.argv[4]
+    language   = sys.argv[5] if sys.argv[5] != "None" else None
+
+    try:
+        model, _ = load_model(model_size, device)
+        transcribe(model, video_path, out_srt, language)
     except Exception as e:
-        import traceback
-        traceback.print_exc()
-        print(f"ERROR:{e}", flush=True)
+        _report_error(e)
         sys.exit(1)
 
 
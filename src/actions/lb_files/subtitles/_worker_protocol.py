@@ -0,0 +1,102 @@
+#-------------------------------------------------------------------------------
+# Name:        _worker_protocol.py
+# Purpose:      - Parent side of the resident worker processes
+#                 (_translate_worker.py, _sync_worker.py, _whisper_worker.py)
+#               - The worker prints READY, reads one JSON job per stdin line
+#                 and answers with KIND:... lines; an empty line ends it
+#               - stdout is read on a thread into a queue, so the caller can
+#                 poll cancellation while it waits for the next line
+#
+# Author:      EddyS
+#
+# Created:     18/10/2026
+# Copyright:   (c) EddyS 2026
+# Licence:     <your licence>
+#-------------------------------------------------------------------------------
+# actions/lb_files/subtitles/_worker_protocol.py
+#
+# Used by translate_pool, sync_service and whisper_server; what the reply
+# lines mean stays in those modules.
+
+import os
+import queue
+import subprocess
+import threading
+
+
+class Worker:
+    """One worker process; its output lines go to events as (key, line),
+    with line None once the output has ended."""
+
+    def __init__(self, cmd, events, key=None, stderr=subprocess.DEVNULL, env=None, popen_kwargs=None):
+        env = dict(os.environ, **(env or {}))
+        env["PYTHONIOENCODING"] = "utf-8"
+        self.key = key
+        self.proc = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=stderr,
+            text=True, encoding="utf-8", errors="replace", bufsize=1, env=env,
+            **(popen_kwargs or {}),
+        )
+        threading.Thread(target=self._read, args=(events,), daemon=True).start()
+
+    def _read(self, events):
+        for line in self.proc.stdout:
+            events.put((self.key, line.rstrip("\n")))
+        events.put((self.key, None))
+
+    def alive(self):
+        return self.proc.poll() is None
+
+    def send(self, job_json):
+        """False when the worker no longer reads its stdin (stopped or idle)."""
+        try:
+            self.proc.stdin.write(job_json + "\n")
+            self.proc.stdin.flush()
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def release(self):
+        """Empty line: the worker finishes and exits."""
+        try:
+            self.proc.stdin.write("\n")
+            self.proc.stdin.close()
+        except (OSError, ValueError):
+            pass
+
+    def terminate(self):
+        if self.alive():
+            self.proc.terminate()
+
+    def close(self, release=False, kill=False, timeout=5):
+        """Release, kill or terminate the worker and wait for it (kill after timeout)."""
+        if kill:
+            self.proc.kill()
+        elif release:
+            self.release()
+        else:
+            self.terminate()
+        try:
+            return self.proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            return self.proc.wait()
+
+
+def next_event(events, cancelled, poll_seconds):
+    """Next (key, line) from the workers, or None once cancelled() is True.
+
+    cancelled() is checked again when a worker's output ends: Stop Batch
+    terminates the processes itself, usually while we wait here, and that
+    must not look like a crashed worker.
+    """
+    while True:
+        if cancelled and cancelled():
+            return None
+        try:
+            key, line = events.get(timeout=poll_seconds)
+        except queue.Empty:
+            continue
+        if line is None and cancelled and cancelled():
+            return None
+        return key, line
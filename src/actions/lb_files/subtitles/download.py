@@ -187,10 +187,8 @@ def process_selected_files(app, processor_fn):
             file_name = app.lb_files.listbox.get(selection[0])
             first_video_path = app.file_path_map.get(file_name)
             if first_video_path:
-                scan_path = os.path.dirname(first_video_path)
-                from utils.scan_helpers import fast_scandir, update_lb
-                fast_scandir(app, scan_path)
-                update_lb(app)
-                update_tbinfo("🔄 File list refreshed", tag="groen")
+                from utils.scan_helpers import rescan
+                if rescan(app, fallback=os.path.dirname(first_video_path)):
+                    update_tbinfo("🔄 File list refreshed", tag="groen")
     except Exception as e:
         update_tbinfo(f"⚠️ Refresh failed: {e}", tag="geel")
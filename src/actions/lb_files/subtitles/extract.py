@@ -11,11 +11,9 @@
 
 # popup_actions/actions_extract.py
 
-import os, sys, shutil, subprocess, re
+import os, sys, shutil, subprocess, re, threading
 from pathlib import Path
-from tqdm import tqdm
-from pymediainfo import MediaInfo
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from decorators.decorators import menu_tag
 
 
@@ -82,6 +80,27 @@ LANG_NAME_TO_ISO6393 = {
     "vietnamese": "vie",
 }
 
+ISO6392B_TO_ISO6393 = {
+    # Matroska/ffprobe report ISO639-2/B ("bibliographic") codes
+    "alb": "sqi", "arm": "hye", "baq": "eus", "bur": "mya", "chi": "zho",
+    "cze": "ces", "dut": "nld", "fre": "fra", "geo": "kat", "ger": "deu",
+    "gre": "ell", "ice": "isl", "mac": "mkd", "mao": "mri", "may": "msa",
+    "per": "fas", "rum": "ron", "slo": "slk", "tib": "bod", "wel": "cym",
+}
+
+# mkvextract writes the track in its native format; pick a matching extension
+SUBTITLE_CODEC_EXT = {
+    "subrip": ".srt",
+    "srt": ".srt",
+    "ass": ".ass",
+    "ssa": ".ssa",
+    "webvtt": ".vtt",
+    "hdmv_pgs_subtitle": ".sup",
+    "dvd_subtitle": ".sub",
+}
+
+DEFAULT_EXTRACT_WORKERS = 3
+
 LEGACY_ONE_LETTER_TO_ISO6393 = {
     # Some files contain truncated tags such as "d" instead of "dut".
     "d": "nld",
@@ -94,7 +113,7 @@ LEGACY_ONE_LETTER_TO_ISO6393 = {
 
 
 def normalize_track_language_to_iso6393(language):
-    """Normalize MediaInfo language values to ISO639-3 code."""
+    """Normalize track language tags (ffprobe/MediaInfo) to ISO639-3 code."""
     if not language:
         return "und"
 
@@ -110,6 +129,10 @@ def normalize_track_language_to_iso6393(language):
     if len(value) == 2:
         return ISO6392_TO_ISO6393.get(value, "und")
 
+    # ISO639-2/B codes as stored in MKV headers
+    if value in ISO6392B_TO_ISO6393:
+        return ISO6392B_TO_ISO6393[value]
+
     # Already an ISO639-3 code
     if len(value) == 3 and value in ISO6392_TO_ISO6393.values():
         return value
@@ -126,16 +149,20 @@ def normalize_track_language_to_iso6393(language):
     return "und"
 
 
-def unique_output_path(path):
-    """Return a non-conflicting output path by appending -2, -3, ... when needed."""
-    if not os.path.exists(path):
+def unique_output_path(path, reserved=None):
+    """Return a non-conflicting output path by appending -2, -3, ... when needed.
+
+    reserved: paths already handed out but not written yet (same mkvextract run).
+    """
+    reserved = reserved or ()
+    if not os.path.exists(path) and path not in reserved:
         return path
 
     root, ext = os.path.splitext(path)
     index = 2
     while True:
         candidate = f"{root}-{index}{ext}"
-        if not os.path.exists(candidate):
+        if not os.path.exists(candidate) and candidate not in reserved:
             return candidate
         index += 1
 
@@ -178,9 +205,13 @@ def get_mkvextract_path():
     
     return None
 
+def _cancelled(s):
+    """Stop Batch was pressed for the batch this extraction belongs to."""
+    return getattr(s, 'batch_running', False) and getattr(s, 'batch_cancel_requested', False)
+
 @menu_tag(label="Extract Subs", group="videos")
 def extract_subtitles():
-    """Extract subtitles from selected MKV files"""
+    """Extract subtitles from selected MKV files (in the background)"""
     from shared_data import get_shared
     from utils import log_error
     from utils.text_helpers import tb_update
@@ -208,65 +239,131 @@ def extract_subtitles():
         return
     
     tb_update('tb_info', f"🎯 Extract Subs - {len(mkv_files)} file(s)", "normal")
-    
-    # Update progress bar
-    if hasattr(s.app, 'progress_bar'):
-        s.app.progress_bar.set(0)
-    
-    for idx, mkv_file in enumerate(mkv_files):
-        # Add dotted line between files (not before first)
-        if idx > 0:
+
+    try:
+        from config.smart_config_manager import get_config_manager
+        workers = int(get_config_manager().get("persistent_cfg", "ExtractWorkers", DEFAULT_EXTRACT_WORKERS))
+    except Exception:
+        workers = DEFAULT_EXTRACT_WORKERS
+    workers = max(1, min(workers, len(mkv_files)))
+
+    status_slot = getattr(s, 'bottomrow_label', None)
+    s.batch_step_done = False  # signal: async step in progress
+    if status_slot:
+        status_slot.show_progress(mode="determinate")
+
+    def worker():
+        total = len(mkv_files)
+        done = 0
+        extracted = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(extract_subtitles_from_mkv, f, os.path.dirname(f), mkvextract_path): f
+                for f in mkv_files
+            }
+            for future in as_completed(futures):
+                try:
+                    extracted += len(future.result())
+                except Exception as e:
+                    fn = os.path.basename(futures[future])
+                    s.app.after(0, lambda e=e, fn=fn: log_error(f"❌ Error processing {fn}: {e}"))
+                done += 1
+                if status_slot:
+                    s.app.after(0, lambda p=done / total, d=done: status_slot.update_progress(p, f"{d}/{total}"))
+
+        def finish():
+            if status_slot:
+                status_slot.reset()
             tb_update('tb_info', "· " * 25, "normal")
-        output_dir = os.path.dirname(mkv_file)  # Same directory as video
-        extract_subtitles_from_mkv(mkv_file, output_dir, mkvextract_path)
-        
-        # Update progress bar
-        if hasattr(s.app, 'progress_bar'):
-            progress = (idx + 1) / len(mkv_files)
-            s.app.progress_bar.set(progress)
-    
-    tb_update('tb_info', "· " * 25, "normal")
-    tb_update('tb_info', "✅ Extract Subs complete", "normal")
-    tb_update('tb_info', "─" * 50, "normal")
-    
-    # Refresh the listbox to show extracted subtitle files
-    from utils.scan_helpers import reload
-    reload(s.app)
+            if _cancelled(s):
+                tb_update('tb_info', f"⏹️ Extract Subs stopped ({extracted} track(s) extracted)", "geel")
+            else:
+                tb_update('tb_info', f"✅ Extract Subs complete ({extracted} track(s))", "normal")
+            tb_update('tb_info', "─" * 50, "normal")
+
+            # Refresh the listbox to show extracted subtitle files
+            from utils.scan_helpers import reload
+            reload(s.app)
+            s.batch_step_done = True
+
+        s.app.after(0, finish)
+
+    threading.Thread(target=worker, daemon=True).start()
 
 def extract_subtitles_from_mkv(mkv_file, output_dir, mkvextract_path):
-    """Extract subtitles from a single MKV file"""
+    """Extract all subtitle tracks of one MKV with a single mkvextract call.
+
+    Safe to run from worker threads: UI messages go through tb_update's
+    queue. Returns the list of written files.
+    """
+    from shared_data import get_shared
     from utils import log_error
     from utils.text_helpers import tb_update
-    
-    info = MediaInfo.parse(mkv_file)
-    
-    # Show which file we're processing
-    tb_update('tb_info', f"📂 Processing: {os.path.basename(mkv_file)}", "normal")
-
-    for track in info.tracks:
-        if track.track_type == "Text":
-            lang_short3 = normalize_track_language_to_iso6393(track.language)
-            if lang_short3 == "und":
-                log_error(f"⚠️ Unknown language: {track.language} (using 'und')")
-
-            track_id = track.track_id - 1
-            base = os.path.splitext(os.path.basename(mkv_file))[0]
-            preferred_out_file = os.path.join(output_dir, f"{base}-{lang_short3}.srt")
-            out_file = unique_output_path(preferred_out_file)
-
-            if out_file != preferred_out_file:
-                tb_update('tb_info', f"ℹ️ Duplicate language track, using: {os.path.basename(out_file)}", "normal")
-
-            try:
-                with open(os.devnull, 'w') as devnull:
-                    subprocess.run([mkvextract_path, "tracks", mkv_file,
-                                    f"{track_id}:{out_file}"],
-                                   check=True, stdout=devnull, stderr=devnull,
-                                   **_no_console_subprocess_kwargs())
-                tb_update('tb_info', f"✅ Extracted: {os.path.basename(out_file)}", "normal")
-            except subprocess.CalledProcessError as e:
-                error_msg = f"⚠️ Failed to extract track {track_id}: {e}"
-                log_error(error_msg)
+    from utils.media_probe import probe_media, get_streams
+
+    s = get_shared()
+    name = os.path.basename(mkv_file)
+    if _cancelled(s):
+        return []
+
+    probe = probe_media(mkv_file)
+    if "error" in probe:
+        log_error(f"⚠️ ffprobe failed for {name}: {probe['error']}")
+        return []
+
+    base = os.path.splitext(name)[0]
+    specs = []
+    outputs = []
+    notes = []
+    for stream in get_streams(probe, "subtitle"):
+        language = stream.get("tags", {}).get("language")
+        lang_short3 = normalize_track_language_to_iso6393(language)
+        if lang_short3 == "und":
+            notes.append((f"⚠️ Unknown language: {language} (using 'und')", "rood"))
+
+        # ffprobe stream index == mkvextract track id
+        track_id = stream["index"]
+        ext = SUBTITLE_CODEC_EXT.get(stream.get("codec_name", ""), ".srt")
+        preferred_out_file = os.path.join(output_dir, f"{base}-{lang_short3}{ext}")
+        out_file = unique_output_path(preferred_out_file, reserved=outputs)
+
+        if out_file != preferred_out_file:
+            notes.append((f"ℹ️ Duplicate language track, using: {os.path.basename(out_file)}", "normal"))
+
+        specs.append(f"{track_id}:{out_file}")
+        outputs.append(out_file)
+
+    # Messages per file are queued together so parallel files don't interleave
+    lines = [(f"📂 Processing: {name}", "normal")] + notes
+    if not specs:
+        lines.append(("ℹ️ No subtitle tracks", "normal"))
+        for msg, tag in lines:
+            tb_update('tb_info', msg, tag)
+        return []
+
+    # One pass over the (possibly huge) MKV for all tracks
+    proc = subprocess.Popen([mkvextract_path, "tracks", mkv_file, *specs],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                            **_no_console_subprocess_kwargs())
+    s.register_process(proc)
+    try:
+        _, err = proc.communicate()
+    finally:
+        s.unregister_process(proc)
+
+    written = [f for f in outputs if os.path.exists(f)]
+    if proc.returncode not in (0, 1):  # 1 = finished with warnings
+        if _cancelled(s):
+            lines.append((f"⏹️ Stopped: {name}", "geel"))
+        else:
+            detail = err.decode("utf-8", "ignore").strip().splitlines()[-1:] if err else []
+            lines.append((f"⚠️ mkvextract failed ({proc.returncode}) for {name} {' '.join(detail)}", "rood"))
+    for out_file in written:
+        lines.append((f"✅ Extracted: {os.path.basename(out_file)}", "normal"))
+
+    for msg, tag in lines:
+        tb_update('tb_info', msg, tag)
+    return written
 
 def extract_subtitles_from_directory(directory, out_folder="subs"):
     out_dir = os.path.join(directory, out_folder)
@@ -303,6 +400,8 @@ def extract_size(line):
     return None
 
 def convert_to_mkv_cli(input_file, output_file):
+    from tqdm import tqdm
+
     cmd = [
         "ffmpeg", "-i", input_file,
         "-c:v", "libx265", "-preset", "fast", "-crf", "28",
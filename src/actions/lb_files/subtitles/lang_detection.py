@@ -0,0 +1,275 @@
+#-------------------------------------------------------------------------------
+# Name:        lang_detection.py
+# Purpose:      - Subtitle language detection on a bounded sample
+#               - A few windows spread over the file instead of a full read
+#               - langdetect seeded once, so results are reproducible
+#               - Results cached per path + size + mtime, batch API for
+#                 check_language / sub_translate
+#
+# Author:      EddyS
+#
+# Created:     18/10/2026
+# Copyright:   (c) EddyS 2026
+# Licence:     <your licence>
+#-------------------------------------------------------------------------------
+# actions/lb_files/subtitles/lang_detection.py
+#
+# langdetect/langcodes are imported lazily (ImportError reaches the caller).
+
+import codecs
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Sample: SAMPLE_WINDOWS reads of WINDOW_BYTES spread over the file
+SAMPLE_WINDOWS = 4
+WINDOW_BYTES = 16 * 1024
+MAX_SAMPLE_CHARS = 3000
+MIN_SAMPLE_CHARS = 50
+READ_WORKERS = 8
+
+NO_LANGUAGE = ("xx", "xxx", "No Language", 0.0)
+
+_TAG_RE = re.compile(r"<[^>]+>|\{[^}]*\}")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def _srt_cues():
+    try:
+        from . import srt_cues
+    except ImportError:
+        import importlib.util
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "srt_cues.py")
+        spec = importlib.util.spec_from_file_location("srt_cues", path)
+        srt_cues = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(srt_cues)
+    return srt_cues
+
+
+# ───────────────────────────────────────────────
+# SAMPLING
+# ───────────────────────────────────────────────
+
+def read_sample(path, windows=SAMPLE_WINDOWS, window_bytes=WINDOW_BYTES):
+    """Subtitle text lines from a few windows spread over the file.
+
+    Small files are read whole. Partial cues at the window edges are
+    skipped by the cue parser (a cue starts at its timing line).
+    """
+    cues = _srt_cues()
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        head = f.read(window_bytes)
+        encoding = cues.detect_encoding(head)
+        if size <= windows * window_bytes:
+            chunks = [head + f.read()]
+        else:
+            # UTF-16/32 windows must start on a code unit boundary
+            unit = 4 if "32" in encoding else 2 if "16" in encoding else 1
+            chunks = [head]
+            step = (size - window_bytes) // (windows - 1)
+            for i in range(1, windows):
+                f.seek((step * i) // unit * unit)
+                chunks.append(f.read(window_bytes))
+
+    # The BOM is only in the first window; the others need the byte order
+    later = encoding
+    if encoding in ("utf-16", "utf-32"):
+        big_endian = head.startswith((codecs.BOM_UTF16_BE, codecs.BOM_UTF32_BE))
+        later = encoding + ("-be" if big_endian else "-le")
+
+    lines = []
+    for n, chunk in enumerate(chunks):
+        text_lines = chunk.decode(encoding if n == 0 else later, errors="replace").splitlines()
+        if len(chunks) > 1:
+            # A window usually ends inside a line
+            text_lines = text_lines[:-1]
+        for cue in cues.iter_cues(text_lines):
+            lines.extend(cue.lines)
+    return lines
+
+
+def sample_text(lines, max_chars=MAX_SAMPLE_CHARS):
+    """Clean text for the detector: tags removed, whitespace collapsed, bounded."""
+    parts, total = [], 0
+    for line in lines:
+        clean = _SPACE_RE.sub(" ", _TAG_RE.sub("", line)).strip()
+        if not clean:
+            continue
+        parts.append(clean)
+        total += len(clean) + 1
+        if total >= max_chars:
+            break
+    return " ".join(parts)[:max_chars]
+
+
+# ───────────────────────────────────────────────
+# DETECTION
+# ───────────────────────────────────────────────
+
+_seed_lock = threading.Lock()
+_seeded = False
+
+
+def _detect_langs(text):
+    """langdetect.detect_langs with a fixed seed (set once per process)."""
+    global _seeded
+    from langdetect import DetectorFactory, detect_langs
+    with _seed_lock:
+        if not _seeded:
+            DetectorFactory.seed = 0
+            _seeded = True
+    return [(lang.lang, lang.prob) for lang in detect_langs(text)]
+
+
+_names = {}
+
+
+def _language_names(short2):
+    """(alpha-3 B code, display name) via langcodes, cached per code."""
+    if short2 not in _names:
+        try:
+            from langcodes import Language
+            lang = Language.get(short2)
+            _names[short2] = (lang.to_alpha3(variant='B'), lang.display_name())
+        except ImportError:
+            raise
+        except Exception:
+            _names[short2] = (short2.upper(), short2.upper())
+    return _names[short2]
+
+
+def detect_text(text, detector=None, names=None):
+    """(short2, short3, name, probability) for a text sample."""
+    if len(text) < MIN_SAMPLE_CHARS:
+        return NO_LANGUAGE
+    langs = (detector or _detect_langs)(text)
+    if not langs:
+        return NO_LANGUAGE
+    best = langs[0]
+    # langdetect often confuses Dutch with Afrikaans, so prefer Dutch if detected
+    best = next((lang for lang in langs if lang[0] == "nl"), best)
+    short3, name = (names or _language_names)(best[0])
+    return best[0], short3, name, best[1]
+
+
+class LanguageDetector:
+    """Sampling detector with a per path + size + mtime result cache.
+
+    Results have the lang_detect() shape:
+    (short2, short3, name, probability, first_text_line_or_reason).
+    With an index (utils.lang_index.LanguageIndex) results also survive
+    restarts; a file is only sampled again when its content changed.
+    """
+
+    def __init__(self, detector=None, names=None, index=None):
+        self.detector = detector
+        self.names = names
+        self.index = index
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _key(self, path):
+        st = os.stat(path)
+        return os.path.normcase(os.path.abspath(path)), st.st_size, st.st_mtime_ns
+
+    def cached(self, path):
+        try:
+            key = self._key(path)
+        except OSError:
+            return None
+        with self._lock:
+            return self._cache.get(key)
+
+    def _detect_lines(self, lines):
+        if not lines:
+            return (*NO_LANGUAGE, "No text found")
+        text = sample_text(lines)
+        if len(text) < MIN_SAMPLE_CHARS:
+            return (*NO_LANGUAGE, "Text too short for detection")
+        try:
+            result = detect_text(text, self.detector, self.names)
+        except ImportError:
+            raise
+        except Exception as e:
+            return (*NO_LANGUAGE, f"Detection error: {e}")
+        return (*result, lines[0] if result[0] != "xx" else "No languages detected")
+
+    def _lookup(self, path):
+        """(key, cached result or None); consults memory, then the index."""
+        key = self._key(path)
+        with self._lock:
+            hit = self._cache.get(key)
+        if hit is None and self.index is not None:
+            hit = self.index.get(path, key[1], key[2])
+            if hit is not None:
+                with self._lock:
+                    self._cache[key] = hit
+        return key, hit
+
+    def _remember(self, path, key, result):
+        with self._lock:
+            self._cache[key] = result
+        # Detection errors are not a property of the content
+        if self.index is not None and not result[4].startswith("Detection error"):
+            self.index.put(path, key[1], key[2], result)
+
+    def detect(self, path):
+        try:
+            key, hit = self._lookup(path)
+            if hit is not None:
+                return hit
+            lines = read_sample(path)
+        except OSError as e:
+            return (*NO_LANGUAGE, f"Could not read file: {e}")
+        result = self._detect_lines(lines)
+        self._remember(path, key, result)
+        return result
+
+    def detect_many(self, paths, max_workers=READ_WORKERS):
+        """{path: result} for many files: samples are read concurrently,
+        detection runs here (langdetect is CPU bound), cache hits skip both."""
+        paths = list(dict.fromkeys(paths))
+
+        def read(path):
+            try:
+                key, hit = self._lookup(path)
+                return path, key, hit, None if hit is not None else read_sample(path), None
+            except OSError as e:
+                return path, None, None, None, e
+
+        results = {}
+        if paths:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(paths)))) as ex:
+                for path, key, hit, lines, error in ex.map(read, paths):
+                    if error is not None:
+                        results[path] = (*NO_LANGUAGE, f"Could not read file: {error}")
+                    elif hit is not None:
+                        results[path] = hit
+                    else:
+                        results[path] = self._detect_lines(lines)
+                        self._remember(path, key, results[path])
+        return results
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+_detector = None
+_detector_lock = threading.Lock()
+
+
+def get_language_detector():
+    """Process-wide LanguageDetector (shared cache + persistent index)."""
+    global _detector
+    with _detector_lock:
+        if _detector is None:
+            try:
+                from utils.lang_index import get_language_index
+                index = get_language_index()
+            except ImportError:
+                index = None
+            _detector = LanguageDetector(index=index)
+        return _detector
@@ -0,0 +1,262 @@
+#-------------------------------------------------------------------------------
+# Name:        srt_cues.py
+# Purpose:      - Compact cue model shared by the subtitle tools
+#               - Encoding detected once (BOM + cheap heuristic)
+#               - Streaming SRT parser and serializer
+#               - ASS/SSA dialogue helpers (Text field only)
+#
+# Author:      EddyS
+#
+# Created:     18/10/2026
+# Copyright:   (c) EddyS 2026
+# Licence:     <your licence>
+#-------------------------------------------------------------------------------
+# actions/lb_files/subtitles/srt_cues.py
+#
+# translate_srt_argos.py imports it by plain name when it runs standalone.
+
+import codecs
+import re
+
+# 00:01:02,345 --> 00:01:04,000 (also accepts '.' and 1-2 digit millis)
+_TIMING_RE = re.compile(
+    r"^\s*(\d+):(\d{1,2}):(\d{1,2})[,.](\d{1,3})\s*-->\s*(\d+):(\d{1,2}):(\d{1,2})[,.](\d{1,3})"
+)
+
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+SNIFF_BYTES = 64 * 1024
+
+
+class Cue:
+    """One subtitle block: times in milliseconds, text as a list of lines."""
+    __slots__ = ("start", "end", "lines")
+
+    def __init__(self, start, end, lines):
+        self.start = start
+        self.end = end
+        self.lines = lines
+
+    @property
+    def text(self):
+        return "\n".join(self.lines)
+
+    def __repr__(self):
+        return f"Cue({format_timestamp(self.start)} --> {format_timestamp(self.end)}, {self.lines!r})"
+
+
+class SubtitleFile:
+    """Parsed SRT: cues plus anything before the first cue (kept verbatim)."""
+    __slots__ = ("cues", "preamble", "encoding")
+
+    def __init__(self, cues=None, preamble=None, encoding="utf-8"):
+        self.cues = cues if cues is not None else []
+        self.preamble = preamble if preamble is not None else []
+        self.encoding = encoding
+
+    def __len__(self):
+        return len(self.cues)
+
+
+# ───────────────────────────────────────────────
+# ENCODING
+# ───────────────────────────────────────────────
+
+def detect_encoding(raw):
+    """Pick one encoding for raw bytes: BOM first, then a cheap heuristic."""
+    for bom, encoding in _BOMS:
+        if raw.startswith(bom):
+            return encoding
+
+    sample = raw[:SNIFF_BYTES]
+    # BOM-less UTF-16: every other byte of ASCII text is NUL
+    if sample and sample.count(b"\x00") > len(sample) // 4:
+        return "utf-16-le" if sample[1:2] == b"\x00" else "utf-16-be"
+
+    try:
+        sample.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError as e:
+        # A multi-byte sequence cut off at the sample boundary is still UTF-8
+        if len(raw) > SNIFF_BYTES and e.start >= len(sample) - 3:
+            return "utf-8"
+    return "cp1252"
+
+
+def read_text(path):
+    """Read and decode a subtitle file once; returns (text, encoding)."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    encoding = detect_encoding(raw)
+    return raw.decode(encoding, errors="replace"), encoding
+
+
+# ───────────────────────────────────────────────
+# SRT
+# ───────────────────────────────────────────────
+
+def parse_timing(line):
+    """(start_ms, end_ms) for a timing line, or None."""
+    m = _TIMING_RE.match(line)
+    if not m:
+        return None
+    g = m.groups()
+    start = ((int(g[0]) * 60 + int(g[1])) * 60 + int(g[2])) * 1000 + int(g[3].ljust(3, "0"))
+    end = ((int(g[4]) * 60 + int(g[5])) * 60 + int(g[6])) * 1000 + int(g[7].ljust(3, "0"))
+    return start, end
+
+
+def format_timestamp(ms):
+    ms = max(0, int(ms))
+    hours, ms = divmod(ms, 3_600_000)
+    minutes, ms = divmod(ms, 60_000)
+    seconds, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{ms:03d}"
+
+
+def iter_cues(lines, preamble=None):
+    """Stream cues from an iterable of text lines (one pass).
+
+    A cue starts at a timing line; the index line before it is dropped
+    (the serializer renumbers). Text runs until a blank line. Lines before
+    the first cue are appended to preamble when a list is given.
+    """
+    cue = None
+    seen_cue = False
+    pending_index = None
+
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        stripped = line.strip()
+
+        if cue is not None:
+            if stripped:
+                cue.lines.append(stripped)
+            else:
+                yield cue
+                cue = None
+            continue
+
+        if "-->" in stripped:
+            timing = parse_timing(stripped)
+            if timing is not None:
+                cue = Cue(timing[0], timing[1], [])
+                seen_cue = True
+                pending_index = None
+                continue
+
+        # Outside a cue: header lines before the first cue are kept,
+        # stray index numbers/garbage between cues are dropped
+        if not seen_cue and preamble is not None:
+            if pending_index is not None:
+                preamble.append(pending_index)
+            pending_index = line if stripped.isdigit() else None
+            if pending_index is None:
+                preamble.append(line)
+
+    if cue is not None:
+        yield cue
+
+
+def parse_srt_text(text, encoding="utf-8"):
+    sub = SubtitleFile(encoding=encoding)
+    sub.cues = list(iter_cues(text.splitlines(), sub.preamble))
+    # Surrounding blank lines of the preamble are re-added by the serializer
+    while sub.preamble and not sub.preamble[-1].strip():
+        sub.preamble.pop()
+    while sub.preamble and not sub.preamble[0].strip():
+        sub.preamble.pop(0)
+    return sub
+
+
+def parse_srt(path):
+    text, encoding = read_text(path)
+    return parse_srt_text(text, encoding)
+
+
+def format_cue(number, cue, lines=None):
+    """SRT block text for one cue (ends with the blank separator line)."""
+    body = "\n".join(cue.lines if lines is None else lines)
+    return f"{number}\n{format_timestamp(cue.start)} --> {format_timestamp(cue.end)}\n{body}\n\n"
+
+
+def serialize_srt(cues, preamble=None):
+    parts = []
+    if preamble:
+        parts.append("\n".join(preamble) + "\n\n")
+    parts.extend(format_cue(i, cue) for i, cue in enumerate(cues, start=1))
+    return "".join(parts)
+
+
+def write_srt(path, cues, preamble=None, encoding="utf-8"):
+    with open(path, "w", encoding=encoding, newline="\n") as f:
+        f.write(serialize_srt(cues, preamble))
+
+
+# ───────────────────────────────────────────────
+# ASS / SSA
+# ───────────────────────────────────────────────
+
+def looks_like_ass(text_sample):
+    low = text_sample.lower()
+    return ("[script info]" in low or "[v4+" in low or "format:" in low) and "dialogue:" in low
+
+
+class AssDocument:
+    """ASS/SSA file as raw lines with the Dialogue Text fields addressable.
+
+    texts[i] is the Text field of the i-th Dialogue line with \\N/\\n
+    turned into real newlines; set new values there and call serialize().
+    """
+
+    def __init__(self, lines, encoding="utf-8"):
+        self.lines = lines
+        self.encoding = encoding
+        self.fields = []
+        self.text_index = None
+        self._dialogues = []   # (line_no, prefix, parts)
+        self.texts = []
+        self._parse()
+
+    def _parse(self):
+        for line_no, line in enumerate(self.lines):
+            stripped = line.strip().lower()
+            if stripped.startswith("format:"):
+                self.fields = [x.strip() for x in line.split(":", 1)[1].split(",")]
+                self.text_index = next(
+                    (i for i, nm in enumerate(self.fields) if nm.lower() == "text"), None)
+            elif stripped.startswith("dialogue:") and self.fields:
+                prefix, rest = line.split(":", 1)
+                parts = rest.rstrip("\r\n").split(",", len(self.fields) - 1)
+                idx = self._text_pos(parts)
+                self._dialogues.append((line_no, prefix, parts))
+                self.texts.append(parts[idx].replace("\\N", "\n").replace("\\n", "\n"))
+
+    def _text_pos(self, parts):
+        if self.text_index is None or self.text_index >= len(parts):
+            return len(parts) - 1
+        return self.text_index
+
+    @property
+    def has_text_field(self):
+        return self.text_index is not None
+
+    def serialize(self):
+        out = list(self.lines)
+        for (line_no, prefix, parts), text in zip(self._dialogues, self.texts):
+            parts = list(parts)
+            parts[self._text_pos(parts)] = text.replace("\n", "\\N")
+            ending = "\n" if out[line_no].endswith("\n") else ""
+            out[line_no] = f"{prefix}:{','.join(parts)}{ending}"
+        return "".join(out)
+
+
+def parse_ass(path):
+    text, encoding = read_text(path)
+    return AssDocument(text.splitlines(keepends=True), encoding)
@@ -159,7 +159,9 @@ def enable_special_char_search(tb_info, content):
     special_chars = ['♪', '♫', '■', '●', '♦', '◆', '★', '☆', '※', '►', '◄', 
                      '[', ']', '(', ')', '{', '}']
     
-    # Get content directly from textbox instead of file
+    # Get content directly from textbox instead of file (write queued lines first)
+    if hasattr(tb_info, 'flush'):
+        tb_info.flush()
     textbox_content = tb_info.textbox.get("1.0", "end-1c")
     
     # Find all positions and line/column info of special characters
@@ -427,43 +429,30 @@ def clean_single_subtitle(file_path):
     tb_update('tb_info', f"📝 Cleaning: {filename}", "normal")
 
     try:
-        with open(renamed, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-
-        cleaned_lines = []
-        block = []
-        count = 1
-
-        for line in lines:
-            if line.strip():
-                block.append(line.strip())
-            else:
-                if block:
-                    if re.match(r'^\d+$', block[0]):
-                        block = block[1:]
-
-                    # Remove SDH markers and HTML tags
-                    cleaned = [re.sub(r'\[.*?\]|\(.*?\)|♪.*?♪|<[^>]+>', '', l) for l in block]
-                    
-                    # Remove accents and diacritics (café → cafe, één → een, naïef → naief)
-                    cleaned = [remove_accents(l) for l in cleaned]
-                    
-                    # Normalize typographic characters
-                    cleaned = [normalize_typography(l) for l in cleaned]
-                    
-                    # Remove empty lines and single dashes
-                    cleaned = [l for l in cleaned if l.strip() and l.strip() != '-']
-
-                    if len(cleaned) > 1:
-                        cleaned_lines.append(str(count))
-                        count += 1
-                        cleaned_lines.extend(cleaned)
-                        cleaned_lines.append("")
-
-                block = []
-
-        with open(orig_path, "w", encoding="utf-8") as f:
-            f.write("\n".join(cleaned_lines))
+        from .srt_cues import parse_srt, write_srt
+
+        sub = parse_srt(renamed)
+        cleaned_cues = []
+
+        for cue in sub.cues:
+            # Remove SDH markers and HTML tags
+            cleaned = [re.sub(r'\[.*?\]|\(.*?\)|♪.*?♪|<[^>]+>', '', l) for l in cue.lines]
+            
+            # Remove accents and diacritics (café → cafe, één → een, naïef → naief)
+            cleaned = [remove_accents(l) for l in cleaned]
+            
+            # Normalize typographic characters
+            cleaned = [normalize_typography(l) for l in cleaned]
+            
+            # Remove empty lines and single dashes
+            cleaned = [l for l in cleaned if l.strip() and l.strip() != '-']
+
+            if cleaned:
+                cue.lines = cleaned
+                cleaned_cues.append(cue)
+
+        # Renumbered on write
+        write_srt(orig_path, cleaned_cues)
 
         tb_update('tb_info', f"✅ Saved: {filename}", "normal")
 
@@ -584,19 +573,18 @@ def sub_sync():
         status_slot = getattr(s, 'bottomrow_label', None)
         s.batch_step_done = False
         if status_slot:
-            s.app.after(0, lambda: status_slot.show_progress(mode="indeterminate"))
+            s.app.after(0, lambda: (status_slot.show_progress(mode="determinate"),
+                                    status_slot.update_progress(0, f"0/{len(pairs)}")))
 
-        import subprocess, re as _re
+        import re as _re
         from utils.shared_utils import fils
         from utils.scan_helpers import reload
-
-        python_cmd = _resolve_python_command()
+        from .sync_service import SyncJob, SyncService
 
         _known_suffixes = r'(\.(en|nl|fr|de|es|it|pt|ja|zh|und|eng|dut|fre|ger|spa|ita|por|sync|tmp))+$'
 
+        jobs = []
         for idx, (video_file, srt_file) in enumerate(pairs):
-            if idx > 0:
-                s.app.after(0, lambda: tb_update('tb_info', "· " * 25, "normal"))
             srt_info = fils(srt_file)
             # Strip lang/processing suffixes so output is "Movie.nl.sync.srt" not "Movie.en.nl.sync.srt"
             clean_base = _re.sub(_known_suffixes, '', srt_info.f_name, flags=_re.IGNORECASE)
@@ -605,33 +593,52 @@ def sub_sync():
             lang_tag = lang_match.group(1) if lang_match else ""
             suffix = f".{lang_tag}" if lang_tag else ""
             synchronized_srt = os.path.join(srt_info.f_path, f"{clean_base}{suffix}.sync.srt")
+            jobs.append(SyncJob(idx, video_file, srt_file, synchronized_srt))
+
+        done = [0]
 
-            s.app.after(0, lambda v=video_file, sr=srt_file: tb_update(
+        def on_start(job):
+            if job.id != "0":
+                s.app.after(0, lambda: tb_update('tb_info', "· " * 25, "normal"))
+            s.app.after(0, lambda v=job.video, sr=job.srt: tb_update(
                 'tb_info',
                 f"🔄 Synchronizing {os.path.basename(sr)} with {os.path.basename(v)}...",
                 "normal"))
-            try:
-                # ffsubsync.exe has a DLL issue on this system — invoke via Python import instead
-                cmd = python_cmd + [
-                    "-c",
-                    f"import sys; sys.argv=['ffsubsync',{repr(video_file)},'-i',{repr(srt_file)},'-o',{repr(synchronized_srt)}]; from ffsubsync.ffsubsync import main; main()"
-                ]
-                result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', **_no_console_subprocess_kwargs())
-                if result.returncode == 0:
-                    s.app.after(0, lambda out=synchronized_srt: tb_update(
-                        'tb_info', f"✅ Synchronized: {os.path.basename(out)}", "groen"))
-                else:
-                    err_msg = (result.stderr or result.stdout or f"exit code {result.returncode}").strip()
-                    s.app.after(0, lambda e=err_msg: tb_update(
-                        'tb_info', f"❌ Sync failed: {e}", "rood"))
-                    print(f"[SYNC stderr] {err_msg}")
-            except ImportError:
+
+        def on_result(job, ok, message, detail):
+            done[0] += 1
+            if ok:
+                source, offset = detail
+                note = "cached audio reference" if source == "cache" else "audio decoded"
+                s.app.after(0, lambda out=job.output, n=note, o=offset: tb_update(
+                    'tb_info', f"✅ Synchronized: {os.path.basename(out)} (offset {o:+.2f}s, {n})", "groen"))
+            elif message == "cancelled":
+                s.app.after(0, lambda sr=job.srt: tb_update('tb_info', f"⏹️ Stopped: {os.path.basename(sr)}", "geel"))
+            elif "No module named 'ffsubsync'" in message:
                 s.app.after(0, lambda: tb_update(
                     'tb_info', "❌ ffsubsync niet gevonden. Installeer met: pip install ffsubsync", "rood"))
-                break
-            except Exception as e:
-                s.app.after(0, lambda ex=e: tb_update(
-                    'tb_info', f"❌ Sync error: {ex}", "rood"))
+            else:
+                s.app.after(0, lambda e=message: tb_update(
+                    'tb_info', f"❌ Sync failed: {e}", "rood"))
+                print(f"[SYNC] {message}")
+            if status_slot:
+                s.app.after(0, lambda d=done[0]: status_slot.update_progress(d / len(jobs), f"{d}/{len(jobs)}"))
+
+        try:
+            # ffsubsync.exe has a DLL issue on this system — one external Python worker imports it instead
+            service = SyncService(
+                _resolve_python_command(), on_start=on_start, on_result=on_result,
+                register=s.register_process, unregister=s.unregister_process,
+                cancelled=lambda: getattr(s, 'batch_running', False) and getattr(s, 'batch_cancel_requested', False),
+                popen_kwargs=_no_console_subprocess_kwargs(),
+            )
+            service.run(jobs)
+            if service.from_cache:
+                s.app.after(0, lambda n=service.from_cache: tb_update(
+                    'tb_info', f"♻️ {n} sync(s) used a cached audio reference", "normal"))
+        except Exception as e:
+            s.app.after(0, lambda ex=e: tb_update(
+                'tb_info', f"❌ Sync error: {ex}", "rood"))
 
         if status_slot:
             s.app.after(0, lambda: status_slot.reset())
@@ -721,10 +728,10 @@ def sub_all_extract(fil):
 
 
 def get_num_subs(fil):
-    out = subprocess.run(['ffprobe','-loglevel','error','-select_streams','s','-show_entries','stream=index:stream_tags=language','-of','csv=p=0', fil],\
-             stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, **_no_console_subprocess_kwargs())
-    subs=out.stdout
-    subs_list = subs.split("\n")
+    from utils.media_probe import probe_media, get_streams
+    subs_list = [f"{st.get('index')},{st.get('tags', {}).get('language', '')}"
+                 for st in get_streams(probe_media(fil), 'subtitle')]
+    subs_list.append("")
 
     last_sub = subs_list.pop(-2)
     subnum = last_sub.split(",").pop(0)
@@ -839,12 +846,13 @@ def check_language():
 
     print(f"\n🔍 Checking language for {len(srt_files)} file(s):\n")
 
+    detected = lang_detect_many(srt_files)
+    _refresh_file_languages(s)
     for fil in srt_files:
         filename = os.path.basename(fil)
         print(f"📄 {filename}")
 
-        lng = lang_detect(fil)
-        short2, short3, naam, prob, line = lng
+        short2, short3, naam, prob, line = detected[fil]
 
         # Format: 2-letter  3-letter  name  probability  sample_text
         msg = f"   🌐 {short2} | {short3} | {naam} | {prob:.2%} confidence"
@@ -864,128 +872,51 @@ def random_line(fil):
     line =random.choice(lines)
     return line
 
+def _notify_missing_langdetect():
+    # Notify via StatusSlot and tb_info, but don't crash the UI
+    try:
+        from shared_data import get_shared
+        s = get_shared()
+        if hasattr(s, 'bottomrow_label'):
+            s.bottomrow_label.show_message("Missing package 'langdetect' or 'langcodes'", color="red")
+    except Exception:
+        pass
+    try:
+        from utils import update_tbinfo
+        update_tbinfo("⚠️ Missing dependency: install 'langdetect' and 'langcodes' (pip install langdetect langcodes)", "geel")
+    except Exception:
+        pass
+
+
+def _refresh_file_languages(s):
+    """Let lb_files pick up freshly indexed languages (colour + lang: filter)."""
+    lb = getattr(s.app, 'lb_files', None)
+    if lb is not None and hasattr(lb, 'refresh_languages'):
+        lb.refresh_languages()
+
+
 def lang_detect(fil):
-    # Try to import detection libraries; if missing, notify user and return fallback
+    """(short2, short3, name, probability, first line) for one subtitle file.
+
+    Reads a bounded sample spread over the file; results are cached per
+    path + size + mtime (see lang_detection.py).
+    """
+    from .lang_detection import get_language_detector
     try:
-        from langdetect import detect_langs
-        from langcodes import Language
-    except Exception as e:
-        # Notify via StatusSlot and tb_info, but don't crash the UI
-        try:
-            from shared_data import get_shared
-            s = get_shared()
-            if hasattr(s, 'bottomrow_label'):
-                s.bottomrow_label.show_message("Missing package 'langdetect' or 'langcodes'", color="red")
-        except Exception:
-            pass
-        try:
-            from utils import update_tbinfo
-            update_tbinfo("⚠️ Missing dependency: install 'langdetect' and 'langcodes' (pip install langdetect langcodes)", "geel")
-        except Exception:
-            pass
+        return get_language_detector().detect(fil)
+    except ImportError:
+        _notify_missing_langdetect()
         return "xx", "xxx", "No Language", 0.0, "Missing dependency"
-    import re
 
-    # Read all lines and collect text lines (skip numbers, timecodes, empty lines)
-    # Try multiple encodings in order
-    lines = None
-    for encoding in ['utf-8-sig', 'utf-8', 'utf-16', 'latin-1', 'cp1252']:
-        try:
-            with open(fil, 'r', encoding=encoding) as f:
-                lines = f.readlines()
-            print(f"✓ Successfully read file with encoding: {encoding}")
-            break
-        except Exception as e:
-            continue
-    
-    if lines is None:
-        return "xx", "xxx", "No Language", 0.0, "Could not read file with any encoding"
-    
-    # Filter for actual subtitle text (not numbers, not timecodes, not empty)
-    text_lines = []
-    timecode_pattern = r'^\d{2}:\d{2}:\d{2}'
-    
-    for line in lines:
-        line = line.strip()
-        # Skip completely empty lines
-        if not line:
-            continue
-        # Skip lines that are only digits (sequence numbers)
-        if line.isdigit():
-            continue
-        # Skip timecode lines (contain -->)
-        if '-->' in line:
-            continue
-        # Skip pure timecode lines (but allow text that might look like timecodes)
-        if re.match(timecode_pattern, line) and len(line) <= 8:  # Only skip if it's just a timecode
-            continue
-        # Include all other lines as potential subtitle text
-        text_lines.append(line)
-    
-    print(f"🔍 Found {len(text_lines)} text lines")
-    if text_lines:
-        print(f"   First few lines: {text_lines[:3]}")
-    
-    if not text_lines:
-        return "xx", "xxx", "No Language", 0.0, "No text found"
-    
-    # Combine multiple text lines for better detection
-    # Use more lines for better detection, but limit to reasonable length
-    sample_text = ' '.join(text_lines[:50])  # Use first 50 text lines instead of 10
-    
-    # Clean the text - remove HTML tags and extra whitespace
-    import re
-    sample_text = re.sub(r'<[^>]+>', '', sample_text)  # Remove HTML tags
-    sample_text = re.sub(r'\s+', ' ', sample_text).strip()  # Normalize whitespace
-    
-    print(f"🔍 Sample text length: {len(sample_text)} chars")
-    
-    if text_lines:
-        print(f"   Sample text preview: '{sample_text[:200]}...'")
-    
-    # Minimum text length for detection
-    if len(sample_text) < 50:
-        return "xx", "xxx", "No Language", 0.0, "Text too short for detection"
-    
-    # detect language
+
+def lang_detect_many(files):
+    """{path: lang_detect() result} for many files in one call."""
+    from .lang_detection import get_language_detector
     try:
-        langs = detect_langs(sample_text)
-        print(f"🔍 Detected languages: {langs}")
-        print(f"🔍 Number of detected languages: {len(langs) if langs else 0}")
-        
-        if not langs:
-            print("❌ No languages detected at all")
-            return "xx", "xxx", "No Language", 0.0, "No languages detected"
-        
-        # Get the most confident detection
-        best_lang = langs[0]
-        print(f"🔍 Best language: {best_lang.lang} with probability {best_lang.prob}")
-        
-        # Special handling for Dutch vs Afrikaans
-        # langdetect often confuses Dutch with Afrikaans, so prefer Dutch if detected
-        dutch_detection = next((lang for lang in langs if lang.lang == 'nl'), None)
-        if dutch_detection:
-            print(f"🔍 Found Dutch detection: {dutch_detection.prob}, using it instead of {best_lang.lang}:{best_lang.prob}")
-            best_lang = dutch_detection
-        
-        short2 = best_lang.lang
-        try:
-            short3 = Language.get(short2).to_alpha3(variant='B')
-            naam = Language.get(short2).display_name()
-        except Exception as lang_error:
-            print(f"❌ Error getting language info for {short2}: {lang_error}")
-            short3 = short2.upper()  # Fallback
-            naam = short2.upper()    # Fallback
-        print(f"✅ Returning: {short2}, {short3}, {naam}, {best_lang.prob}")
-        return short2, short3, naam, best_lang.prob, text_lines[0] if text_lines else ""
-    except Exception as e:
-        print(f"❌ Exception in lang_detect: {e}")
-        import traceback
-        traceback.print_exc()
-        return "xx", "xxx", "No Language", 0.0, f"Detection error: {str(e)}"
-    
-    # Fallback if no language detected
-    return "xx", "xxx", "No Language", 0.0, "No detection result"
+        return get_language_detector().detect_many(files)
+    except ImportError:
+        _notify_missing_langdetect()
+        return {f: ("xx", "xxx", "No Language", 0.0, "Missing dependency") for f in files}
 
 @menu_tag(label="Translate", group="subtitles")
 def sub_translate():
@@ -1034,7 +965,10 @@ def sub_translate():
     try:
         import argostranslate.translate
         import argostranslate.package
-        from .translate_srt_argos import load_translation_model, translate_srt, normalize_language_code
+        from .translate_srt_argos import (
+            load_translation_model, translate_srt, normalize_language_code, is_translation_model_cached,
+        )
+        from .translation_memory import get_translation_memory
     except ImportError as e:
         tb_update('tb_info', f"❌ Translation failed: Missing argostranslate. Install with: pip install argostranslate", "rood")
         return
@@ -1044,80 +978,174 @@ def sub_translate():
     failed_count = 0
     status_slot = s.bottomrow_label
 
+    # Segments translated before (intros, songs, credits) come from here
+    memory = get_translation_memory()
+    memory.reset_stats()
+
     import threading
 
-    def worker():
+    def cancelled():
+        return getattr(s, 'batch_running', False) and getattr(s, 'batch_cancel_requested', False)
+
+    detected_langs = {}
+
+    def prepare_job(fil):
+        """(output_file, source_lang, target_lang), or None when the file is skipped."""
+        # Parse the input file
+        file_info = fils(fil)
+        input_dir = file_info.f_path
+        raw_name = file_info.f_name  # e.g. "Movie.en" or "Movie.en.sync"
+
+        # Strip any trailing language/processing suffixes so output is "Movie.nl.srt"
+        # not "Movie.en.nl.srt" or "Movie.en.sync.nl.srt"
+        import re as _re
+        _known_suffixes = r'(\.(en|nl|fr|de|es|it|pt|ja|zh|ko|sv|no|da|fi|pl|cs|sk|hu|ro|und|eng|dut|nld|fre|fra|ger|deu|spa|ita|por|jpn|chi|zho|kor|swe|nor|dan|fin|pol|cze|ces|slo|slk|hun|rum|ron|sync|tmp))+$'
+        clean_name = _re.sub(_known_suffixes, '', raw_name, flags=_re.IGNORECASE)
+
+        normalized_target_lang = normalize_language_code(target_lang, default='nl')
+
+        # Create output filename with normalized target language
+        output_file = os.path.join(input_dir, f"{clean_name}.{normalized_target_lang}.srt")
+
+        # Detect source language from the file (batched up front in worker())
+        detected = detected_langs.get(fil) or lang_detect(fil)
+        source_lang = normalize_language_code(detected[0], default='en')  # Get detected language code
+        if source_lang == "xx":  # No language detected
+            source_lang = "en"  # Default to English
+
+        # Skip if source and target are the same
+        if source_lang == normalized_target_lang:
+            s.app.after(0, lambda f=fil, sl=source_lang: tb_update('tb_info', f"⚠️ {os.path.basename(f)}: Source and target languages are the same ({sl}), skipping...", "geel"))
+            return None
+        return output_file, source_lang, normalized_target_lang
+
+    def translate_here(idx, fil, output_file, source_lang, normalized_target_lang):
+        """One file in this thread, with the model cache of the app process."""
         nonlocal translated_count, failed_count
-        s.batch_step_done = False  # signal: async step in progress
-        for idx, fil in enumerate(srt_files, 1):
-            try:
-                # Parse the input file
-                file_info = fils(fil)
-                input_dir = file_info.f_path
-                raw_name = file_info.f_name  # e.g. "Movie.en" or "Movie.en.sync"
-
-                # Strip any trailing language/processing suffixes so output is "Movie.nl.srt"
-                # not "Movie.en.nl.srt" or "Movie.en.sync.nl.srt"
-                import re as _re
-                _known_suffixes = r'(\.(en|nl|fr|de|es|it|pt|ja|zh|ko|sv|no|da|fi|pl|cs|sk|hu|ro|und|eng|dut|nld|fre|fra|ger|deu|spa|ita|por|jpn|chi|zho|kor|swe|nor|dan|fin|pol|cze|ces|slo|slk|hun|rum|ron|sync|tmp))+$'
-                clean_name = _re.sub(_known_suffixes, '', raw_name, flags=_re.IGNORECASE)
-
-                normalized_target_lang = normalize_language_code(target_lang, default='nl')
-
-                # Create output filename with normalized target language
-                output_file = os.path.join(input_dir, f"{clean_name}.{normalized_target_lang}.srt")
-
-                # Detect source language from the file
-                detected = lang_detect(fil)
-                source_lang = normalize_language_code(detected[0], default='en')  # Get detected language code
-                if source_lang == "xx":  # No language detected
-                    source_lang = "en"  # Default to English
-
-                # Skip if source and target are the same
-                if source_lang == normalized_target_lang:
-                    s.app.after(0, lambda f=fil, sl=source_lang: tb_update('tb_info', f"⚠️ {os.path.basename(f)}: Source and target languages are the same ({sl}), skipping...", "geel"))
-                    continue
-
-                # Load translation model (will auto-download if needed)
-                s.app.after(0, lambda idx=idx, f=fil: tb_update('tb_info', f"🔄 [{idx}/{len(srt_files)}] Preparing translation for {os.path.basename(f)}...", "normal"))
-                # DEBUG: mark start of model load
-                s.app.after(0, lambda: tb_update('tb_info', "ℹ️ Loading translation model (this may take a while)...", "normal"))
+        # Load translation model (will auto-download if needed)
+        s.app.after(0, lambda idx=idx, f=fil: tb_update('tb_info', f"🔄 [{idx}/{len(srt_files)}] Preparing translation for {os.path.basename(f)}...", "normal"))
+        # Models stay loaded between files and batch runs
+        if not is_translation_model_cached(source_lang, normalized_target_lang):
+            s.app.after(0, lambda: tb_update('tb_info', "ℹ️ Loading translation model (this may take a while)...", "normal"))
 
-                try:
-                    translation = load_translation_model(from_code=source_lang, to_code=normalized_target_lang)
-                except Exception as e:
-                    s.app.after(0, lambda e=e: tb_update('tb_info', f"❌ Failed to load translation model: {e}", "rood"))
-                    failed_count += 1
-                    continue
+        try:
+            translation = load_translation_model(from_code=source_lang, to_code=normalized_target_lang)
+        except Exception as e:
+            s.app.after(0, lambda e=e: tb_update('tb_info', f"❌ Failed to load translation model: {e}", "rood"))
+            failed_count += 1
+            return
 
-                # Show translating message and progress bar (on main thread)
-                s.app.after(0, lambda idx=idx, f=fil, sl=source_lang, tl=normalized_target_lang: tb_update('tb_info', f"🔄 [{idx}/{len(srt_files)}] Translating {os.path.basename(f)} ({sl}→{tl})...", "normal"))
-                if status_slot:
-                    s.app.after(0, lambda: (status_slot.show_progress(mode="determinate"), status_slot.update_progress(0, "0%")))
+        # Show translating message and progress bar (on main thread)
+        s.app.after(0, lambda idx=idx, f=fil, sl=source_lang, tl=normalized_target_lang: tb_update('tb_info', f"🔄 [{idx}/{len(srt_files)}] Translating {os.path.basename(f)} ({sl}→{tl})...", "normal"))
+        if status_slot:
+            s.app.after(0, lambda: (status_slot.show_progress(mode="determinate"), status_slot.update_progress(0, "0%")))
 
-                # Define progress callback that schedules updates on main thread
-                def update_progress(current, total):
-                    progress = current / total if total else 0
-                    if status_slot:
-                        s.app.after(0, lambda p=progress, cur=current, tot=total: status_slot.update_progress(p, f"{cur}/{tot}"))
+        # Define progress callback that schedules updates on main thread
+        def update_progress(current, total):
+            progress = current / total if total else 0
+            if status_slot:
+                s.app.after(0, lambda p=progress, cur=current, tot=total: status_slot.update_progress(p, f"{cur}/{tot}"))
 
-                # Perform translation (runs in worker thread)
-                try:
-                    translate_srt(fil, output_file, translation, progress_callback=update_progress)
-                except Exception as te:
-                    raise
+        # Perform translation (runs in worker thread)
+        translate_srt(fil, output_file, translation, progress_callback=update_progress,
+                      memory=memory, lang_pair=(source_lang, normalized_target_lang))
+        translated_count += 1
 
+    def translate_in_pool(jobs, workers, python_cmd):
+        """All files on worker processes, each with its own loaded model."""
+        nonlocal translated_count, failed_count
+        from .translate_pool import TranslatePool, TranslateJob
+
+        s.app.after(0, lambda: tb_update('tb_info', f"🔄 Translating {len(jobs)} file(s) with {workers} worker processes...", "normal"))
+        if status_slot:
+            s.app.after(0, lambda: (status_slot.show_progress(mode="determinate"), status_slot.update_progress(0, "0%")))
+
+        def on_progress(fraction, done, total):
+            if status_slot:
+                s.app.after(0, lambda p=fraction, d=done, t=total: status_slot.update_progress(p, f"{d}/{t} files"))
+
+        def on_result(job, ok, message):
+            nonlocal translated_count, failed_count
+            name = os.path.basename(job.input)
+            if ok:
                 translated_count += 1
+                s.app.after(0, lambda n=name, j=job: tb_update('tb_info', f"✅ {n} ({j.src}→{j.tgt})", "normal"))
+            elif message == "cancelled":
+                s.app.after(0, lambda n=name: tb_update('tb_info', f"⏹️ Stopped: {n}", "geel"))
+            else:
+                failed_count += 1
+                s.app.after(0, lambda n=name, m=message: tb_update('tb_info', f"❌ Failed to translate {n}: {m}", "rood"))
+
+        pool = TranslatePool(
+            python_cmd, workers, memory_path=memory.db_path,
+            on_progress=on_progress, on_result=on_result,
+            register=s.register_process, unregister=s.unregister_process,
+            cancelled=cancelled, popen_kwargs=_no_console_subprocess_kwargs(),
+        )
+        pool.run(TranslateJob(idx, fil, out, src, tgt) for idx, fil, out, src, tgt in jobs)
+        memory.hits += pool.memory_hits
+        memory.misses += pool.memory_misses
+
+    def worker():
+        nonlocal translated_count, failed_count
+        s.batch_step_done = False  # signal: async step in progress
+
+        detected_langs.update(lang_detect_many(srt_files))
+        s.app.after(0, lambda: _refresh_file_languages(s))
 
+        jobs = []
+        for idx, fil in enumerate(srt_files, 1):
+            if cancelled():
+                break
+            try:
+                job = prepare_job(fil)
             except Exception as e:
                 failed_count += 1
                 s.app.after(0, lambda f=fil, e=e: tb_update('tb_info', f"❌ Failed to translate {os.path.basename(f)}: {str(e)}", "rood"))
-                import traceback
-                traceback.print_exc()
+                continue
+            if job:
+                jobs.append((idx, fil, *job))
+
+        # Several files: one process per worker, bounded by cores and RAM
+        workers = 1
+        python_cmd = None
+        if len(jobs) > 1:
+            from .translate_pool import default_worker_count, WORKER_SCRIPT
+            from .translate_srt_argos import total_ram_mb
+            try:
+                configured = int(get_config_manager().get("persistent_cfg", "TranslateWorkers", 0))
+            except Exception:
+                configured = 0
+            workers = default_worker_count(len(jobs), ram_mb=total_ram_mb(), configured=configured)
+            if workers > 1 and os.path.exists(WORKER_SCRIPT):
+                try:
+                    python_cmd = _resolve_python_command()
+                except FileNotFoundError:
+                    workers = 1
+            else:
+                workers = 1
+
+        if workers > 1:
+            translate_in_pool(jobs, workers, python_cmd)
+        else:
+            for idx, fil, output_file, source_lang, tl in jobs:
+                if cancelled():
+                    s.app.after(0, lambda: tb_update('tb_info', "⏹️ Translation cancelled.", "geel"))
+                    break
+                try:
+                    translate_here(idx, fil, output_file, source_lang, tl)
+                except Exception as e:
+                    failed_count += 1
+                    s.app.after(0, lambda f=fil, e=e: tb_update('tb_info', f"❌ Failed to translate {os.path.basename(f)}: {str(e)}", "rood"))
+                    import traceback
+                    traceback.print_exc()
 
         # Reset progress bar and show final summary
         if status_slot:
             s.app.after(0, lambda: status_slot.reset())
+        stats = memory.stats()
+        if stats["hits"]:
+            s.app.after(0, lambda st=stats: tb_update('tb_info', f"📚 Translation memory: {st['hits']}/{st['hits'] + st['misses']} segments reused ({st['hit_rate']:.0%})", "normal"))
         if failed_count == 0:
             s.app.after(0, lambda: tb_update('tb_info', f"✅ Translation completed: {translated_count} file(s) translated successfully", "groen"))
         else:
@@ -0,0 +1,156 @@
+#-------------------------------------------------------------------------------
+# Name:        sync_service.py
+# Purpose:      - Synchronise many SRTs against their videos in one
+#                 _sync_worker.py process (ffsubsync imported once)
+#               - The worker caches each video's speech reference on disk,
+#                 so several SRTs for one video decode its audio once
+#
+# Author:      EddyS
+#
+# Created:     18/10/2026
+# Copyright:   (c) EddyS 2026
+# Licence:     <your licence>
+#-------------------------------------------------------------------------------
+# actions/lb_files/subtitles/sync_service.py
+#
+# Worker replies per job: DONE:id:cache|decoded:offset or ERROR:id:message.
+
+import json
+import os
+import queue
+
+try:
+    from . import _worker_protocol as protocol
+except ImportError:
+    # Loaded as a plain file (tests): the helper sits next to it
+    import sys
+    here = os.path.dirname(os.path.abspath(__file__))
+    if here not in sys.path:
+        sys.path.insert(0, here)
+    import _worker_protocol as protocol
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_sync_worker.py")
+CACHE_DIR_NAME = "sync_cache"
+
+
+def default_cache_dir():
+    """Settings/sync_cache (frozen-aware)."""
+    try:
+        from config.smart_config_manager import get_config_manager
+        return str(get_config_manager().config_dir / CACHE_DIR_NAME)
+    except Exception:
+        return os.path.join(os.path.dirname(os.path.abspath(__file__)), CACHE_DIR_NAME)
+
+
+class SyncJob:
+    __slots__ = ("id", "video", "srt", "output")
+
+    def __init__(self, job_id, video, srt, output):
+        self.id = str(job_id)
+        self.video = video
+        self.srt = srt
+        self.output = output
+
+    def to_json(self):
+        return json.dumps({"id": self.id, "video": self.video, "srt": self.srt, "output": self.output})
+
+
+class SyncService:
+    """Run SyncJobs one after another on a single worker process.
+
+    Callbacks (all optional, called from the thread that runs run()):
+      on_start(job)
+      on_result(job, ok, message, detail)  - detail: "cache"/"decoded" + offset
+      register(proc) / unregister(proc)    - batch stop can terminate it
+      cancelled() -> bool                  - polled; True stops the worker
+    """
+
+    POLL_SECONDS = 0.2
+
+    def __init__(self, python_cmd, cache_dir=None, worker_script=WORKER_SCRIPT,
+                 on_start=None, on_result=None, register=None, unregister=None,
+                 cancelled=None, popen_kwargs=None):
+        self.python_cmd = list(python_cmd)
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.worker_script = worker_script
+        self.on_start = on_start
+        self.on_result = on_result
+        self.register = register
+        self.unregister = unregister
+        self.cancelled = cancelled
+        self.popen_kwargs = popen_kwargs or {}
+        self.decoded = 0
+        self.from_cache = 0
+
+    def run(self, jobs):
+        """Returns {job.id: (ok, message)}; unfinished jobs report 'cancelled'."""
+        jobs = list(jobs)
+        results = {}
+        if not jobs:
+            return results
+
+        events = queue.Queue()
+        worker = protocol.Worker([*self.python_cmd, self.worker_script, self.cache_dir],
+                                 events, popen_kwargs=self.popen_kwargs)
+        if self.register:
+            self.register(worker.proc)
+
+        pending = list(reversed(jobs))
+        current = None
+        stopping = False
+
+        def finish(job, ok, message, detail=None):
+            results[job.id] = (ok, message)
+            if self.on_result:
+                self.on_result(job, ok, message, detail)
+
+        try:
+            while True:
+                event = protocol.next_event(events, self.cancelled, self.POLL_SECONDS)
+                if event is None:
+                    stopping = True
+                    if current is not None:
+                        finish(current, False, "cancelled")
+                    break
+
+                line = event[1]
+                if line is None:
+                    if current is not None:
+                        finish(current, False, "worker stopped")
+                    break
+
+                kind, _, rest = line.partition(":")
+                if line == "READY":
+                    current = None
+                    if pending:
+                        current = pending.pop()
+                        if self.on_start:
+                            self.on_start(current)
+                        if not worker.send(current.to_json()):
+                            finish(current, False, "worker stopped")
+                            break
+                    else:
+                        worker.release()
+                elif kind == "DONE" and current is not None:
+                    _, source, offset = rest.split(":", 2)
+                    if source == "cache":
+                        self.from_cache += 1
+                    else:
+                        self.decoded += 1
+                    finish(current, True, "", (source, float(offset)))
+                    current = None
+                elif kind == "ERROR" and current is not None:
+                    finish(current, False, rest.partition(":")[2])
+                    current = None
+        except ValueError:
+            # Unreadable reply: the remaining jobs are reported below
+            pass
+        finally:
+            worker.close()
+            if self.unregister:
+                self.unregister(worker.proc)
+
+        for job in jobs:
+            if job.id not in results:
+                results[job.id] = (False, "cancelled" if stopping else "worker stopped")
+        return results
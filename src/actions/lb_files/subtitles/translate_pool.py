@@ -0,0 +1,195 @@
+#-------------------------------------------------------------------------------
+# Name:        translate_pool.py
+# Purpose:      - Translate many subtitle files with several worker processes
+#               - Each _translate_worker.py keeps its own loaded model and
+#                 pulls the next job when it reports READY
+#               - Per-file progress is aggregated into one overall fraction
+#
+# Author:      EddyS
+#
+# Created:     18/10/2026
+# Copyright:   (c) EddyS 2026
+# Licence:     <your licence>
+#-------------------------------------------------------------------------------
+# actions/lb_files/subtitles/translate_pool.py
+#
+# Worker replies per job: PROGRESS:id:done:total, then DONE:id:hits:misses
+# (translation memory) or ERROR:id:message.
+
+import json
+import os
+import queue
+from collections import deque
+
+try:
+    from . import _worker_protocol as protocol
+except ImportError:
+    # Loaded as a plain file (tests): the helper sits next to it
+    import sys
+    here = os.path.dirname(os.path.abspath(__file__))
+    if here not in sys.path:
+        sys.path.insert(0, here)
+    import _worker_protocol as protocol
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_translate_worker.py")
+
+# Rough resident size of one worker with a loaded model (see MODEL_RAM_MB)
+WORKER_RAM_MB = 600
+# CTranslate2 threads per worker; fewer, fatter workers beat many thin ones
+THREADS_PER_WORKER = 4
+
+
+def default_worker_count(n_jobs, cpu_count=None, ram_mb=None, configured=0):
+    """Workers for n_jobs files, bounded by cores and RAM.
+
+    configured > 0 (persistent_cfg "TranslateWorkers") caps the result;
+    0 means automatic. 1 means: translate in-process, one file at a time.
+    """
+    cpu_count = cpu_count or os.cpu_count() or 1
+    workers = max(1, cpu_count // THREADS_PER_WORKER)
+    if ram_mb:
+        workers = min(workers, max(1, int(ram_mb * 0.5) // WORKER_RAM_MB))
+    if configured > 0:
+        workers = min(workers, configured)
+    return max(1, min(workers, n_jobs))
+
+
+class TranslateJob:
+    __slots__ = ("id", "input", "output", "src", "tgt")
+
+    def __init__(self, job_id, input_path, output_path, src, tgt):
+        self.id = str(job_id)
+        self.input = input_path
+        self.output = output_path
+        self.src = src
+        self.tgt = tgt
+
+    def to_json(self):
+        return json.dumps({"id": self.id, "input": self.input, "output": self.output,
+                           "from": self.src, "to": self.tgt})
+
+
+class TranslatePool:
+    """Run TranslateJobs on `workers` worker processes until all are done.
+
+    Callbacks (all optional, called from the thread that runs run()):
+      on_progress(fraction, done_files, total_files)
+      on_result(job, ok, message)
+      register(proc) / unregister(proc)   - batch stop can terminate them
+      cancelled() -> bool                 - polled; True stops all workers
+    """
+
+    POLL_SECONDS = 0.2
+
+    def __init__(self, python_cmd, workers, memory_path=None, worker_script=WORKER_SCRIPT,
+                 on_progress=None, on_result=None, register=None, unregister=None,
+                 cancelled=None, popen_kwargs=None):
+        self.python_cmd = list(python_cmd)
+        self.workers = max(1, workers)
+        self.memory_path = memory_path
+        self.worker_script = worker_script
+        self.on_progress = on_progress
+        self.on_result = on_result
+        self.register = register
+        self.unregister = unregister
+        self.cancelled = cancelled
+        self.popen_kwargs = popen_kwargs or {}
+        self.memory_hits = 0
+        self.memory_misses = 0
+
+    def _start_worker(self, events, index):
+        threads = str(max(1, (os.cpu_count() or 1) // self.workers))
+        env = {"ARGOS_INTRA_THREADS": os.environ.get("ARGOS_INTRA_THREADS", threads)}
+        worker = protocol.Worker([*self.python_cmd, self.worker_script, self.memory_path or "-"],
+                                 events, key=index, env=env, popen_kwargs=self.popen_kwargs)
+        if self.register:
+            self.register(worker.proc)
+        return worker
+
+    def run(self, jobs):
+        """Returns {job.id: (ok, message)}; unfinished jobs report 'cancelled'."""
+        jobs = list(jobs)
+        pending = deque(jobs)
+        by_id = {job.id: job for job in jobs}
+        progress = {job.id: 0.0 for job in jobs}
+        results = {}
+        events = queue.Queue()
+
+        workers = [self._start_worker(events, i) for i in range(min(self.workers, len(jobs)))]
+        running = set(range(len(workers)))
+        assigned = {}   # worker index -> job id in progress
+        stopping = False
+
+        def report():
+            if self.on_progress and jobs:
+                self.on_progress(sum(progress.values()) / len(jobs), len(results), len(jobs))
+
+        def finish(job_id, ok, message):
+            if job_id in by_id and job_id not in results:
+                results[job_id] = (ok, message)
+                progress[job_id] = 1.0
+                if self.on_result:
+                    self.on_result(by_id[job_id], ok, message)
+                report()
+
+        try:
+            while running:
+                event = protocol.next_event(events, self.cancelled, self.POLL_SECONDS)
+                if event is None:
+                    stopping = True
+                    for worker in workers:
+                        worker.terminate()
+                    for job_id in assigned.values():
+                        finish(job_id, False, "cancelled")
+                    break
+
+                index, line = event
+                if line is None:
+                    running.discard(index)
+                    if index in assigned:
+                        finish(assigned.pop(index), False, "worker stopped")
+                    continue
+
+                kind, _, rest = line.partition(":")
+                if line == "READY":
+                    assigned.pop(index, None)
+                    if pending:
+                        job = pending.popleft()
+                        if workers[index].send(job.to_json()):
+                            assigned[index] = job.id
+                        else:
+                            pending.appendleft(job)
+                    else:
+                        workers[index].release()
+                elif kind == "PROGRESS":
+                    try:
+                        job_id, current, total = rest.rsplit(":", 2)
+                        fraction = int(current) / int(total)
+                    except (ValueError, ZeroDivisionError):
+                        continue  # Malformed line (e.g. library output on stdout)
+                    if job_id in progress and job_id not in results:
+                        progress[job_id] = fraction
+                        report()
+                elif kind == "DONE":
+                    job_id, *counts = rest.rsplit(":", 2)
+                    try:
+                        hits, misses = map(int, counts)
+                    except ValueError:
+                        hits = misses = 0  # Malformed memory counts; the file itself is done
+                    self.memory_hits += hits
+                    self.memory_misses += misses
+                    finish(job_id, True, "")
+                elif kind == "ERROR":
+                    job_id, _, message = rest.partition(":")
+                    finish(job_id, False, message)
+        finally:
+            for worker in workers:
+                worker.close()
+                if self.unregister:
+                    self.unregister(worker.proc)
+
+        for job in jobs:
+            if job.id not in results:
+                results[job.id] = (False, "cancelled" if stopping else "worker stopped")
+        return results
+
@@ -9,9 +9,11 @@
 # Licence:     <your licence>
 #-------------------------------------------------------------------------------
 
-import re
 import sys
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
 
 
 _LANG_CODE_ALIASES = {
@@ -175,11 +177,92 @@ def ensure_translation_pair_installed(from_code, to_code):
         return False
 
 
+# ───────────────────────────────────────────────
+# MODEL CACHE
+# ───────────────────────────────────────────────
+
+# Rough resident size of one loaded Argos model (CTranslate2 + sentencepiece)
+MODEL_RAM_MB = 400
+MAX_CACHED_MODELS = 4
+
+_model_cache = OrderedDict()   # (from, to) -> translation, most recent last
+_model_lock = threading.Lock()
+
+
+def total_ram_mb():
+    """Physical memory in MB, or None when it cannot be determined."""
+    try:
+        if sys.platform == 'win32':
+            import ctypes
+
+            class MEMORYSTATUSEX(ctypes.Structure):
+                _fields_ = [
+                    ('dwLength', ctypes.c_ulong), ('dwMemoryLoad', ctypes.c_ulong),
+                    ('ullTotalPhys', ctypes.c_ulonglong), ('ullAvailPhys', ctypes.c_ulonglong),
+                    ('ullTotalPageFile', ctypes.c_ulonglong), ('ullAvailPageFile', ctypes.c_ulonglong),
+                    ('ullTotalVirtual', ctypes.c_ulonglong), ('ullAvailVirtual', ctypes.c_ulonglong),
+                    ('ullAvailExtendedVirtual', ctypes.c_ulonglong),
+                ]
+
+            stat = MEMORYSTATUSEX()
+            stat.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+            if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(stat)):
+                return stat.ullTotalPhys // (1024 * 1024)
+            return None
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def model_cache_limit():
+    """Models kept loaded: a quarter of the RAM, between 1 and MAX_CACHED_MODELS."""
+    ram_mb = total_ram_mb()
+    if not ram_mb:
+        return 1
+    return max(1, min(MAX_CACHED_MODELS, int(ram_mb * 0.25) // MODEL_RAM_MB))
+
+
+def is_translation_model_cached(from_code="en", to_code="nl"):
+    key = (normalize_language_code(from_code, default="en"),
+           normalize_language_code(to_code, default="nl"))
+    with _model_lock:
+        return key in _model_cache
+
+
+def clear_translation_model_cache():
+    with _model_lock:
+        _model_cache.clear()
+
+
 def load_translation_model(from_code="en", to_code="nl"):
-    """Load translation model, automatically download if needed."""
+    """Load translation model, automatically download if needed.
+
+    Loaded models stay in an LRU cache keyed by (from, to) for the lifetime
+    of the process; a cached pair skips the package checks entirely.
+    """
     from_code = normalize_language_code(from_code, default="en")
     to_code = normalize_language_code(to_code, default="nl")
+    key = (from_code, to_code)
+
+    with _model_lock:
+        translation = _model_cache.get(key)
+        if translation is not None:
+            _model_cache.move_to_end(key)
+            return translation
+
+    translation = _load_translation_model(from_code, to_code)
+
+    with _model_lock:
+        _model_cache[key] = translation
+        _model_cache.move_to_end(key)
+        limit = model_cache_limit()
+        while len(_model_cache) > limit:
+            evicted, _ = _model_cache.popitem(last=False)
+            _status(f"♻️ Unloaded translation model {evicted[0]} → {evicted[1]}")
+    return translation
 
+
+def _load_translation_model(from_code, to_code):
     get_argos_data_dir()
     argostranslate = _import_argos()
 
@@ -219,7 +302,318 @@ def load_translation_model(from_code="en", to_code="nl"):
     
     return translation
 
-def translate_srt(input_path, output_path, translation, progress_callback=None):
+def _srt_cues():
+    """Cue parser; relative import in the app, plain import when run standalone."""
+    try:
+        from . import srt_cues
+    except ImportError:
+        here = os.path.dirname(os.path.abspath(__file__))
+        if here not in sys.path:
+            sys.path.insert(0, here)
+        import srt_cues
+    return srt_cues
+
+
+# Seconds one block may take before the original text is kept
+BLOCK_TIMEOUT = 30
+# Cues between .part checkpoints (0 = only the final commit)
+CHECKPOINT_EVERY = 50
+# Cues per model call in batched mode (1 = one call per cue)
+BATCH_CUES = 24
+# Sentence spans: at most this many cues, not across pauses longer than this
+MAX_SPAN_CUES = 4
+MAX_SPAN_GAP_MS = 1500
+
+_SENTENCE_END = ('.', '!', '?', '…', '♪', '"', '”', ')', ']')
+_BREAK_CHARS = ',.;:!?…'
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """Single long-lived worker thread that runs translation.translate."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="argos-translate")
+        return _executor
+
+
+def _abandon_executor(executor):
+    """A timed-out block keeps its thread busy; later blocks get a fresh one."""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False)
+
+
+def _safe_translate(translation_obj, text, timeout=BLOCK_TIMEOUT):
+    """Run translation.translate(text) with a timeout; on failure return original text."""
+    if not text:
+        return ""
+    executor = _get_executor()
+    try:
+        future = executor.submit(translation_obj.translate, text)
+        return future.result(timeout=timeout)
+    except TimeoutError:
+        future.cancel()
+        _abandon_executor(executor)
+        _status("⚠️ Translation timed out for block: returning original text")
+        return text
+    except Exception as e:
+        _status(f"❌ Translation error: {e}")
+        return text
+
+
+def _atomic_write_text(path, text):
+    tmp_path = path + ".part"
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class _CheckpointWriter:
+    """Buffered SRT output in <output>.part, renamed onto the output on commit.
+
+    Every `every` cues the part file is flushed and fsynced, so a crashed or
+    failed run can resume from the last complete cue (see resume_point).
+    """
+
+    def __init__(self, output_path, every=CHECKPOINT_EVERY):
+        self.output_path = output_path
+        self.part_path = output_path + ".part"
+        self.every = every
+        self._file = None
+        self._since_sync = 0
+        self._kept = []
+
+    def resume_point(self, cues, sub):
+        """Number of leading cues of sub already translated in the part file."""
+        if not self.every or not os.path.exists(self.part_path):
+            return 0
+        try:
+            with open(self.part_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError):
+            return 0
+        done = cues.parse_srt_text(text)
+        if done.preamble != sub.preamble or len(done.cues) > len(sub.cues):
+            return 0
+        for old, new in zip(done.cues, sub.cues):
+            if (old.start, old.end) != (new.start, new.end):
+                return 0
+        count = len(done.cues)
+        # The last block may have been cut off mid-write
+        if count and not text.endswith("\n\n"):
+            count -= 1
+        self._kept = done.cues[:count]
+        return count
+
+    def open(self, cues, preamble, resumed=0):
+        self._file = open(self.part_path, 'w', encoding='utf-8', newline='\n')
+        head = "\n".join(preamble) + "\n\n" if preamble else ""
+        # Rewrite the verified part of a checkpoint, then continue after it
+        kept = cues.serialize_srt(self._kept[:resumed]) if resumed else ""
+        self._file.write(head + kept)
+
+    def write_cue(self, block):
+        self._file.write(block)
+        self._since_sync += 1
+        if self.every and self._since_sync >= self.every:
+            self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        try:
+            os.fsync(self._file.fileno())
+        except OSError:
+            pass
+        self._since_sync = 0
+
+    def commit(self):
+        self._sync()
+        self._file.close()
+        self._file = None
+        os.replace(self.part_path, self.output_path)
+
+    def close(self):
+        """Stop without committing; the part file stays for a later resume."""
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+            self._file = None
+
+
+def _report(progress_callback, current, total):
+    if progress_callback and total > 0:
+        try:
+            progress_callback(current, total)
+        except Exception:
+            pass
+
+
+# ───────────────────────────────────────────────
+# BATCHED TRANSLATION
+# ───────────────────────────────────────────────
+
+def _cue_text(cue):
+    return " ".join(cue.lines).strip()
+
+
+def _sentence_spans(cue_list, max_cues=MAX_SPAN_CUES):
+    """Group consecutive cues that continue one sentence; lists of cue indexes.
+
+    A span ends at sentence punctuation, before a dialogue dash, at a pause
+    longer than MAX_SPAN_GAP_MS or after max_cues cues.
+    """
+    spans, current = [], []
+    for i, cue in enumerate(cue_list):
+        text = _cue_text(cue)
+        if current:
+            prev = cue_list[current[-1]]
+            if (not text or text.startswith('-') or len(current) >= max_cues
+                    or cue.start - prev.end > MAX_SPAN_GAP_MS):
+                spans.append(current)
+                current = []
+        current.append(i)
+        if not text or text.endswith(_SENTENCE_END):
+            spans.append(current)
+            current = []
+    if current:
+        spans.append(current)
+    return spans
+
+
+def _batches(spans, batch_cues):
+    """Spans grouped so that one model call covers about batch_cues cues."""
+    batch, size = [], 0
+    for span in spans:
+        batch.append(span)
+        size += len(span)
+        if size >= batch_cues:
+            yield batch
+            batch, size = [], 0
+    if batch:
+        yield batch
+
+
+def _split_by_weights(text, weights):
+    """Split translated span text over its cues, proportional to source length.
+
+    Boundaries snap to nearby words that end in punctuation so a cue does
+    not start with the tail of a clause when that can be avoided.
+    """
+    parts = len(weights)
+    if parts == 1:
+        return [text]
+    words = text.split()
+    if len(words) <= parts:
+        return words + [""] * (parts - len(words))
+
+    cum = [0]
+    for w in words:
+        cum.append(cum[-1] + len(w) + 1)
+    total_weight = sum(weights) or parts
+    snap = 8  # characters a punctuation boundary may move
+
+    pieces, start, acc = [], 0, 0
+    for n, weight in enumerate(weights[:-1]):
+        acc += weight
+        target = acc / total_weight * cum[-1]
+        last = len(words) - (parts - 1 - n)
+        cut = min(range(start + 1, last),
+                  key=lambda k: abs(cum[k] - target) - (snap if words[k - 1][-1] in _BREAK_CHARS else 0))
+        pieces.append(" ".join(words[start:cut]))
+        start = cut
+    pieces.append(" ".join(words[start:]))
+    return pieces
+
+
+def _translate_spans(translation_obj, texts, memory=None):
+    """Translate span texts with one model call (one line per span).
+
+    Texts found in the translation memory (a TranslationMemory session) skip
+    the model; repeated texts within the batch are translated once. Falls
+    back to one call per span when the model does not return the same
+    number of lines.
+    """
+    known = memory.lookup(texts) if memory is not None else {}
+    pending = [t for t in dict.fromkeys(texts) if t and t not in known]
+
+    results = None
+    if len(pending) > 1:
+        joined = "\n".join(pending)
+        result = _safe_translate(translation_obj, joined, timeout=BLOCK_TIMEOUT * len(pending))
+        lines = result.split("\n")
+        if len(lines) == len(pending):
+            results = [line.strip() for line in lines]
+        else:
+            _status(f"⚠️ Batch returned {len(lines)} lines for {len(pending)} spans: translating one by one")
+    if results is None:
+        results = [_safe_translate(translation_obj, t) for t in pending]
+
+    if memory is not None:
+        # Unchanged text is usually a timeout/error fallback: not remembered
+        memory.store([(t, r) for t, r in zip(pending, results) if r and r != t])
+
+    known.update(zip(pending, results))
+    return [known.get(t, "") if t else "" for t in texts]
+
+
+def _memory_session(memory, translation, lang_pair):
+    """Bind memory to the (from, to) pair; None when the pair is unknown."""
+    if memory is None:
+        return None
+    if lang_pair is None:
+        try:
+            lang_pair = (translation.from_lang.code, translation.to_lang.code)
+        except AttributeError:
+            return None
+    return memory.session(normalize_language_code(lang_pair[0]), normalize_language_code(lang_pair[1]))
+
+
+def translate_ass(in_path, out_path, translation_obj, progress_cb=None, memory=None, lang_pair=None):
+    """Translate only the Text field of ASS/SSA Dialogue lines, keep the rest verbatim."""
+    cues = _srt_cues()
+    doc = cues.parse_ass(in_path)
+
+    if not doc.has_text_field:
+        # fallback: copy file unchanged
+        _atomic_write_text(out_path, "".join(doc.lines))
+        return
+
+    total = len(doc.texts)
+    _report(progress_cb, 0, total)
+
+    # preserve \N line breaks through the translator
+    marker = '|||NEWLINE|||'  # unlikely sequence
+    session = _memory_session(memory, translation_obj, lang_pair)
+    sources = [text.replace('\n', marker).strip() for text in doc.texts]
+    known = session.lookup(sources) if session is not None else {}
+
+    for i, text_for_trans in enumerate(sources):
+        if not text_for_trans:
+            translated = ''
+        elif text_for_trans in known:
+            translated = known[text_for_trans]
+        else:
+            translated = _safe_translate(translation_obj, text_for_trans)
+            known[text_for_trans] = translated
+            if session is not None and translated != text_for_trans:
+                session.store([(text_for_trans, translated)])
+        doc.texts[i] = translated.replace(marker, '\n')
+        _report(progress_cb, i + 1, total)
+
+    _atomic_write_text(out_path, doc.serialize())
+
+
+def translate_srt(input_path, output_path, translation, progress_callback=None,
+                  checkpoint_every=CHECKPOINT_EVERY, batch_cues=BATCH_CUES,
+                  memory=None, lang_pair=None):
     """Translate SRT file with optional progress callback.
     
     Args:
@@ -227,229 +621,55 @@ def translate_srt(input_path, output_path, translation, progress_callback=None):
         output_path: Output SRT file path
         translation: Translation model
         progress_callback: Optional callback(current, total) to report progress
+        checkpoint_every: Cues between resumable checkpoints in output_path + ".part"
+            (0 disables checkpoints; the output is still written atomically)
+        batch_cues: Cues per model call; cues that continue a sentence are
+            translated together and split back over their timecodes
+            (1 = one call per cue)
+        memory: Optional TranslationMemory consulted before the model
+        lang_pair: (from, to) codes for the memory; taken from the
+            translation object when omitted
     """
-    # Helper to open file with multiple encoding fallbacks
-    def open_with_fallback(path, mode='r'):
-        """Open file trying multiple encodings in order."""
-        for encoding in ['utf-8-sig', 'utf-8', 'utf-16', 'latin-1', 'cp1252']:
-            try:
-                return open(path, mode, encoding=encoding)
-            except (UnicodeDecodeError, UnicodeError):
-                continue
-        # Final fallback: use errors='replace' to skip undecodable bytes
-        return open(path, mode, encoding='utf-8', errors='replace')
-    
-    # First pass: count total subtitle blocks
-    total_blocks = 0
-    with open_with_fallback(input_path) as infile:
-        in_text_block = False
-        for line in infile:
-            if re.match(r"^\d+$", line.strip()):
-                total_blocks += 1
-    
-    # Helper: perform translation with a timeout to avoid hanging on a block
-    from concurrent.futures import ThreadPoolExecutor, TimeoutError
+    cues = _srt_cues()
+    text, encoding = cues.read_text(input_path)
+
+    # ASS/SSA content (also when it carries an .srt extension)
+    if cues.looks_like_ass(text[:4096]):
+        return translate_ass(input_path, output_path, translation, progress_callback,
+                             memory=memory, lang_pair=lang_pair)
+
+    sub = cues.parse_srt_text(text, encoding)
+    total_blocks = len(sub.cues)
+
+    writer = _CheckpointWriter(output_path, checkpoint_every)
+    resumed = writer.resume_point(cues, sub)
+    if resumed:
+        _status(f"↩️ Resuming translation at cue {resumed + 1}/{total_blocks}")
 
-    def safe_translate(translation_obj, text, timeout=30):
-        """Run translation.translate(text) with a timeout; on failure return original text."""
-        if not text:
-            return ""
-        try:
-            with ThreadPoolExecutor(max_workers=1) as ex:
-                future = ex.submit(translation_obj.translate, text)
-                return future.result(timeout=timeout)
-        except TimeoutError:
-            _status("⚠️ Translation timed out for block: returning original text")
-            return text
-        except Exception as e:
-            _status(f"❌ Translation error: {e}")
-            return text
-
-    # Second pass: translate with progress reporting
-    import os
-    current_block = 0
     # Inform caller about total blocks (so UI can initialize determinate progress)
-    if progress_callback and total_blocks > 0:
-        try:
-            progress_callback(0, total_blocks)
-        except Exception:
-            pass
+    _report(progress_callback, resumed, total_blocks)
 
-    # Heuristic: preserve preamble/header lines (e.g., ASS/SSA "[Script Info]" or "Format:")
-    seen_first_index = False
-    # If file looks like an ASS/SSA file with Dialogue lines and a Format specifying Text,
-    # handle it specially by translating only the Text field while preserving formatting.
-    def translate_ass(in_path, out_path, translation_obj, progress_cb=None):
-        fmt_fields = []
-        total_dialogues = 0
-        # First pass: discover Format fields and count Dialogue lines
-        with open_with_fallback(in_path) as f:
-            for ln in f:
-                if ln.strip().lower().startswith('format:'):
-                    # e.g. "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text"
-                    fmt_fields = [x.strip() for x in ln.split(':', 1)[1].split(',')]
-                if ln.strip().lower().startswith('dialogue:'):
-                    total_dialogues += 1
-
-        # If we have a Format and a Text field, translate dialogues
-        if not fmt_fields or 'Text' not in [f.title() for f in fmt_fields]:
-            # fallback: copy file unchanged
-            with open_with_fallback(in_path) as src, open_with_fallback(out_path, 'w') as dst:
-                dst.write(src.read())
-            return
-
-        text_index = None
-        # find index of Text (case-insensitive)
-        for i, nm in enumerate(fmt_fields):
-            if nm.strip().lower() == 'text':
-                text_index = i
-                break
-
-        current = 0
-        # Inform caller of total for progress
-        if progress_cb and total_dialogues > 0:
-            try:
-                progress_cb(0, total_dialogues)
-            except Exception:
-                pass
-
-        with open_with_fallback(in_path) as src, open_with_fallback(out_path, 'w') as dst:
-            for ln in src:
-                if ln.strip().lower().startswith('dialogue:'):
-                    # split into fields: Dialogue: a,b,c,... where text is last or at text_index
-                    prefix, rest = ln.split(':', 1)
-                    # split into N parts where N = len(fmt_fields)-1 so remainder is text (which may contain commas)
-                    parts = [p for p in rest.split(',', len(fmt_fields)-1)]
-                    if text_index is None or text_index >= len(parts):
-                        # fallback: treat last part as text
-                        text = parts[-1]
-                    else:
-                        text = parts[text_index]
-
-                    # preserve escape for newlines; convert to marker
-                    marker = '|||NEWLINE|||'  # unlikely sequence
-                    text_for_trans = text.replace('\\N', marker).replace('\\n', marker)
-                    # strip leading/trailing whitespace
-                    text_for_trans_stripped = text_for_trans.strip()
-
-                    try:
-                        translated_text = safe_translate(translation_obj, text_for_trans_stripped, timeout=30) if text_for_trans_stripped else ''
-                    except Exception:
-                        translated_text = text_for_trans_stripped
-
-                    # restore marker to \N
-                    translated_text = translated_text.replace(marker, '\\N')
-
-                    # rebuild parts with translated text
-                    if text_index is None or text_index >= len(parts):
-                        parts[-1] = translated_text
-                    else:
-                        parts[text_index] = translated_text
-
-                    new_rest = ','.join(parts)
-                    dst.write(f"{prefix}:{new_rest}")
-                    current += 1
-                    if progress_cb and total_dialogues > 0:
-                        try:
-                            progress_cb(current, total_dialogues)
-                        except Exception:
-                            pass
-                else:
-                    dst.write(ln)
-
-    # Quick detection: if file contains an ASS/SSA header and Dialogue lines, use translate_ass
+    writer.open(cues, sub.preamble, resumed)
     try:
-        with open(input_path, 'r', encoding='utf-8', errors='replace') as _fcheck:
-            sample = _fcheck.read(4096)
-            if ('[script info]' in sample.lower() or '[v4+' in sample.lower() or 'format:' in sample.lower()) and 'dialogue:' in sample.lower():
-                # treat as ASS-like file
-                return translate_ass(input_path, output_path, translation, progress_callback)
-    except Exception:
-        pass
-    with open_with_fallback(input_path) as infile, open_with_fallback(output_path, 'w') as outfile:
-        buffer = []          # stripped lines for translation
-        buffer_raw = []      # original lines for possible header passthrough
-        for line in infile:
-            is_index = bool(re.match(r"^\d+$", line.strip()))
-            is_timecode = bool(re.match(r"^\d{2}:\d{2}:\d{2}[,\.]\d{3}", line.strip()))
-            is_blank = line.strip() == ""
-
-            if is_index or is_timecode or is_blank:
-                if buffer:
-                    # If we haven't seen the first numeric index yet, check whether the
-                    # buffered lines look like a header/preamble (ASS/SSA or metadata).
-                    is_preamble = (not seen_first_index) and any(
-                        (ln.strip().startswith("[") or "Format:" in ln or "Script Info" in ln or "PlayRes" in ln or "ScaledBorder" in ln or "V4+" in ln or ln.strip().startswith("Style:") )
-                        for ln in buffer_raw
-                    )
-
-                    if is_preamble:
-                        # Write raw header lines unchanged
-                        for orig in buffer_raw:
-                            outfile.write(orig)
-                            outfile.flush()
-                            try:
-                                os.fsync(outfile.fileno())
-                            except Exception:
-                                pass
-                    else:
-                        text_to_translate = " ".join(buffer).strip()
-                        translated = safe_translate(translation, text_to_translate, timeout=30) if text_to_translate else ""
-
-                        # Write the translated text followed by a newline, flush to disk
-                        outfile.write(translated + "\n")
-                        outfile.flush()
-                        try:
-                            os.fsync(outfile.fileno())
-                        except Exception:
-                            pass
-
-                    buffer = []
-                    buffer_raw = []
-                    current_block += 1
-                    if progress_callback and total_blocks > 0:
-                        progress_callback(current_block, total_blocks)
-
-                # always write structural lines (indexes, timecodes, blank lines)
-                if is_index:
-                    seen_first_index = True
-                outfile.write(line)
-                outfile.flush()
-                try:
-                    os.fsync(outfile.fileno())
-                except Exception:
-                    pass
-            else:
-                buffer.append(line.strip())
-                buffer_raw.append(line)
-
-        # final buffer
-        if buffer:
-            # If the file had no index blocks at all (or final preamble), preserve raw lines
-            if not seen_first_index:
-                for orig in buffer_raw:
-                    outfile.write(orig)
-                    outfile.flush()
-                    try:
-                        os.fsync(outfile.fileno())
-                    except Exception:
-                        pass
-            else:
-                text_to_translate = " ".join(buffer).strip()
-                try:
-                    translated = translation.translate(text_to_translate) if text_to_translate else ""
-                except Exception as te:
-                    _status(f"❌ Translation error for final block: {te}")
-                    translated = text_to_translate
-                outfile.write(translated + "\n")
-                outfile.flush()
-                try:
-                    os.fsync(outfile.fileno())
-                except Exception:
-                    pass
-                current_block += 1
-                if progress_callback and total_blocks > 0:
-                    progress_callback(current_block, total_blocks)
+        session = _memory_session(memory, translation, lang_pair)
+        todo = sub.cues[resumed:]
+        if batch_cues > 1:
+            spans = _sentence_spans(todo)
+        else:
+            spans = [[i] for i in range(len(todo))]
+
+        for batch in _batches(spans, max(1, batch_cues)):
+            texts = [" ".join(_cue_text(todo[i]) for i in span).strip() for span in batch]
+            for span, translated in zip(batch, _translate_spans(translation, texts, session)):
+                pieces = _split_by_weights(translated, [len(_cue_text(todo[i])) for i in span])
+                for i, piece in zip(span, pieces):
+                    number = resumed + i + 1
+                    writer.write_cue(cues.format_cue(number, todo[i], [piece]))
+                    _report(progress_callback, number, total_blocks)
+    except BaseException:
+        writer.close()
+        raise
+    writer.commit()
 
 if __name__ == "__main__":
     if len(sys.argv) != 3:
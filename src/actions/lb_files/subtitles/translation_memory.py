@@ -0,0 +1,264 @@
+#-------------------------------------------------------------------------------
+# Name:        translation_memory.py
+# Purpose:      - On-disk translation memory for subtitle translation
+#               - Segments keyed on (source lang, target lang, normalized text)
+#               - Hit/miss statistics and size-based eviction (least recently
+#                 used segments go first)
+#
+# Author:      EddyS
+#
+# Created:     18/10/2026
+# Copyright:   (c) EddyS 2026
+# Licence:     <your licence>
+#-------------------------------------------------------------------------------
+# actions/lb_files/subtitles/translation_memory.py
+#
+# _translate_worker.py imports it by plain name, next to the worker script.
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+TM_DB_NAME = "translation_memory.sqlite"
+DEFAULT_MAX_ENTRIES = 200_000
+# Stored segments between two eviction checks
+EVICT_EVERY = 500
+# Keep well below SQLite's host parameter limit
+_CHUNK = 400
+
+
+def normalize_segment(text):
+    """Key text: whitespace collapsed, case and punctuation kept."""
+    return " ".join(text.split())
+
+
+def _default_db_path():
+    """Next to the other Settings files (frozen-aware)."""
+    try:
+        from config.smart_config_manager import get_config_manager
+        return get_config_manager().config_dir / TM_DB_NAME
+    except Exception:
+        return Path(__file__).resolve().parents[3] / "Settings" / TM_DB_NAME
+
+
+def get_max_entries():
+    """Size limit from persistent_cfg "TranslationMemoryMax" (default 200000)."""
+    try:
+        from config.smart_config_manager import get_config_manager
+        value = int(get_config_manager().get("persistent_cfg", "TranslationMemoryMax", DEFAULT_MAX_ENTRIES))
+    except Exception:
+        value = DEFAULT_MAX_ENTRIES
+    return max(1000, value)
+
+
+class TranslationMemory:
+    """SQLite segment cache shared by every subtitle translation.
+
+    Lookups and stores take whole lists so a batch of cues costs one query.
+    """
+
+    def __init__(self, db_path=None, max_entries=None):
+        self.db_path = str(db_path) if db_path else None
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = None
+        self._db_failed = False
+        self._since_evict = 0
+        self._last_now = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def _now(self):
+        """Strictly increasing timestamp, so LRU order survives a coarse clock."""
+        self._last_now = max(time.time(), self._last_now + 1e-6)
+        return self._last_now
+
+    def _connect(self):
+        if self._conn is not None or self._db_failed:
+            return self._conn
+        try:
+            if self.db_path is None:
+                self.db_path = str(_default_db_path())
+            if self.max_entries is None:
+                self.max_entries = get_max_entries()
+            conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS segments ("
+                " src TEXT NOT NULL,"
+                " tgt TEXT NOT NULL,"
+                " source TEXT NOT NULL,"
+                " target TEXT NOT NULL,"
+                " uses INTEGER NOT NULL DEFAULT 0,"
+                " last_used REAL NOT NULL,"
+                " UNIQUE (src, tgt, source))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS segments_last_used ON segments (last_used)")
+            conn.commit()
+            self._conn = conn
+        except Exception as e:
+            print(f"⚠️ Translation memory unavailable: {e}")
+            self._db_failed = True
+        return self._conn
+
+    # ───────────────────────────────────────────────
+    # LOOKUP / STORE
+    # ───────────────────────────────────────────────
+
+    def lookup(self, src, tgt, texts):
+        """{text: translation} for the texts that are in the memory."""
+        keys = {}
+        for text in texts:
+            if text:
+                keys.setdefault(normalize_segment(text), []).append(text)
+        if not keys:
+            return {}
+
+        found = {}
+        with self._lock:
+            conn = self._connect()
+            if conn is not None:
+                unique = list(keys)
+                try:
+                    for i in range(0, len(unique), _CHUNK):
+                        chunk = unique[i:i + _CHUNK]
+                        marks = ",".join("?" * len(chunk))
+                        rows = conn.execute(
+                            f"SELECT source, target FROM segments"
+                            f" WHERE src = ? AND tgt = ? AND source IN ({marks})",
+                            (src, tgt, *chunk),
+                        ).fetchall()
+                        found.update(rows)
+                    if found:
+                        now = self._now()
+                        conn.executemany(
+                            "UPDATE segments SET uses = uses + 1, last_used = ?"
+                            " WHERE src = ? AND tgt = ? AND source = ?",
+                            [(now, src, tgt, key) for key in found],
+                        )
+                        conn.commit()
+                except sqlite3.Error as e:
+                    print(f"⚠️ Translation memory lookup failed: {e}")
+
+            hit_count = sum(len(keys[k]) for k in found)
+            self.hits += hit_count
+            self.misses += sum(len(v) for v in keys.values()) - hit_count
+
+        return {text: target for key, target in found.items() for text in keys[key]}
+
+    def store(self, src, tgt, pairs):
+        """Remember (source text, translation) pairs."""
+        with self._lock:
+            now = self._now()
+            rows = [(src, tgt, normalize_segment(s), t, now) for s, t in pairs if s and t]
+            if not rows:
+                return
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO segments (src, tgt, source, target, uses, last_used)"
+                    " VALUES (?, ?, ?, ?, 0, ?)",
+                    rows,
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ Failed to store translations: {e}")
+                return
+            self._since_evict += len(rows)
+            if self._since_evict >= EVICT_EVERY:
+                self._evict(conn)
+
+    def session(self, src, tgt):
+        """Bind a language pair: returns an object with lookup(texts) and store(pairs)."""
+        return _Session(self, src, tgt)
+
+    # ───────────────────────────────────────────────
+    # MAINTENANCE
+    # ───────────────────────────────────────────────
+
+    def _evict(self, conn):
+        self._since_evict = 0
+        try:
+            count = conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+            excess = count - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM segments WHERE rowid IN"
+                    " (SELECT rowid FROM segments ORDER BY last_used, rowid LIMIT ?)",
+                    (excess,),
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Translation memory eviction failed: {e}")
+
+    def evict(self):
+        with self._lock:
+            conn = self._connect()
+            if conn is not None:
+                self._evict(conn)
+
+    def stats(self):
+        """Hit/miss counters of this process plus the stored segment count."""
+        with self._lock:
+            entries = 0
+            conn = self._connect()
+            if conn is not None:
+                try:
+                    entries = conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+                except sqlite3.Error:
+                    pass
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": entries,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            if conn is not None:
+                conn.execute("DELETE FROM segments")
+                conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class _Session:
+    __slots__ = ("memory", "src", "tgt")
+
+    def __init__(self, memory, src, tgt):
+        self.memory = memory
+        self.src = src
+        self.tgt = tgt
+
+    def lookup(self, texts):
+        return self.memory.lookup(self.src, self.tgt, texts)
+
+    def store(self, pairs):
+        self.memory.store(self.src, self.tgt, pairs)
+
+
+_memory = None
+_memory_lock = threading.Lock()
+
+
+def get_translation_memory():
+    """Process-wide TranslationMemory on Settings/translation_memory.sqlite."""
+    global _memory
+    with _memory_lock:
+        if _memory is None:
+            _memory = TranslationMemory(_default_db_path())
+        return _memory
@@ -0,0 +1,213 @@
+#-------------------------------------------------------------------------------
+# Name:        whisper_chunks.py
+# Purpose:      - Chunked transcription support for _whisper_worker.py
+#               - Audio extracted once to 16 kHz mono PCM (s16le)
+#               - Voice activity regions grouped into chunks; silence and
+#                 music between them is never transcribed
+#               - Every finished chunk is stored on disk, so a crashed or
+#                 stopped run resumes from the last finished chunk
+#
+# Author:      EddyS
+#
+# Created:     18/10/2026
+# Copyright:   (c) EddyS 2026
+# Licence:     <your licence>
+#-------------------------------------------------------------------------------
+# actions/lb_files/subtitles/whisper_chunks.py
+#
+# Runs inside the worker process (imported next to _whisper_worker.py).
+# numpy is imported lazily; it comes with faster-whisper.
+
+import json
+import os
+import shutil
+import subprocess
+
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 2
+
+# VAD runs per window so a 2 hour film never sits in memory as float32
+VAD_WINDOW_SECONDS = 600
+# Chunk size: long enough for context, short enough to spread over workers
+MAX_CHUNK_SECONDS = 240
+# Speech regions closer than this stay in one chunk (gap is transcribed)
+MAX_GAP_SECONDS = 8.0
+# Padding around each chunk so words at the edges are not clipped
+PAD_SECONDS = 0.2
+
+
+def _format_timestamp(seconds):
+    total_ms = int(round(seconds * 1000))
+    h, rest = divmod(total_ms, 3600 * 1000)
+    m, rest = divmod(rest, 60 * 1000)
+    s, ms = divmod(rest, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+
+def _write_json(path, data):
+    part = path + ".part"
+    with open(part, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(part, path)
+
+
+# ───────────────────────────────────────────────
+# AUDIO
+# ───────────────────────────────────────────────
+
+def extract_audio(ffmpeg, video_path, pcm_path):
+    """Decode the first audio track to raw 16 kHz mono s16le (~115 MB per hour)."""
+    part = pcm_path + ".part"
+    cmd = [ffmpeg, "-nostdin", "-v", "error", "-y", "-i", video_path,
+           "-map", "0:a:0", "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE),
+           "-f", "s16le", part]
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                            text=True, errors="replace")
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg audio extractie mislukt: {result.stderr.strip()[-300:]}")
+    os.replace(part, pcm_path)
+
+
+def pcm_duration(pcm_path):
+    return os.path.getsize(pcm_path) / (SAMPLE_RATE * BYTES_PER_SAMPLE)
+
+
+def load_audio(pcm_path, start, end):
+    """float32 samples for [start, end) seconds, as faster-whisper expects."""
+    import numpy as np
+    first = max(0, int(start * SAMPLE_RATE))
+    count = max(0, int(end * SAMPLE_RATE) - first)
+    with open(pcm_path, "rb") as f:
+        f.seek(first * BYTES_PER_SAMPLE)
+        raw = f.read(count * BYTES_PER_SAMPLE)
+    return np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+
+
+def speech_regions(pcm_path, vad_fn, window_seconds=VAD_WINDOW_SECONDS):
+    """[(start, end)] in seconds where vad_fn finds speech.
+
+    vad_fn(float32 samples) -> [{"start": sample, "end": sample}, ...]
+    (faster_whisper.vad.get_speech_timestamps).
+    """
+    duration = pcm_duration(pcm_path)
+    regions = []
+    start = 0.0
+    while start < duration:
+        end = min(duration, start + window_seconds)
+        audio = load_audio(pcm_path, start, end)
+        for ts in vad_fn(audio):
+            region = (start + ts["start"] / SAMPLE_RATE, start + ts["end"] / SAMPLE_RATE)
+            # Speech cut by the window edge continues in the next window
+            if regions and region[0] - regions[-1][1] < 0.05:
+                regions[-1] = (regions[-1][0], region[1])
+            else:
+                regions.append(region)
+        start = end
+    return regions
+
+
+def plan_chunks(regions, duration, max_chunk=MAX_CHUNK_SECONDS, max_gap=MAX_GAP_SECONDS,
+                pad=PAD_SECONDS):
+    """Group speech regions into [(start, end)] chunks of at most max_chunk s.
+
+    A region is only split when it is longer than max_chunk by itself.
+    """
+    chunks = []
+    for start, end in regions:
+        start, end = max(0.0, start - pad), min(duration, end + pad)
+        while end - start > max_chunk:
+            chunks.append([start, start + max_chunk])
+            start += max_chunk
+        if chunks and start - chunks[-1][1] <= max_gap and end - chunks[-1][0] <= max_chunk:
+            chunks[-1][1] = max(chunks[-1][1], end)
+        else:
+            chunks.append([start, end])
+    return [(round(a, 3), round(b, 3)) for a, b in chunks]
+
+
+# ───────────────────────────────────────────────
+# CHUNK STORE (resume)
+# ───────────────────────────────────────────────
+
+class ChunkStore:
+    """Work directory of one transcription: audio, plan and finished chunks.
+
+    The signature (video size/mtime, model, language) must match for a
+    later run to reuse what is there; otherwise the directory starts over.
+    """
+
+    def __init__(self, work_dir, signature):
+        self.work_dir = work_dir
+        self.signature = signature
+        self.pcm_path = os.path.join(work_dir, "audio.pcm")
+        self._plan_path = os.path.join(work_dir, "plan.json")
+        self.plan = None
+        os.makedirs(work_dir, exist_ok=True)
+        try:
+            with open(self._plan_path, encoding="utf-8") as f:
+                plan = json.load(f)
+            if plan.get("signature") == signature:
+                self.plan = plan
+        except (OSError, ValueError):
+            pass
+        if self.plan is None:
+            self.reset()
+
+    def reset(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+        os.makedirs(self.work_dir, exist_ok=True)
+        self.plan = None
+
+    def has_audio(self):
+        return os.path.exists(self.pcm_path)
+
+    def save_plan(self, chunks, language=None):
+        self.plan = {"signature": self.signature, "chunks": [list(c) for c in chunks],
+                     "language": language}
+        _write_json(self._plan_path, self.plan)
+
+    def set_language(self, language):
+        self.plan["language"] = language
+        _write_json(self._plan_path, self.plan)
+
+    @property
+    def chunks(self):
+        return [tuple(c) for c in self.plan["chunks"]] if self.plan else None
+
+    @property
+    def language(self):
+        return self.plan.get("language") if self.plan else None
+
+    def _chunk_path(self, index):
+        return os.path.join(self.work_dir, f"chunk_{index:05d}.json")
+
+    def is_done(self, index):
+        return os.path.exists(self._chunk_path(index))
+
+    def save_chunk(self, index, segments):
+        """segments: [(start, end, text)] with absolute times in seconds."""
+        _write_json(self._chunk_path(index), [list(seg) for seg in segments])
+
+    def load_chunk(self, index):
+        with open(self._chunk_path(index), encoding="utf-8") as f:
+            return [tuple(seg) for seg in json.load(f)]
+
+    def write_srt(self, out_srt):
+        """Stitch all chunks into one numbered SRT."""
+        number = 0
+        with open(out_srt, "w", encoding="utf-8") as f:
+            for index in range(len(self.plan["chunks"])):
+                for start, end, text in self.load_chunk(index):
+                    if not text.strip():
+                        continue
+                    number += 1
+                    if number > 1:
+                        f.write("\n")
+                    f.write(f"{number}\n{_format_timestamp(start)} --> "
+                            f"{_format_timestamp(end)}\n{text.strip()}\n")
+        return number
+
+    def remove(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
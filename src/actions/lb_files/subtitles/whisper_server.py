@@ -0,0 +1,203 @@
+#-------------------------------------------------------------------------------
+# Name:        whisper_server.py
+# Purpose:      - Keep one _whisper_worker.py --serve process (and its loaded
+#                 Whisper model) alive across files and Speech to SRT runs
+#               - Jobs go over stdin; the worker answers with the usual
+#                 PROGRESS:/LANG:/DONE:/ERROR: lines
+#               - A crashed or idle-stopped worker is started again for the
+#                 next file
+#               - On CPU the worker transcribes VAD chunks in parallel
+#                 (chunk_workers model workers, see whisper_chunks.py)
+#
+# Author:      EddyS
+#
+# Created:     18/10/2026
+# Copyright:   (c) EddyS 2026
+# Licence:     <your licence>
+#-------------------------------------------------------------------------------
+# actions/lb_files/subtitles/whisper_server.py
+#
+# IDLE before EOF means the worker stopped on its idle timeout; a job sent at
+# that moment is retried once on a fresh worker.
+
+import json
+import os
+import queue
+import subprocess
+import threading
+
+try:
+    from . import _worker_protocol as protocol
+except ImportError:
+    # Loaded as a plain file (tests): the helper sits next to it
+    import sys
+    here = os.path.dirname(os.path.abspath(__file__))
+    if here not in sys.path:
+        sys.path.insert(0, here)
+    import _worker_protocol as protocol
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_whisper_worker.py")
+
+# Seconds without a job before the worker frees the model and exits
+IDLE_TIMEOUT = 300
+# CTranslate2 threads per chunk worker on CPU
+THREADS_PER_CHUNK_WORKER = 4
+MAX_CHUNK_WORKERS = 4
+
+
+def default_chunk_workers(cpu_count=None, configured=0):
+    """Parallel chunk workers on CPU (persistent_cfg "WhisperChunkWorkers").
+
+    0 means automatic; 1 turns chunked transcription off.
+    """
+    if configured > 0:
+        return configured
+    cpu_count = cpu_count or os.cpu_count() or 1
+    return max(1, min(MAX_CHUNK_WORKERS, cpu_count // THREADS_PER_CHUNK_WORKER))
+
+
+class WhisperServer:
+    """One resident transcription worker for a model size + device.
+
+    transcribe() runs one file and returns (ok, language, message).
+    Callbacks (all optional, called from the thread that runs transcribe()):
+      on_line(line)                        - INFO:/WARN:/PROGRESS:/LANG:/other output
+      register(proc) / unregister(proc)    - batch stop can terminate the worker
+      cancelled() -> bool                  - polled; True kills the worker
+    """
+
+    POLL_SECONDS = 0.2
+
+    def __init__(self, python_cmd, model_size, device, idle_timeout=IDLE_TIMEOUT,
+                 chunk_workers=1, ffmpeg=None, worker_script=WORKER_SCRIPT, popen_kwargs=None):
+        self.python_cmd = list(python_cmd)
+        self.model_size = model_size
+        self.device = device
+        self.idle_timeout = idle_timeout
+        self.chunk_workers = chunk_workers
+        self.ffmpeg = ffmpeg
+        self.worker_script = worker_script
+        self.popen_kwargs = popen_kwargs or {}
+        self.proc = None
+        self.starts = 0
+        self._worker = None
+        self._events = None
+        self._lock = threading.Lock()
+
+    def matches(self, python_cmd, model_size, device, chunk_workers=1):
+        return ((list(python_cmd), model_size, device, chunk_workers)
+                == (self.python_cmd, self.model_size, self.device, self.chunk_workers))
+
+    def alive(self):
+        return self.proc is not None and self.proc.poll() is None
+
+    def _start(self):
+        cmd = [*self.python_cmd, "-u", self.worker_script, "--serve",
+               self.model_size, self.device, str(self.idle_timeout), str(self.chunk_workers)]
+        # A queue per process: lines of a killed worker never reach the next one
+        self._events = queue.Queue()
+        self._worker = protocol.Worker(cmd, self._events, stderr=subprocess.STDOUT,
+                                       popen_kwargs=self.popen_kwargs)
+        self.proc = self._worker.proc
+        self.starts += 1
+
+    def _stop(self, kill=False):
+        worker, self._worker, self.proc = self._worker, None, None
+        if worker is not None:
+            worker.close(release=True, kill=kill)
+
+    def transcribe(self, video, output, language=None, on_line=None,
+                   register=None, unregister=None, cancelled=None):
+        with self._lock:
+            # Second attempt only when the worker went idle just as the job was sent
+            for attempt in range(2):
+                result, retry = self._run_job(video, output, language, on_line,
+                                              register, unregister, cancelled)
+                if not retry or attempt:
+                    return result
+            return result
+
+    def _run_job(self, video, output, language, on_line, register, unregister, cancelled):
+        if not self.alive():
+            self._stop()
+            self._start()
+        proc = self.proc
+        if register:
+            register(proc)
+        detected = language
+        went_idle = False
+        last_error = ""
+        sent = False
+        try:
+            while True:
+                event = protocol.next_event(self._events, cancelled, self.POLL_SECONDS)
+                if event is None:
+                    self._stop(kill=True)
+                    return (False, detected, "cancelled"), False
+                line = event[1]
+                if line is None:
+                    code = proc.wait()
+                    self._worker = self.proc = None
+                    if went_idle:
+                        return (False, detected, "worker stopped (idle)"), True
+                    return (False, detected, last_error or f"worker stopped (code {code})"), False
+
+                kind, _, rest = line.partition(":")
+                if line == "READY":
+                    if not sent:
+                        job = json.dumps({"video": video, "output": output,
+                                          "language": language, "ffmpeg": self.ffmpeg})
+                        if not self._worker.send(job):
+                            # Stopped between READY and the job (idle timeout)
+                            self._stop(kill=True)
+                            return (False, detected, "worker stopped (idle)"), True
+                        sent = True
+                elif line == "IDLE":
+                    went_idle = True
+                elif kind == "LANG":
+                    detected = rest.strip()
+                    if on_line:
+                        on_line(line)
+                elif kind == "DONE" and sent:
+                    return (True, detected, rest), False
+                elif kind == "ERROR":
+                    last_error = rest
+                    if sent:
+                        return (False, detected, rest), False
+                elif on_line:
+                    on_line(line)
+        finally:
+            if unregister:
+                unregister(proc)
+
+    def close(self):
+        with self._lock:
+            self._stop()
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def get_whisper_server(python_cmd, model_size, device, idle_timeout=IDLE_TIMEOUT,
+                       chunk_workers=1, ffmpeg=None, **kwargs):
+    """Process-wide WhisperServer; a different model, device or worker count replaces it."""
+    global _server
+    with _server_lock:
+        if _server is not None and not _server.matches(python_cmd, model_size, device, chunk_workers):
+            _server.close()
+            _server = None
+        if _server is None:
+            _server = WhisperServer(python_cmd, model_size, device, idle_timeout,
+                                    chunk_workers, ffmpeg, **kwargs)
+        _server.idle_timeout = idle_timeout
+        _server.ffmpeg = ffmpeg
+        return _server
+
+
+def shutdown_whisper_server():
+    global _server
+    with _server_lock:
+        if _server is not None:
+            _server.close()
+            _server = None
@@ -1,15 +1,16 @@
 # Speech-to-SRT using faster-whisper
 # Runs transcription in a subprocess to isolate Intel DLL crashes from the main app.
+# The subprocess stays resident (whisper_server.py): the model is loaded once
+# and reused for the next files until it has been idle for WhisperIdleTimeout s.
+# On CPU long videos are transcribed in VAD chunks by WhisperChunkWorkers
+# parallel workers (whisper_chunks.py); finished chunks survive a crash.
 
 import os
 import sys
-import subprocess
 import threading
 from decorators.decorators import menu_tag
 from utils.text_helpers import tb_update
 
-_WORKER = os.path.join(os.path.dirname(__file__), "_whisper_worker.py")
-
 
 @menu_tag(label="Speech to SRT (Whisper)", group="videos")
 def speech_to_srt():
@@ -43,6 +44,20 @@ def speech_to_srt():
         device     = "cuda"
         language   = None
 
+    from .whisper_server import IDLE_TIMEOUT, default_chunk_workers, get_whisper_server
+    try:
+        idle_timeout = float(get_config_manager().get("persistent_cfg", "WhisperIdleTimeout", IDLE_TIMEOUT))
+    except (TypeError, ValueError):
+        idle_timeout = IDLE_TIMEOUT
+    try:
+        configured = int(get_config_manager().get("persistent_cfg", "WhisperChunkWorkers", 0) or 0)
+    except (TypeError, ValueError):
+        configured = 0
+    chunk_workers = default_chunk_workers(configured=configured)
+    # Chunked CPU transcription extracts the audio with ffmpeg first
+    from actions.lb_files.videos.vids_mgr import get_tool_path
+    ffmpeg = get_tool_path("ffmpeg")
+
     total = len(video_files)
 
     # Signal batch system that this is an async action — batch will wait for True
@@ -56,7 +71,8 @@ def speech_to_srt():
     s.app.after(0, lambda: s.bottomrow_label.update_progress(0, "0%"))
 
     def run():
-        python_exe = sys.executable
+        server = get_whisper_server([sys.executable], model_size, device, idle_timeout,
+                                    chunk_workers=chunk_workers, ffmpeg=ffmpeg)
 
         if getattr(s, 'batch_cancel_requested', False):
             tb_update('tb_info', "⏹️ Actie geannuleerd vóór start.", "geel")
@@ -74,10 +90,12 @@ def speech_to_srt():
             base      = idx / total
             base_name = os.path.splitext(video_path)[0]
 
-            # Check if a language-tagged SRT already exists for this video (skip if so)
+            # Check if a language-tagged SRT already exists for this video (skip if so).
+            # Our own temp output is no result: the worker resumes it.
             existing = [
                 f for f in os.listdir(os.path.dirname(video_path) or ".")
                 if f.lower().endswith('.srt')
+                and ".__tmp__." not in f.lower()
                 and os.path.splitext(f)[0].lower().startswith(
                     os.path.splitext(os.path.basename(video_path))[0].lower())
             ]
@@ -87,84 +105,47 @@ def speech_to_srt():
                 s.app.after(0, lambda v=p: s.bottomrow_label.update_progress(v, f"{int(v*100)}%"))
                 continue
 
-            # Temp output path — renamed after LANG: is received from worker
+            # Temp output path — renamed after the worker reports the language
             out_srt_tmp = base_name + ".__tmp__.srt"
-            out_srt     = out_srt_tmp  # updated when LANG: arrives
 
             tb_update('tb_info', f"🎙️ Starten: {os.path.basename(video_path)}", "normal")
 
             try:
-                proc = subprocess.Popen(
-                    [python_exe, "-u", _WORKER, video_path, out_srt_tmp,
-                     model_size, device, str(language)],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    encoding="utf-8",
-                    errors="replace",
-                    bufsize=1,
-                )
-                try:
-                    s.set_active_process(proc)
-                except Exception:
-                    pass
-                detected_lang = language  # fallback to requested lang if LANG: never arrives
-                for line in proc.stdout:
-                    if getattr(s, 'batch_cancel_requested', False):
-                        try:
-                            proc.terminate()
-                        except Exception:
-                            pass
-                        break
-                    line = line.rstrip()
+                def on_line(line, base=base):
                     if line.startswith("PROGRESS:"):
                         seg_p = float(line.split(":", 1)[1])
                         overall = base + seg_p / total
                         s.app.after(0, lambda v=overall: s.bottomrow_label.update_progress(
                             v, f"{int(v*100)}%"))
-                    elif line.startswith("LANG:"):
-                        detected_lang = line[5:].strip()
                     elif line.startswith("INFO:"):
                         tb_update('tb_info', line[5:], "normal")
                     elif line.startswith("WARN:"):
                         tb_update('tb_info', f"⚠️ {line[5:]}", "geel")
-                    elif line.startswith("ERROR:"):
-                        tb_update('tb_info', f"❌ {line[6:]}", "rood")
-                    elif line.startswith("DONE:"):
-                        # Rename tmp → naam.{lang}.srt
-                        lang_tag = detected_lang or "und"
-                        out_srt  = base_name + f".{lang_tag}.srt"
-                        try:
-                            if os.path.exists(out_srt_tmp):
-                                os.replace(out_srt_tmp, out_srt)
-                        except Exception as rename_err:
-                            print(f"⚠️ Rename failed: {rename_err}")
-                            out_srt = out_srt_tmp
-                        tb_update('tb_info', f"✅ SRT opgeslagen: {os.path.basename(out_srt)}", "groen")
-                        break  # SRT is klaar — niet wachten op model-cleanup in worker
-                    else:
+                    elif not line.startswith("LANG:"):
                         print(line)
 
-                # Forceer afsluiten van de worker (model-cleanup in subprocess kan minuten duren)
-                try:
-                    proc.kill()
-                except Exception:
-                    pass
-                try:
-                    proc.wait(timeout=5)
-                except Exception:
-                    pass
-                try:
-                    s.set_active_process(None)
-                except Exception:
-                    pass
+                ok, detected_lang, message = server.transcribe(
+                    video_path, out_srt_tmp, language, on_line=on_line,
+                    register=s.register_process, unregister=s.unregister_process,
+                    cancelled=lambda: getattr(s, 'batch_cancel_requested', False))
 
                 if getattr(s, 'batch_cancel_requested', False):
                     tb_update('tb_info', "⏹️ Speech-to-SRT geannuleerd.", "geel")
                     break
 
-                if proc.returncode != 0 and not os.path.exists(out_srt):
-                    tb_update('tb_info', f"❌ Subprocess mislukt (code {proc.returncode})", "rood")
+                if ok:
+                    # Rename tmp → naam.{lang}.srt
+                    lang_tag = detected_lang or "und"
+                    out_srt  = base_name + f".{lang_tag}.srt"
+                    try:
+                        if os.path.exists(out_srt_tmp):
+                            os.replace(out_srt_tmp, out_srt)
+                    except Exception as rename_err:
+                        print(f"⚠️ Rename failed: {rename_err}")
+                        out_srt = out_srt_tmp
+                    tb_update('tb_info', f"✅ SRT opgeslagen: {os.path.basename(out_srt)}", "groen")
+                else:
+                    tb_update('tb_info', f"❌ {message}", "rood")
 
             except Exception as e:
                 import traceback
@@ -0,0 +1,154 @@
+#-------------------------------------------------------------------------------
+# Name:        mkv_backend.py
+# Purpose:      - Pick the cheapest tool for a change to a video file:
+#                 mkvpropedit for header-only edits of an MKV (in place,
+#                 no copy), mkvmerge for stream changes of an MKV, ffmpeg
+#                 for everything else
+#               - Command builders for the three tools
+#
+# Author:      EddyS
+#
+# Created:     18/10/2026
+# Copyright:   (c) EddyS 2026
+# Licence:     <your licence>
+#-------------------------------------------------------------------------------
+# actions/lb_files/videos/mkv_backend.py
+#
+# vids_mgr resolves the tool paths (tools_cfg.json "mkvtoolnix_path") and
+# runs the commands.
+
+import os
+import re
+
+MKVPROPEDIT, MKVMERGE, FFMPEG = "mkvpropedit", "mkvmerge", "ffmpeg"
+
+
+def choose_backend(path, header_only, tools):
+    """Cheapest backend for a change to path.
+
+    header_only  only track properties change (language, title, flags)
+    tools        {"mkvpropedit": path or None, "mkvmerge": ..., "ffmpeg": ...}
+    """
+    is_mkv = os.path.splitext(path)[1].lower() == ".mkv"
+    if header_only:
+        # mkvmerge would copy the whole file anyway: no gain over ffmpeg
+        return MKVPROPEDIT if is_mkv and tools.get(MKVPROPEDIT) else FFMPEG
+    if is_mkv and tools.get(MKVMERGE):
+        return MKVMERGE
+    return FFMPEG
+
+
+def succeeded(backend, returncode):
+    # MKVToolNix: 0 = ok, 1 = ok with warnings, 2 = error
+    if backend in (MKVPROPEDIT, MKVMERGE):
+        return returncode in (0, 1)
+    return returncode == 0
+
+
+def in_place(backend):
+    """mkvpropedit edits the file itself; the others write a new file."""
+    return backend == MKVPROPEDIT
+
+
+# ───────────────────────────────────────────────
+# HEADER EDITS
+# ───────────────────────────────────────────────
+
+class SubtitleEdit:
+    """New properties for one subtitle track (track = 0-based among the
+    subtitle tracks); None leaves a property unchanged."""
+
+    __slots__ = ("track", "language", "title", "default", "forced")
+
+    def __init__(self, track, language=None, title=None, default=None, forced=None):
+        self.track = track
+        self.language = language
+        self.title = title
+        self.default = default
+        self.forced = forced
+
+    def __repr__(self):
+        changes = {k: getattr(self, k) for k in ("language", "title", "default", "forced")
+                   if getattr(self, k) is not None}
+        return f"SubtitleEdit(s{self.track}, {changes})"
+
+
+UNTAGGED = {"", "und"}
+
+
+def plan_language_edits(tracks, language):
+    """Edits that tag the untagged subtitle tracks with language.
+
+    tracks: [(current language, is default)] per subtitle track. Tracks that
+    already carry a language (correct or not detectable here) are left
+    alone; when no track is default the first one becomes default.
+    [] = nothing to do.
+    """
+    edits = [SubtitleEdit(i, language=language)
+             for i, (current, _) in enumerate(tracks) if (current or "") in UNTAGGED]
+    if tracks and not any(default for _, default in tracks):
+        if edits and edits[0].track == 0:
+            edits[0].default = True
+        else:
+            edits.insert(0, SubtitleEdit(0, default=True))
+    return edits
+
+
+def propedit_command(mkvpropedit, path, edits):
+    """mkvpropedit: rewrites only the track headers, in place."""
+    cmd = [mkvpropedit, path]
+    for edit in edits:
+        cmd += ["--edit", f"track:s{edit.track + 1}"]
+        if edit.language is not None:
+            cmd += ["--set", f"language={edit.language}"]
+        if edit.title is not None:
+            cmd += ["--set", f"name={edit.title}"] if edit.title else ["--delete", "name"]
+        if edit.default is not None:
+            cmd += ["--set", f"flag-default={int(edit.default)}"]
+        if edit.forced is not None:
+            cmd += ["--set", f"flag-forced={int(edit.forced)}"]
+    return cmd
+
+
+def ffmpeg_edit_command(ffmpeg, path, output, edits):
+    """Same edits as a full ffmpeg stream copy (non-MKV or no MKVToolNix)."""
+    cmd = [ffmpeg, "-nostdin", "-hide_banner", "-loglevel", "error", "-y",
+           "-i", path, "-map", "0", "-c", "copy"]
+    for edit in edits:
+        spec = f"s:s:{edit.track}"
+        if edit.language is not None:
+            cmd += [f"-metadata:{spec}", f"language={edit.language}"]
+        if edit.title is not None:
+            cmd += [f"-metadata:{spec}", f"title={edit.title}"]
+        if edit.default is not None or edit.forced is not None:
+            flags = [name for name, on in (("default", edit.default), ("forced", edit.forced)) if on]
+            cmd += [f"-disposition:s:{edit.track}", "+".join(flags) or "0"]
+    return cmd + [output]
+
+
+# ───────────────────────────────────────────────
+# STREAM CHANGES
+# ───────────────────────────────────────────────
+
+def mkvmerge_command(mkvmerge, source, output, drop_subs=False, subtitles=()):
+    """mkvmerge remux: optionally without the source's subtitles, plus
+    [(srt path, language)] with the first added subtitle as default."""
+    cmd = [mkvmerge, "--gui-mode", "-o", output]
+    if drop_subs:
+        cmd.append("--no-subtitles")
+    cmd.append(source)
+    for n, (srt, lang) in enumerate(subtitles):
+        cmd += ["--language", f"0:{lang}"]
+        if n == 0:
+            cmd += ["--default-track-flag", "0:yes"]
+        cmd.append(srt)
+    return cmd
+
+
+_PROGRESS = re.compile(r"progress\D*(\d+)%", re.IGNORECASE)
+
+
+def parse_mkvmerge_progress(line):
+    """'#GUI#progress 42%' (or 'Progress: 42%') -> 0.42, else None."""
+    match = _PROGRESS.search(line)
+    return int(match.group(1)) / 100.0 if match else None
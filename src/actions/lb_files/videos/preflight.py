@@ -0,0 +1,189 @@
+#-------------------------------------------------------------------------------
+# Name:        preflight.py
+# Purpose:      - Decide per selected file whether a video action still has
+#                 work to do, before any ffmpeg process is started
+#               - Target state per action (codec, bit depth, max resolution,
+#                 container, subtitle count) checked against cached probes
+#               - Dry-run summary of what a batch would do
+#
+# Author:      EddyS
+#
+# Created:     18/10/2026
+# Copyright:   (c) EddyS 2026
+# Licence:     <your licence>
+#-------------------------------------------------------------------------------
+# actions/lb_files/videos/preflight.py
+#
+# The actions in vids_mgr build a Target and act on the decisions. Probing
+# goes through the SQLite probe cache, so a second run over the same library
+# does not start a single ffprobe.
+
+import os
+import re
+from collections import Counter
+
+VIDEO_EXTS = {".mp4", ".mkv", ".avi", ".mov", ".wmv", ".flv", ".webm", ".m4v"}
+
+DEFAULT_MAX_HEIGHT = 1080
+
+
+def max_height_from_config(value):
+    """Max_Resolution ("1080p", "720p", ...) -> height in pixels."""
+    match = re.match(r"\s*(\d+)", str(value or ""))
+    return int(match.group(1)) if match else DEFAULT_MAX_HEIGHT
+
+
+def _video_stream(probe):
+    # Same rule as media_probe.get_video_stream: cover art is not the video
+    for st in probe.get("streams", []):
+        if st.get("codec_type") == "video" and not st.get("disposition", {}).get("attached_pic"):
+            return st
+    return {}
+
+
+def bit_depth(vstream):
+    """Bits per sample of a video stream (8 when nothing says otherwise)."""
+    try:
+        return int(vstream["bits_per_raw_sample"])
+    except (KeyError, TypeError, ValueError):
+        pass
+    pix_fmt = vstream.get("pix_fmt", "")
+    match = re.search(r"(?:p0?|gray)(\d{1,2})(?:le|be)?$", pix_fmt)
+    if match and int(match.group(1)) in (9, 10, 12, 14, 16):
+        return int(match.group(1))
+    return 8
+
+
+class Target:
+    """State a file must be in for an action to have nothing left to do.
+
+    Every criterion is optional (None = don't care):
+      codecs         video codec names, e.g. {"hevc"}
+      max_bit_depth  e.g. 8
+      max_height     e.g. 1080
+      containers     file extensions that already satisfy the action;
+                     checked without probing
+      max_subtitles  e.g. 0
+      output_for     path -> output path; an existing output means done
+    """
+
+    def __init__(self, label, extensions=VIDEO_EXTS, codecs=None, max_bit_depth=None,
+                 max_height=None, containers=None, max_subtitles=None, output_for=None):
+        self.label = label
+        self.extensions = set(extensions)
+        self.codecs = set(codecs) if codecs else None
+        self.max_bit_depth = max_bit_depth
+        self.max_height = max_height
+        self.containers = set(containers) if containers else None
+        self.max_subtitles = max_subtitles
+        self.output_for = output_for
+
+    @property
+    def needs_probe(self):
+        return any(value is not None for value in
+                   (self.codecs, self.max_bit_depth, self.max_height, self.max_subtitles))
+
+    def check(self, probe):
+        """Reasons the probed file still needs work ([] = already in the target state)."""
+        vstream = _video_stream(probe)
+        reasons = []
+        if self.codecs is not None and vstream.get("codec_name") not in self.codecs:
+            reasons.append(f"codec {vstream.get('codec_name', '?')}")
+        if self.max_bit_depth is not None and vstream and bit_depth(vstream) > self.max_bit_depth:
+            reasons.append(f"{bit_depth(vstream)}-bit")
+        try:
+            height = int(vstream.get("height", 0))
+        except (TypeError, ValueError):
+            height = 0
+        if self.max_height is not None and height > self.max_height:
+            reasons.append(f"{height}p")
+        if self.max_subtitles is not None:
+            count = sum(1 for st in probe.get("streams", []) if st.get("codec_type") == "subtitle")
+            if count > self.max_subtitles:
+                reasons.append(f"{count} subtitle(s)")
+        return reasons
+
+
+class Decision:
+    __slots__ = ("path", "skip", "reason", "probe")
+
+    def __init__(self, path, skip, reason, probe=None):
+        self.path = path
+        self.skip = skip
+        self.reason = reason
+        self.probe = probe
+
+    def __repr__(self):
+        return f"Decision({os.path.basename(self.path)!r}, {'skip' if self.skip else 'run'}, {self.reason!r})"
+
+
+def hevc8_target(max_height):
+    return Target(f"8-bit ≤{max_height}p", extensions={".mp4", ".mkv", ".avi", ".mov", ".wmv"},
+                  max_bit_depth=8, max_height=max_height,
+                  output_for=lambda path: os.path.splitext(path)[0] + "_8bit.mkv")
+
+
+def mkv_target():
+    return Target("MKV", containers={".mkv"},
+                  output_for=lambda path: os.path.splitext(path)[0] + ".mkv")
+
+
+def nosubs_target():
+    return Target("no subtitles", extensions={".mp4", ".mkv", ".avi", ".mov", ".wmv"}, max_subtitles=0)
+
+
+def evaluate(paths, target, probe_many=None, cancel_event=None):
+    """One Decision per path, in input order.
+
+    Cheap checks (extension, container, existing output) come first; the
+    rest is probed concurrently through the probe cache. A file that cannot
+    be probed is never skipped - the action itself reports the problem.
+    """
+    decisions = {}
+    to_probe = []
+    for path in paths:
+        ext = os.path.splitext(path)[1].lower()
+        if ext not in target.extensions and ext not in (target.containers or ()):
+            decisions[path] = Decision(path, True, "not a video")
+        elif target.containers and ext in target.containers:
+            decisions[path] = Decision(path, True, f"already {target.label}")
+        elif target.output_for and _exists(target.output_for(path), path):
+            decisions[path] = Decision(path, True, "output exists")
+        elif not target.needs_probe:
+            decisions[path] = Decision(path, False, "")
+        else:
+            to_probe.append(path)
+
+    if to_probe:
+        if probe_many is None:
+            from utils.media_probe import probe_many
+        for path, probe in probe_many(to_probe, cancel_event=cancel_event):
+            if "error" in probe:
+                decisions[path] = Decision(path, False, "probe failed", probe)
+                continue
+            reasons = target.check(probe)
+            if reasons:
+                decisions[path] = Decision(path, False, ", ".join(reasons), probe)
+            else:
+                decisions[path] = Decision(path, True, f"already {target.label}", probe)
+
+    return [decisions[path] for path in paths if path in decisions]
+
+
+def _exists(output, source):
+    if os.path.normcase(os.path.abspath(output)) == os.path.normcase(os.path.abspath(source)):
+        return False
+    try:
+        return os.path.getsize(output) > 0
+    except OSError:
+        return False
+
+
+def summarize(decisions):
+    """'3 to process, 40 skipped (38 already MKV, 2 output exists)'"""
+    run = sum(1 for d in decisions if not d.skip)
+    skipped = Counter(d.reason for d in decisions if d.skip)
+    text = f"{run} to process, {sum(skipped.values())} skipped"
+    if skipped:
+        text += " (" + ", ".join(f"{n} {reason}" for reason, n in skipped.most_common()) + ")"
+    return text
@@ -0,0 +1,138 @@
+#-------------------------------------------------------------------------------
+# Name:        remux_plan.py
+# Purpose:      - Fold a sequence of stream-copy actions (Transform -> MKV,
+#                 Remove All Subs, Embed Sub) into one plan per video
+#               - One ffmpeg -c copy run per video instead of one per action,
+#                 without _nosubs/intermediate files on disk
+#
+# Author:      EddyS
+#
+# Created:     18/10/2026
+# Copyright:   (c) EddyS 2026
+# Licence:     <your licence>
+#-------------------------------------------------------------------------------
+# actions/lb_files/videos/remux_plan.py
+#
+# run_batch uses remux_run() to find consecutive steps that can be combined,
+# vids_mgr.remux_combined() executes the plans.
+
+import os
+
+REMOVE_SUBS = "Remove All Subs"
+EMBED_SUB = "Embed Sub"
+TO_MKV = "Transform -> MKV"
+REMUXABLE = (REMOVE_SUBS, EMBED_SUB, TO_MKV)
+
+
+def remux_run(labels, start):
+    """End index (exclusive) of the run of remuxable labels at start.
+
+    Returns start when fewer than two steps could be combined - a single
+    step simply runs its own action.
+    """
+    end = start
+    while end < len(labels) and labels[end] in REMUXABLE:
+        end += 1
+    return end if end - start >= 2 else start
+
+
+class RemuxPlan:
+    """What the combined actions do to one video.
+
+    drop_subs   remove the subtitle streams of the source
+    subtitles   [(srt path, language)] to add, the first one as default
+    to_mkv      write Matroska (the source may be mp4/avi/...)
+    operations  the actions that actually contribute to the plan
+    """
+
+    __slots__ = ("source", "drop_subs", "subtitles", "to_mkv", "operations")
+
+    def __init__(self, source):
+        self.source = source
+        self.drop_subs = False
+        self.subtitles = []
+        self.to_mkv = False
+        self.operations = []
+
+    @property
+    def output(self):
+        """Embed Sub writes <base>_embed.mkv next to the source; the other
+        actions replace the source (Transform -> MKV under a .mkv name)."""
+        base, ext = os.path.splitext(self.source)
+        if EMBED_SUB in self.operations:
+            return base + "_embed.mkv"
+        return base + ".mkv" if self.to_mkv else self.source
+
+    @property
+    def replaces_source(self):
+        return EMBED_SUB not in self.operations
+
+    def is_noop(self, source_subtitles=None):
+        """True when the combined run would copy the file unchanged.
+        source_subtitles: number of subtitle streams, None when unknown."""
+        ext = os.path.splitext(self.source)[1].lower()
+        return (not self.subtitles
+                and not (self.to_mkv and ext != ".mkv")
+                and not (self.drop_subs and source_subtitles != 0))
+
+    def __repr__(self):
+        return (f"RemuxPlan({os.path.basename(self.source)!r}, drop_subs={self.drop_subs}, "
+                f"subtitles={self.subtitles}, to_mkv={self.to_mkv})")
+
+
+def plan_remux(source, operations, find_srt=None):
+    """Apply the actions in order, as running them one after another would.
+
+    find_srt(video) -> (srt path, language) or None, for Embed Sub; an
+    Embed Sub without a subtitle does nothing (the action skips the video).
+    """
+    plan = RemuxPlan(source)
+    for op in operations:
+        if op == REMOVE_SUBS:
+            # Also removes a subtitle an earlier Embed Sub would have added
+            plan.drop_subs = True
+            plan.subtitles = []
+        elif op == EMBED_SUB:
+            found = find_srt(source) if find_srt else None
+            if not found:
+                continue
+            # Embed Sub replaces all subtitle streams with the SRT
+            plan.drop_subs = True
+            plan.subtitles = [found]
+        elif op == TO_MKV:
+            plan.to_mkv = True
+        else:
+            raise ValueError(f"Not a stream-copy action: {op}")
+        plan.operations.append(op)
+    if EMBED_SUB in plan.operations and not plan.subtitles:
+        # A later Remove All Subs undid the embed; what is left replaces the source
+        plan.operations.remove(EMBED_SUB)
+    return plan
+
+
+def build_command(ffmpeg, plan, output):
+    """One ffmpeg stream-copy command for the whole plan."""
+    cmd = [ffmpeg, "-nostdin", "-hide_banner", "-loglevel", "error", "-y", "-i", plan.source]
+    for srt, _ in plan.subtitles:
+        cmd += ["-i", srt]
+
+    # Data streams (mp4 timecode tracks) cannot go into Matroska
+    cmd += ["-map", "0", "-map", "-0:d"]
+    if plan.drop_subs:
+        cmd += ["-map", "-0:s"]
+    for n in range(len(plan.subtitles)):
+        cmd += ["-map", f"{n + 1}:0"]
+
+    cmd += ["-c", "copy"]
+    source_is_mkv = os.path.splitext(plan.source)[1].lower() == ".mkv"
+    if plan.subtitles or (output.lower().endswith(".mkv") and not source_is_mkv and not plan.drop_subs):
+        # SRT input and mp4 text subtitles (mov_text) become SubRip in Matroska
+        cmd += ["-c:s", "srt"]
+    # Added subtitles always replace the source's, so they are s:0, s:1, ...
+    for n, (_, lang) in enumerate(plan.subtitles):
+        cmd += [f"-metadata:s:s:{n}", f"language={lang}"]
+    if plan.subtitles:
+        cmd += ["-disposition:s:0", "default"]
+
+    cmd += ["-progress", "pipe:1", "-nostats", output]
+    return cmd
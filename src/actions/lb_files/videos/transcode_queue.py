@@ -0,0 +1,656 @@
+#-------------------------------------------------------------------------------
+# Name:        transcode_queue.py
+# Purpose:      - Persistent queue of HEVC re-encodes (survives restarts)
+#               - Scheduler that runs several ffmpeg/x265 encodes at once,
+#                 with the cores split between them (x265 "pools")
+#               - Progress from "-progress pipe:1" and an estimated finish
+#                 time from the measured encode speed
+#               - A long video that is the only job is split at keyframes,
+#                 encoded as parallel segments and joined losslessly
+#
+# Author:      EddyS
+#
+# Created:     18/10/2026
+# Copyright:   (c) EddyS 2026
+# Licence:     <your licence>
+#-------------------------------------------------------------------------------
+# actions/lb_files/videos/transcode_queue.py
+#
+# Settings/transcode_queue.json holds the queue; a job that was encoding when
+# the app closed is queued again, and a segmented one keeps <output>.segments.
+
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUE_FILE_NAME = "transcode_queue.json"
+
+# x265 frame/WPP parallelism stops scaling at about this many threads per
+# 1080p encode; more cores are better spent on another file
+THREADS_PER_ENCODE = 8
+
+# Segmented encode: only for videos this long, segments at least this long
+SEGMENT_MIN_SECONDS = 20 * 60
+SEGMENT_MIN_LENGTH = 2 * 60
+# Extra attempts for a failed segment
+SEGMENT_RETRIES = 2
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+def default_queue_path():
+    """Settings/transcode_queue.json (frozen-aware)."""
+    try:
+        from config.smart_config_manager import get_config_manager
+        return str(get_config_manager().config_dir / QUEUE_FILE_NAME)
+    except Exception:
+        return os.path.join("Settings", QUEUE_FILE_NAME)
+
+
+def plan_concurrency(n_jobs, cpu_count=None, configured=0):
+    """(concurrent encodes, threads per encode) for n_jobs files.
+
+    configured > 0 (persistent_cfg "TranscodeWorkers") fixes the number of
+    concurrent encodes; 0 means automatic.
+    """
+    cpu_count = cpu_count or os.cpu_count() or 1
+    workers = configured if configured > 0 else max(1, cpu_count // THREADS_PER_ENCODE)
+    workers = max(1, min(workers, n_jobs or 1))
+    return workers, max(1, cpu_count // workers)
+
+
+def format_eta(seconds):
+    if seconds is None:
+        return "--:--"
+    h, rest = divmod(int(seconds), 3600)
+    m = rest // 60
+    return f"{h}h{m:02d}m" if h else f"{m} min" if m else "<1 min"
+
+
+# ───────────────────────────────────────────────
+# QUEUE
+# ───────────────────────────────────────────────
+
+class TranscodeJob:
+    __slots__ = ("id", "input", "output", "scale_height", "duration", "status", "error",
+                 "progress", "speed")
+
+    def __init__(self, job_id, input_path, output_path, scale_height=None, duration=0.0,
+                 status=QUEUED, error=""):
+        self.id = str(job_id)
+        self.input = input_path
+        self.output = output_path
+        self.scale_height = scale_height
+        self.duration = float(duration or 0.0)
+        self.status = status
+        self.error = error
+        self.progress = 0.0
+        self.speed = 0.0
+
+    @property
+    def part_path(self):
+        """ffmpeg writes here; renamed to output only when the encode finished."""
+        base, ext = os.path.splitext(self.output)
+        return f"{base}.part{ext}"
+
+    def to_dict(self):
+        return {"id": self.id, "input": self.input, "output": self.output,
+                "scale_height": self.scale_height, "duration": self.duration,
+                "status": self.status, "error": self.error}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["id"], data["input"], data["output"], data.get("scale_height"),
+                   data.get("duration", 0.0), data.get("status", QUEUED), data.get("error", ""))
+
+
+class TranscodeQueue:
+    """Jobs in a JSON file; every status change is written straight away.
+
+    Jobs that were running when the app stopped are queued again on load
+    (requeue_running). The app uses one queue per process, see
+    get_transcode_queue(): a second instance would requeue jobs that are
+    still encoding and overwrite the other one's changes on save.
+    """
+
+    def __init__(self, path=None, requeue_running=True):
+        self.path = str(path or default_queue_path())
+        self._lock = threading.Lock()
+        self.jobs = []
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.jobs = [TranscodeJob.from_dict(d) for d in json.load(f).get("jobs", [])]
+        except (OSError, ValueError, KeyError):
+            self.jobs = []
+        if requeue_running:
+            for job in self.jobs:
+                if job.status == RUNNING:
+                    job.status = QUEUED
+
+    def _save(self):
+        part = self.path + ".tmp"
+        with open(part, "w", encoding="utf-8") as f:
+            json.dump({"jobs": [job.to_dict() for job in self.jobs]}, f, indent=2)
+        os.replace(part, self.path)
+
+    def add(self, input_path, output_path, scale_height=None, duration=0.0):
+        """Queue a file; a file that is already waiting or running is not added twice."""
+        with self._lock:
+            for job in self.jobs:
+                if job.input == input_path and job.status in (QUEUED, RUNNING):
+                    return job
+            next_id = max((int(job.id) for job in self.jobs), default=0) + 1
+            job = TranscodeJob(next_id, input_path, output_path, scale_height, duration)
+            self.jobs.append(job)
+            self._save()
+            return job
+
+    def pending(self):
+        with self._lock:
+            return [job for job in self.jobs if job.status == QUEUED]
+
+    def take(self):
+        """Next queued job, marked running; None when the queue is empty."""
+        with self._lock:
+            for job in self.jobs:
+                if job.status == QUEUED:
+                    job.status = RUNNING
+                    job.progress = 0.0
+                    self._save()
+                    return job
+            return None
+
+    def set_status(self, job, status, error=""):
+        with self._lock:
+            job.status = status
+            job.error = error
+            self._save()
+
+    def clear_finished(self):
+        with self._lock:
+            self.jobs = [job for job in self.jobs if job.status in (QUEUED, RUNNING)]
+            self._save()
+
+
+# ───────────────────────────────────────────────
+# FFMPEG
+# ───────────────────────────────────────────────
+
+class ProgressParser:
+    """Collects ffmpeg "-progress" key=value lines into one dict per update."""
+
+    def __init__(self):
+        self._block = {}
+
+    def feed(self, line):
+        key, sep, value = line.strip().partition("=")
+        if not sep:
+            return None
+        self._block[key] = value
+        if key != "progress":
+            return None
+        block, self._block = self._block, {}
+        return {"seconds": self._seconds(block), "speed": self._speed(block.get("speed")),
+                "end": value == "end"}
+
+    @staticmethod
+    def _seconds(block):
+        # out_time_ms is in microseconds too (long-standing ffmpeg quirk)
+        for key in ("out_time_us", "out_time_ms"):
+            try:
+                return max(0.0, int(block[key]) / 1_000_000)
+            except (KeyError, ValueError):
+                pass
+        try:
+            h, m, s = block["out_time"].split(":")
+            return max(0.0, int(h) * 3600 + int(m) * 60 + float(s))
+        except (KeyError, ValueError):
+            return None
+
+    @staticmethod
+    def _speed(value):
+        try:
+            return float(value.rstrip("x"))
+        except (AttributeError, ValueError):
+            return 0.0
+
+
+_BASE = ["-nostdin", "-hide_banner", "-loglevel", "error", "-y"]
+
+
+def _video_args(scale_height, threads):
+    """Encoder settings; whole-file and segment encodes must use the same."""
+    args = ["-vf", f"scale=-2:{scale_height}"] if scale_height else []
+    return args + [
+        "-c:v", "libx265",
+        "-pix_fmt", "yuv420p",  # Force 8-bit
+        "-preset", "medium",
+        "-crf", "23",
+        "-x265-params", f"pools={threads}",
+    ]
+
+
+def build_command(ffmpeg, job, threads):
+    return [
+        ffmpeg, *_BASE, "-i", job.input,
+        # Same streams as concat_command; data streams cannot go into Matroska
+        "-map", "0", "-map", "-0:d",
+        "-c", "copy",  # before the video settings, which override it for video
+        *_video_args(job.scale_height, threads),
+        "-progress", "pipe:1", "-nostats",
+        job.part_path,
+    ]
+
+
+# ───────────────────────────────────────────────
+# SEGMENTED ENCODE
+# ───────────────────────────────────────────────
+
+def segment_count(duration, cpu_count=None):
+    """Segments for one long video: one per THREADS_PER_ENCODE cores; 1 = don't split."""
+    cpu_count = cpu_count or os.cpu_count() or 1
+    if duration < SEGMENT_MIN_SECONDS:
+        return 1
+    return max(1, min(cpu_count // THREADS_PER_ENCODE, int(duration // SEGMENT_MIN_LENGTH)))
+
+
+def keyframes_command(ffprobe, path):
+    # Packet flags only: no decoding, fast even for 4K
+    return [ffprobe, "-v", "error", "-select_streams", "v:0",
+            "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0", path]
+
+
+def parse_keyframes(output):
+    times = []
+    for line in output.splitlines():
+        pts, _, flags = line.strip().partition(",")
+        if "K" in flags:
+            try:
+                times.append(float(pts))
+            except ValueError:
+                pass
+    return sorted(set(times))
+
+
+def plan_cuts(keyframes, duration, segments):
+    """Keyframe times closest to an even split of duration into segments."""
+    cuts = []
+    for i in range(1, segments):
+        target = duration * i / segments
+        candidates = [t for t in keyframes if t > (cuts[-1] if cuts else 0.0) and t < duration]
+        if not candidates:
+            break
+        cuts.append(min(candidates, key=lambda t: abs(t - target)))
+    return cuts
+
+
+def split_command(ffmpeg, job, cuts, pattern):
+    """Video stream only, stream copy, cut at the planned keyframes."""
+    # The segment muxer cuts at the first keyframe at/after each time
+    times = ",".join(f"{max(0.0, t - 0.001):.6f}" for t in cuts)
+    return [ffmpeg, *_BASE, "-i", job.input, "-map", "0:v:0", "-c", "copy",
+            "-f", "segment", "-segment_times", times, "-reset_timestamps", "1", pattern]
+
+
+def segment_command(ffmpeg, job, source, target, threads):
+    return [ffmpeg, *_BASE, "-i", source, "-map", "0:v:0",
+            *_video_args(job.scale_height, threads),
+            "-progress", "pipe:1", "-nostats", target]
+
+
+def concat_command(ffmpeg, job, list_path):
+    """Encoded segments + all other streams, chapters and tags of the original
+    (the streams build_command keeps: everything but data)."""
+    return [ffmpeg, *_BASE, "-f", "concat", "-safe", "0", "-i", list_path, "-i", job.input,
+            "-map", "0:v", "-map", "1", "-map", "-1:v", "-map", "-1:d",
+            "-map_metadata", "1", "-map_chapters", "1", "-c", "copy", job.part_path]
+
+
+def write_concat_list(paths, list_path):
+    with open(list_path, "w", encoding="utf-8") as f:
+        for path in paths:
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+
+
+# ───────────────────────────────────────────────
+# SCHEDULER
+# ───────────────────────────────────────────────
+
+class TranscodeScheduler:
+    """Encode the queued jobs with `workers` concurrent ffmpeg processes.
+
+    A worker takes the next job as soon as its encode ends, so no cores sit
+    idle between files. Callbacks (all optional, called from worker threads):
+      on_progress(fraction, done_jobs, total_jobs, eta_seconds_or_None)
+      on_job_done(job)                    - job.status is DONE or FAILED
+      register(proc) / unregister(proc)   - batch stop can terminate them
+      cancelled() -> bool                 - polled; True stops all encodes
+    Cancelled jobs go back to the queue and are resumed by the next run.
+    """
+
+    POLL_SECONDS = 0.5
+
+    def __init__(self, queue, ffmpeg, workers, threads, build=build_command, ffprobe=None,
+                 cpu_count=None, on_progress=None, on_job_done=None, register=None,
+                 unregister=None, cancelled=None, popen_kwargs=None):
+        self.queue = queue
+        self.ffmpeg = ffmpeg
+        self.ffprobe = ffprobe      # None: never split a video into segments
+        self.cpu_count = cpu_count or os.cpu_count() or 1
+        self.workers = max(1, workers)
+        self.threads = max(1, threads)
+        self.build = build
+        self.on_progress = on_progress
+        self.on_job_done = on_job_done
+        self.register = register
+        self.unregister = unregister
+        self.cancelled = cancelled
+        self.popen_kwargs = popen_kwargs or {}
+        self.stopping = False
+        self._lock = threading.Lock()
+        self._procs = set()
+        self._jobs = []     # jobs started in this run
+
+    def eta_seconds(self):
+        """Media seconds left / current combined encode speed."""
+        with self._lock:
+            jobs = list(self._jobs)
+        waiting = self.queue.pending()
+        speed = sum(job.speed for job in jobs if job.status == RUNNING)
+        if speed <= 0:
+            return None
+        left = sum(job.duration * (1 - job.progress) for job in jobs if job.status == RUNNING)
+        left += sum(job.duration for job in waiting)
+        return left / speed
+
+    def _report(self):
+        if not self.on_progress:
+            return
+        with self._lock:
+            jobs = list(self._jobs)
+        total = len(jobs) + len(self.queue.pending())
+        finished = sum(1 for job in jobs if job.status in (DONE, FAILED))
+        running = sum(job.progress for job in jobs if job.status == RUNNING)
+        fraction = (finished + running) / total if total else 1.0
+        self.on_progress(fraction, finished, total, self.eta_seconds())
+
+    def _is_cancelled(self):
+        return self.stopping or bool(self.cancelled and self.cancelled())
+
+    def _run_ffmpeg(self, cmd, on_update=None):
+        """Run one ffmpeg; on_update(progress dict) per -progress block.
+        Returns (returncode, last stderr lines)."""
+        proc = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.DEVNULL,
+            text=True, encoding="utf-8", errors="replace", bufsize=1,
+            **self.popen_kwargs,
+        )
+        with self._lock:
+            self._procs.add(proc)
+        if self.register:
+            self.register(proc)
+
+        errors = deque(maxlen=10)
+        drain = threading.Thread(target=lambda: errors.extend(l.rstrip() for l in proc.stderr), daemon=True)
+        drain.start()
+
+        parser = ProgressParser()
+        try:
+            for line in proc.stdout:
+                update = parser.feed(line)
+                if update is not None and on_update:
+                    on_update(update)
+            proc.wait()
+            drain.join(timeout=5)
+        finally:
+            for pipe in (proc.stdout, proc.stderr):
+                pipe.close()
+            with self._lock:
+                self._procs.discard(proc)
+            if self.unregister:
+                self.unregister(proc)
+        return proc.returncode, list(errors)
+
+    def _probe_keyframes(self, path):
+        result = subprocess.run(keyframes_command(self.ffprobe, path), capture_output=True, text=True,
+                                encoding="utf-8", errors="replace", **self.popen_kwargs)
+        return parse_keyframes(result.stdout) if result.returncode == 0 else []
+
+    def _encode(self, job):
+        segments = 1
+        if self.ffprobe and not self.queue.pending():
+            with self._lock:
+                alone = sum(1 for j in self._jobs if j.status == RUNNING) == 1
+            if alone:
+                segments = segment_count(job.duration, self.cpu_count)
+
+        result = self._encode_segmented(job, segments) if segments > 1 else None
+        if result is not None:
+            ok, message = result
+        else:
+            def on_update(update):
+                if update["seconds"] is not None and job.duration:
+                    job.progress = min(update["seconds"] / job.duration, 1.0)
+                job.speed = update["speed"]
+                self._report()
+
+            returncode, errors = self._run_ffmpeg(self.build(self.ffmpeg, job, self.threads), on_update)
+            ok = returncode == 0 and os.path.exists(job.part_path)
+            message = errors[-1] if errors else f"ffmpeg exit code {returncode}"
+
+        # Stop Batch terminates ffmpeg itself, usually before run() has polled
+        if self._is_cancelled():
+            self._stop_all()
+            self._remove_part(job)
+            self.queue.set_status(job, QUEUED)
+            return
+        if ok:
+            os.replace(job.part_path, job.output)
+            job.progress = 1.0
+            self.queue.set_status(job, DONE)
+        else:
+            self._remove_part(job)
+            self.queue.set_status(job, FAILED, message)
+        if self.on_job_done:
+            self.on_job_done(job)
+        self._report()
+
+    def _encode_segmented(self, job, segments):
+        """(ok, message), or None when the video has no usable keyframes.
+        Work files live in <output>.segments; encoded segments survive a
+        stop, so a resumed job only encodes the missing ones."""
+        work_dir = os.path.splitext(job.output)[0] + ".segments"
+        plan_path = os.path.join(work_dir, "plan.json")
+        st = os.stat(job.input)
+        signature = {"size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                     "scale_height": job.scale_height, "segments": segments}
+        plan = None
+        try:
+            with open(plan_path, encoding="utf-8") as f:
+                plan = json.load(f)
+            if plan.get("signature") != signature:
+                plan = None
+        except (OSError, ValueError):
+            pass
+
+        if plan is None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            os.makedirs(work_dir)
+            cuts = plan_cuts(self._probe_keyframes(job.input), job.duration, segments)
+            if not cuts:
+                shutil.rmtree(work_dir, ignore_errors=True)
+                return None
+            returncode, errors = self._run_ffmpeg(
+                split_command(self.ffmpeg, job, cuts, os.path.join(work_dir, "src_%03d.mkv")))
+            if returncode != 0:
+                shutil.rmtree(work_dir, ignore_errors=True)
+                return False, errors[-1] if errors else f"split failed ({returncode})"
+            bounds = [0.0, *cuts, job.duration]
+            plan = {"signature": signature, "bounds": bounds}
+            with open(plan_path, "w", encoding="utf-8") as f:
+                json.dump(plan, f)
+
+        bounds = plan["bounds"]
+        count = len(bounds) - 1
+        sources = [os.path.join(work_dir, f"src_{i:03d}.mkv") for i in range(count)]
+        targets = [os.path.join(work_dir, f"enc_{i:03d}.mkv") for i in range(count)]
+        lengths = [bounds[i + 1] - bounds[i] for i in range(count)]
+        done = {i: lengths[i] for i in range(count) if os.path.exists(targets[i])}
+        speeds = {}
+        lock = threading.Lock()
+        threads = max(1, self.cpu_count // count)
+
+        def report(i, seconds=None, speed=None):
+            with lock:
+                if seconds is None:
+                    done.pop(i, None)
+                else:
+                    done[i] = min(seconds, lengths[i])
+                if speed is None:
+                    speeds.pop(i, None)
+                else:
+                    speeds[i] = speed
+                encoded, job.speed = sum(done.values()), sum(speeds.values())
+            job.progress = min(encoded / job.duration, 1.0) if job.duration else 0.0
+            self._report()
+
+        def encode(i):
+            part = targets[i] + ".part.mkv"
+            error = ""
+            for _ in range(1 + SEGMENT_RETRIES):
+                if self._is_cancelled():
+                    return "cancelled"
+
+                returncode, errors = self._run_ffmpeg(
+                    segment_command(self.ffmpeg, job, sources[i], part, threads),
+                    lambda update: report(i, update["seconds"] or 0.0, update["speed"]))
+                if returncode == 0 and os.path.exists(part):
+                    os.replace(part, targets[i])
+                    report(i, lengths[i])
+                    return ""
+                report(i)
+                error = errors[-1] if errors else f"ffmpeg exit code {returncode}"
+                try:
+                    os.remove(part)
+                except OSError:
+                    pass
+            return f"segment {i + 1}/{count}: {error}"
+
+        todo = [i for i in range(count) if i not in done]
+        with ThreadPoolExecutor(max_workers=max(1, len(todo))) as ex:
+            failures = [msg for msg in ex.map(encode, todo) if msg and msg != "cancelled"]
+        # Stop Batch may have terminated the segments before run() polled: keep work_dir
+        if self._is_cancelled():
+            return False, "cancelled"
+        if failures:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            return False, failures[0]
+
+        list_path = os.path.join(work_dir, "segments.txt")
+        write_concat_list(targets, list_path)
+        returncode, errors = self._run_ffmpeg(concat_command(self.ffmpeg, job, list_path))
+        if returncode != 0 or not os.path.exists(job.part_path):
+            if not self._is_cancelled():
+                shutil.rmtree(work_dir, ignore_errors=True)
+            return False, errors[-1] if errors else f"concat failed ({returncode})"
+        shutil.rmtree(work_dir, ignore_errors=True)
+        return True, ""
+
+    @staticmethod
+    def _remove_part(job):
+        try:
+            os.remove(job.part_path)
+        except OSError:
+            pass
+
+    def _worker(self):
+        while not self.stopping:
+            job = self.queue.take()
+            if job is None:
+                return
+            with self._lock:
+                self._jobs.append(job)
+            try:
+                self._encode(job)
+            except Exception as e:
+                self._remove_part(job)
+                self.queue.set_status(job, FAILED, str(e))
+                if self.on_job_done:
+                    self.on_job_done(job)
+
+    def _stop_all(self):
+        self.stopping = True
+        with self._lock:
+            procs = list(self._procs)
+        for proc in procs:
+            if proc.poll() is None:
+                proc.terminate()
+
+    def run(self):
+        """Encode until the queue is empty or the run is cancelled.
+        Returns the jobs handled in this run."""
+        threads = [threading.Thread(target=self._worker, daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        self._report()
+        while any(thread.is_alive() for thread in threads):
+            if not self.stopping and self.cancelled and self.cancelled():
+                self._stop_all()
+            time.sleep(self.POLL_SECONDS)
+        with self._lock:
+            return list(self._jobs)
+
+
+# ───────────────────────────────────────────────
+# PROCESS-WIDE QUEUE AND SCHEDULER
+# ───────────────────────────────────────────────
+
+_queue = None
+_scheduler = None
+_lock = threading.Lock()
+
+
+def get_transcode_queue(path=None):
+    """The process-wide queue; RUNNING jobs are requeued only on this first load."""
+    global _queue
+    with _lock:
+        if _queue is None:
+            _queue = TranscodeQueue(path)
+        return _queue
+
+
+def active_scheduler():
+    """The scheduler that is encoding right now, or None."""
+    with _lock:
+        return _scheduler
+
+
+def run_scheduler(scheduler):
+    """Run scheduler as the process-wide one until its queue is empty.
+
+    Returns False straight away when another scheduler is already running:
+    jobs added to the queue before this call are picked up by that one.
+    """
+    global _scheduler
+    with _lock:
+        if _scheduler is not None:
+            return False
+        _scheduler = scheduler
+    try:
+        while True:
+            scheduler.run()
+            # A job added while the last workers were exiting must not be left behind
+            with _lock:
+                if scheduler.stopping or not scheduler.queue.pending():
+                    _scheduler = None
+                    return True
+    except BaseException:
+        with _lock:
+            _scheduler = None
+        raise
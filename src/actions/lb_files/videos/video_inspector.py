@@ -2,34 +2,6 @@ import os, json, subprocess, threading, queue, csv, tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import customtkinter as ctk
 from decorators.decorators import menu_tag
-import shutil
-
-def get_ffprobe_cmd():
-    """Get ffprobe executable path from config or PATH"""
-    # First check if it's in PATH
-    if shutil.which("ffprobe"):
-        return "ffprobe"
-    
-    # Check config file for custom path
-    try:
-        config_path = os.path.join("Settings", "tools_cfg.json")
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-                tool_path = config.get("ffprobe_path", "")
-                
-                if tool_path:
-                    # Check if it's a directory or full path
-                    if os.path.isdir(tool_path):
-                        tool_exe = os.path.join(tool_path, "ffprobe.exe")
-                        if os.path.exists(tool_exe):
-                            return tool_exe
-                    elif os.path.exists(tool_path):
-                        return tool_path
-    except Exception as e:
-        print(f"⚠️ Error reading tools config: {e}")
-    
-    return "ffprobe"  # Fallback
 
 VIDEO_EXTS=(".mkv",".mp4",".avi",".mov",".wmv",".ts",".m2ts",".webm")
 
@@ -57,13 +29,8 @@ def normalize_stream_language(lang):
     return value
 
 def run_ffprobe(path):
-    ffprobe_cmd = get_ffprobe_cmd()
-    cmd=[ffprobe_cmd,"-v","error","-print_format","json","-show_format","-show_streams",path]
-    try:
-        out=subprocess.check_output(cmd, stderr=subprocess.STDOUT)
-        return json.loads(out.decode("utf-8","ignore"))
-    except Exception as e:
-        return {"error":str(e)}
+    from utils.media_probe import probe_media
+    return probe_media(path)
 
 def bitdepth_from_pixfmt(pix):
     if not pix:
@@ -203,7 +170,13 @@ class App(ctk.CTkToplevel):
 
         self.rows=[]
         self.q=queue.Queue()
-    
+        self.cancel_event=threading.Event()
+
+    def destroy(self):
+        # Stop feeding ffprobe jobs when the window goes away
+        self.cancel_event.set()
+        super().destroy()
+
     def configure_dark_theme(self):
         """Configure dark theme for treeview widget"""
         style = ttk.Style(self)
@@ -262,6 +235,9 @@ class App(ctk.CTkToplevel):
         for i in self.tree.get_children():
             self.tree.delete(i)
         self.rows=[]
+        self.cancel_event.set()           # stop a previous run still in flight
+        self.cancel_event=threading.Event()
+        self.q=queue.Queue()
         files = file_paths
         self.total_files = len(files)
         self.pb.set(0)
@@ -278,12 +254,16 @@ class App(ctk.CTkToplevel):
             self.tree.column(col,width=max(80,min(600,max_len*7)))
 
     def worker(self,files):
-        for f in files:
-            data=run_ffprobe(f)
+        from utils.media_probe import probe_many
+        cancel=self.cancel_event
+        for f,data in probe_many(files, cancel_event=cancel, probe=run_ffprobe):
             self.q.put(parse_info(f,data))
-        self.q.put(None)
+        if not cancel.is_set():
+            self.q.put(None)
 
     def process_queue(self):
+        if self.cancel_event.is_set():
+            return
         try:
             while True:
                 item=self.q.get_nowait()
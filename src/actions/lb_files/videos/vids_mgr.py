@@ -134,7 +134,9 @@ def get_tool_path(tool_name):
                 config_key_map = {
                     "ffmpeg": "ffmpeg_path",
                     "ffprobe": "ffprobe_path",
-                    "mkvextract": "mkvtoolnix_path"
+                    "mkvextract": "mkvtoolnix_path",
+                    "mkvmerge": "mkvtoolnix_path",
+                    "mkvpropedit": "mkvtoolnix_path"
                 }
                 
                 config_key = config_key_map.get(tool_name)
@@ -142,11 +144,12 @@ def get_tool_path(tool_name):
                     tool_path = config.get(config_key, "")
                     
                     if tool_path:
-                        # For mkvextract, it's in a directory
-                        if tool_name == "mkvextract":
-                            tool_exe = os.path.join(tool_path, "mkvextract.exe")
-                            if os.path.exists(tool_exe):
-                                return tool_exe
+                        # MKVToolNix tools live in one directory
+                        if config_key == "mkvtoolnix_path":
+                            for exe_name in (f"{tool_name}.exe", tool_name):
+                                tool_exe = os.path.join(tool_path, exe_name)
+                                if os.path.exists(tool_exe):
+                                    return tool_exe
                         # For ffmpeg/ffprobe, check if it's a directory or full path
                         elif os.path.isdir(tool_path):
                             tool_exe = os.path.join(tool_path, f"{tool_name}.exe")
@@ -159,26 +162,14 @@ def get_tool_path(tool_name):
     
     return None
 
+def _mkv_tools():
+    """Tool paths for mkv_backend.choose_backend (None = not installed)."""
+    return {name: get_tool_path(name) for name in ("mkvpropedit", "mkvmerge", "ffmpeg")}
+
 def get_video_duration(video_path):
-    """Get video duration in seconds using ffprobe"""
-    ffprobe_path = get_tool_path("ffprobe")
-    if not ffprobe_path:
-        return None
-    
-    cmd = [
-        ffprobe_path,
-        "-v", "error",
-        "-show_entries", "format=duration",
-        "-of", "default=noprint_wrappers=1:nokey=1",
-        video_path
-    ]
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, **_no_console_subprocess_kwargs())
-        if result.returncode == 0 and result.stdout.strip():
-            return float(result.stdout.strip())
-    except:
-        pass
-    return None
+    """Get video duration in seconds (cached ffprobe data)"""
+    from utils.media_probe import probe_media, get_duration
+    return get_duration(probe_media(video_path))
 
 def parse_ffmpeg_progress(line):
     """Parse ffmpeg progress line to extract current time in seconds"""
@@ -219,6 +210,14 @@ def remove_all_subtitles():
     total = len(selected)
 
     def worker():
+        from .preflight import evaluate, summarize, nosubs_target
+        from .mkv_backend import choose_backend, mkvmerge_command, succeeded, MKVMERGE
+        tools = _mkv_tools()
+
+        # Files without subtitle streams are skipped before any ffmpeg starts
+        decisions = {d.path: d for d in evaluate(selected, nosubs_target())}
+        s.app.after(0, lambda: tb_update('tb_info', f"🔍 Pre-flight: {summarize(decisions.values())}", "normal"))
+
         status_slot = getattr(s, 'bottomrow_label', None)
         if status_slot:
             s.app.after(0, lambda: status_slot.show_progress(mode="determinate"))
@@ -235,6 +234,9 @@ def remove_all_subtitles():
             if ext not in video_exts:
                 s.app.after(0, lambda vp=video_path: tb_update('tb_info', f"⏭️ Skipping: {os.path.basename(vp)}", "normal"))
                 continue
+            if decisions[video_path].skip:
+                print(f"⏭️ No subtitles: {os.path.basename(video_path)}")
+                continue
 
             # Create output filename with _nosubs suffix
             dir_name = os.path.dirname(video_path)
@@ -243,14 +245,18 @@ def remove_all_subtitles():
 
             s.app.after(0, lambda vp=video_path: tb_update('tb_info', f"🎬 Processing: {os.path.basename(vp)}", "normal"))
 
-            # Use ffmpeg to copy video without subtitle tracks
-            cmd = [
-                ffmpeg_path, "-i", video_path,
-                "-map", "0", "-map", "-0:s",
-                "-c", "copy",
-                "-y",  # Overwrite output file if exists
-                output_path
-            ]
+            # mkvmerge for MKV (faster), otherwise ffmpeg; both copy all but the subtitle tracks
+            backend = choose_backend(video_path, False, tools)
+            if backend == MKVMERGE:
+                cmd = mkvmerge_command(tools["mkvmerge"], video_path, output_path, drop_subs=True)
+            else:
+                cmd = [
+                    ffmpeg_path, "-i", video_path,
+                    "-map", "0", "-map", "-0:s",
+                    "-c", "copy",
+                    "-y",  # Overwrite output file if exists
+                    output_path
+                ]
 
             try:
                 result = subprocess.run(
@@ -260,8 +266,8 @@ def remove_all_subtitles():
                     **_no_console_subprocess_kwargs()
                 )
 
-                if result.returncode != 0:
-                    s.app.after(0, lambda vp=video_path: tb_update('tb_info', f"❌ FFmpeg error on {os.path.basename(vp)}", "normal"))
+                if not succeeded(backend, result.returncode):
+                    s.app.after(0, lambda vp=video_path, b=backend: tb_update('tb_info', f"❌ {b} error on {os.path.basename(vp)}", "normal"))
                     if os.path.exists(output_path):
                         os.remove(output_path)
                 else:
@@ -324,7 +330,10 @@ def transform_2_mkv():
     
     tb_update('tb_info', f"🎬 Transform to MKV - {total} file(s)", "normal")
     
-    video_exts = {'.mp4', '.avi', '.mov', '.wmv', '.flv', '.webm', '.m4v'}
+    # MKVs, non-videos and files whose .mkv already exists are skipped up front
+    from .preflight import evaluate, summarize, mkv_target
+    decisions = {d.path: d for d in evaluate(selected, mkv_target())}
+    tb_update('tb_info', f"🔍 Pre-flight: {summarize(decisions.values())}", "normal")
     
     for idx, video_path in enumerate(selected):
         # Add dotted line between files (not before first)
@@ -340,16 +349,9 @@ def transform_2_mkv():
             update_tbinfo(f"⚠️ Error: You tried to use an SRT file for a video action: '{os.path.basename(video_path)}'. Please select a valid video file.", "geel")
             continue
         
-        ext = os.path.splitext(video_path)[1].lower()
-        
-        # Skip if already MKV
-        if ext == ".mkv":
-            print(f"⏭️ Already MKV: {os.path.basename(video_path)}")
-            continue
-        
-        # Skip non-video files
-        if ext not in video_exts:
-            print(f"⏭️ Skipping non-video: {os.path.basename(video_path)}")
+        decision = decisions[video_path]
+        if decision.skip:
+            print(f"⏭️ Skipping ({decision.reason}): {os.path.basename(video_path)}")
             continue
         
         # Create output filename with .mkv extension
@@ -429,21 +431,13 @@ def transform_2_mkv():
     tb_update('tb_info', "🔄 Refreshing file list...", "normal")
     
     try:
-        # Get current directory from base_path or first selected file's directory
-        if hasattr(s, 'base_path') and s.base_path:
-            scan_path = s.base_path
-        elif selected:
-            scan_path = os.path.dirname(selected[0])
-        else:
-            print("⚠️ Cannot determine directory to rescan")
+        # The folder on display; the first selected file's directory only when nothing was scanned yet
+        from utils.scan_helpers import rescan
+        if not rescan(s.app, fallback=os.path.dirname(selected[0]) if selected else None):
             s.bottomrow_label.progress.grid_remove()
             s.bottomrow_label.label.grid()
             return
         
-        from utils.scan_helpers import fast_scandir, update_lb
-        fast_scandir(s.app, scan_path)
-        update_lb(s.app)
-        
         print("✅ Transform to MKV completed - file list refreshed")
         tb_update('tb_info', "· " * 25, "normal")
         tb_update('tb_info', "✅ Transform to MKV complete - list refreshed", "normal")
@@ -457,6 +451,48 @@ def transform_2_mkv():
         s.bottomrow_label.progress.grid_remove()
         s.bottomrow_label.label.grid()
 
+def _find_srt_for_video(video_path):
+    """SRT next to the video: common language patterns first, then any <base>*.srt."""
+    dir_name = os.path.dirname(video_path)
+    base_name = os.path.splitext(os.path.basename(video_path))[0]
+    srt_patterns = [
+        os.path.join(dir_name, f"{base_name}.srt"),
+        os.path.join(dir_name, f"{base_name}.nl.srt"),
+        os.path.join(dir_name, f"{base_name}.en.srt"),
+        os.path.join(dir_name, f"{base_name}-dut.srt"),
+        os.path.join(dir_name, f"{base_name}-nl.srt"),
+        os.path.join(dir_name, f"{base_name}-eng.srt"),
+        os.path.join(dir_name, f"{base_name}.eng.srt"),
+        os.path.join(dir_name, f"{base_name}.dut.srt"),
+    ]
+    for pattern in srt_patterns:
+        if os.path.exists(pattern):
+            return pattern
+
+    # If no exact match, search directory for any SRT with similar name
+    try:
+        for file in os.listdir(dir_name):
+            if file.endswith('.srt') and file.startswith(base_name):
+                print(f"💡 Found subtitle: {file}")
+                return os.path.join(dir_name, file)
+    except Exception as e:
+        print(f"⚠️ Error searching for subtitles: {e}")
+    return None
+
+def _srt_language(srt_path):
+    """Subtitle language from the SRT filename (default Dutch)."""
+    srt_basename = os.path.basename(srt_path).lower()
+    if '.nl.' in srt_basename or '.dut.' in srt_basename:
+        return "dut"
+    elif '.en.' in srt_basename or '.eng.' in srt_basename:
+        return "eng"
+    elif '.fr.' in srt_basename or '.fra.' in srt_basename:
+        return "fre"
+    elif '.de.' in srt_basename or '.ger.' in srt_basename:
+        return "ger"
+    # Default to Dutch if no language detected
+    return "dut"
+
 @menu_tag(label="Embed Sub", group="videos")
 def mkv_embed_sub():
     """Embed SRT subtitle into MKV file"""
@@ -510,6 +546,9 @@ def mkv_embed_sub():
     # If user selected both video and SRT, try to match them explicitly
     explicit_srt = srt_files[0] if len(srt_files) == 1 and len(video_files) == 1 else None
     
+    from .mkv_backend import choose_backend, mkvmerge_command, parse_mkvmerge_progress, succeeded, MKVMERGE
+    tools = _mkv_tools()
+    
     for idx, video_path in enumerate(video_files):
         # Add dotted line between files (not before first)
         if idx > 0:
@@ -523,36 +562,7 @@ def mkv_embed_sub():
         base_name = os.path.splitext(os.path.basename(video_path))[0]
         
         # Use explicitly selected SRT if available, otherwise search
-        srt_path = explicit_srt
-        
-        if not srt_path:
-            # Try common subtitle patterns
-            srt_patterns = [
-                os.path.join(dir_name, f"{base_name}.srt"),
-                os.path.join(dir_name, f"{base_name}.nl.srt"),
-                os.path.join(dir_name, f"{base_name}.en.srt"),
-                os.path.join(dir_name, f"{base_name}-dut.srt"),
-                os.path.join(dir_name, f"{base_name}-nl.srt"),
-                os.path.join(dir_name, f"{base_name}-eng.srt"),
-                os.path.join(dir_name, f"{base_name}.eng.srt"),
-                os.path.join(dir_name, f"{base_name}.dut.srt"),
-            ]
-            
-            for pattern in srt_patterns:
-                if os.path.exists(pattern):
-                    srt_path = pattern
-                    break
-        
-        # If no exact match, search directory for any SRT with similar name
-        if not srt_path:
-            try:
-                for file in os.listdir(dir_name):
-                    if file.endswith('.srt') and file.startswith(base_name):
-                        srt_path = os.path.join(dir_name, file)
-                        print(f"💡 Found subtitle: {file}")
-                        break
-            except Exception as e:
-                print(f"⚠️ Error searching for subtitles: {e}")
+        srt_path = explicit_srt or _find_srt_for_video(video_path)
         
         if not srt_path:
             print(f"⚠️ No SRT file found for: {os.path.basename(video_path)}")
@@ -566,18 +576,7 @@ def mkv_embed_sub():
         tb_update('tb_info', f"🎬 Embedding: {os.path.basename(video_path)}", "normal")
         
         # Detect subtitle language from filename
-        srt_basename = os.path.basename(srt_path).lower()
-        if '.nl.' in srt_basename or '.dut.' in srt_basename:
-            lang_code = "dut"
-        elif '.en.' in srt_basename or '.eng.' in srt_basename:
-            lang_code = "eng"
-        elif '.fr.' in srt_basename or '.fra.' in srt_basename:
-            lang_code = "fre"
-        elif '.de.' in srt_basename or '.ger.' in srt_basename:
-            lang_code = "ger"
-        else:
-            # Default to Dutch if no language detected
-            lang_code = "dut"
+        lang_code = _srt_language(srt_path)
         
         print(f"📝 Detected subtitle language: {lang_code}")
         
@@ -600,9 +599,14 @@ def mkv_embed_sub():
             "-y",
             output_path
         ]
+        # MKV sources go through mkvmerge when MKVToolNix is available (faster for Matroska)
+        backend = choose_backend(video_path, False, tools)
+        if backend == MKVMERGE:
+            cmd = mkvmerge_command(tools["mkvmerge"], video_path, output_path,
+                                   drop_subs=True, subtitles=[(srt_path, lang_code)])
         
         try:
-            print(f"🔧 Running ffmpeg command: {' '.join(cmd)}")
+            print(f"🔧 Running {backend} command: {' '.join(cmd)}")
             
             # Run ffmpeg with real-time output
             process = subprocess.Popen(
@@ -613,25 +617,27 @@ def mkv_embed_sub():
                 **_no_console_subprocess_kwargs()
             )
             
-            # Capture all stderr output for error reporting
+            # Capture all tool output for error reporting
             stderr_output = []
             
-            # Read stderr line by line for progress
-            for line in process.stderr:
+            # Read progress line by line (mkvmerge reports on stdout, ffmpeg on stderr)
+            for line in (process.stdout if backend == MKVMERGE else process.stderr):
                 stderr_output.append(line)
-                if duration:
-                    current_time = parse_ffmpeg_progress(line)
-                    if current_time:
-                        file_progress = min(current_time / duration, 1.0)
-                        overall_progress = (idx + file_progress) / total
-                        s.bottomrow_label.update_progress(overall_progress)
-                        s.app.update_idletasks()
+                if backend == MKVMERGE:
+                    file_progress = parse_mkvmerge_progress(line)
+                else:
+                    current_time = parse_ffmpeg_progress(line) if duration else None
+                    file_progress = min(current_time / duration, 1.0) if current_time else None
+                if file_progress is not None:
+                    overall_progress = (idx + file_progress) / total
+                    s.bottomrow_label.update_progress(overall_progress)
+                    s.app.update_idletasks()
             
             process.wait()
             
-            if process.returncode != 0:
+            if not succeeded(backend, process.returncode):
                 error_msg = ''.join(stderr_output[-10:])  # Last 10 lines
-                print(f"❌ FFmpeg failed with return code {process.returncode}")
+                print(f"❌ {backend} failed with return code {process.returncode}")
                 print(f"Error output:\n{error_msg}")
                 tb_update('tb_info', f"❌ Failed: {os.path.basename(video_path)} - Check console for details", "rood")
                 if os.path.exists(output_path):
@@ -668,9 +674,139 @@ def mkv_embed_sub():
     s.bottomrow_label.progress.grid_remove()
     s.bottomrow_label.label.grid()
 
+def remux_combined(labels):
+    """Run consecutive stream-copy batch steps (Transform -> MKV, Remove All Subs,
+    Embed Sub) as one ffmpeg/mkvmerge pass per video; called by run_batch."""
+    from shared_data import get_shared
+    from .remux_plan import plan_remux, build_command
+    from .mkv_backend import choose_backend, mkvmerge_command, parse_mkvmerge_progress, succeeded, MKVMERGE
+    s = get_shared()
+
+    selected = s.app.lb_files.get_selected_file_paths()
+    video_exts = {'.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.webm', '.m4v'}
+    video_files = [f for f in selected if os.path.splitext(f)[1].lower() in video_exts]
+    srt_files = [f for f in selected if f.lower().endswith('.srt')]
+    if not video_files:
+        tb_update('tb_info', "⚠️ No video files selected.", "geel")
+        return
+
+    ffmpeg_path = get_tool_path("ffmpeg")
+    if not ffmpeg_path:
+        from utils import log_error
+        log_error("❌ ffmpeg not found. Please install ffmpeg or set path in Settings/tools_cfg.json")
+        return
+
+    # Same SRT choice as Embed Sub
+    explicit_srt = srt_files[0] if len(srt_files) == 1 and len(video_files) == 1 else None
+
+    def find_srt(video_path):
+        srt_path = explicit_srt or _find_srt_for_video(video_path)
+        return (srt_path, _srt_language(srt_path)) if srt_path else None
+
+    tools = _mkv_tools()
+
+    total = len(video_files)
+    tb_update('tb_info', f"🔗 {' + '.join(labels)} - {total} file(s), one pass per file", "normal")
+    import threading
+
+    def worker():
+        from utils.media_probe import probe_media, get_streams, get_duration
+        from .transcode_queue import ProgressParser
+
+        def cancelled():
+            return getattr(s, 'batch_running', False) and getattr(s, 'batch_cancel_requested', False)
+
+        status_slot = getattr(s, 'bottomrow_label', None)
+        if status_slot:
+            s.app.after(0, lambda: (status_slot.show_progress(mode="determinate"), status_slot.update_progress(0, "0%")))
+
+        for idx, video_path in enumerate(video_files):
+            if cancelled():
+                break
+            name = os.path.basename(video_path)
+            plan = plan_remux(video_path, labels, find_srt)
+            probe = probe_media(video_path)
+            source_subs = None if "error" in probe else len(get_streams(probe, "subtitle"))
+            if plan.is_noop(source_subs):
+                print(f"⏭️ Nothing to do: {name}")
+                continue
+
+            output_path = plan.output
+            base, ext = os.path.splitext(output_path)
+            part_path = f"{base}.remux.part{ext}"
+            backend = choose_backend(video_path, False, tools)
+            if backend == MKVMERGE:
+                cmd = mkvmerge_command(tools["mkvmerge"], video_path, part_path, plan.drop_subs, plan.subtitles)
+            else:
+                cmd = build_command(ffmpeg_path, plan, part_path)
+            duration = get_duration(probe)
+            print(f"🔧 Running {backend} command: {' '.join(cmd)}")
+            s.app.after(0, lambda n=name, ops=plan.operations: tb_update('tb_info', f"🎬 {n}: {' + '.join(ops)}", "normal"))
+
+            try:
+                process = subprocess.Popen(
+                    cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.DEVNULL,
+                    text=True, encoding="utf-8", errors="replace",
+                    **_no_console_subprocess_kwargs()
+                )
+                s.register_process(process)
+                try:
+                    parser = ProgressParser()
+                    tool_output = []
+                    for line in process.stdout:
+                        if backend == MKVMERGE:
+                            tool_output.append(line)
+                            fraction = parse_mkvmerge_progress(line)
+                        else:
+                            update = parser.feed(line)
+                            fraction = (min(update["seconds"] / duration, 1.0)
+                                        if update and update["seconds"] is not None and duration else None)
+                        if fraction is not None and status_slot:
+                            p = (idx + fraction) / total
+                            s.app.after(0, lambda p=p: status_slot.update_progress(p, f"{int(p * 100)}%"))
+                    error_output = process.stderr.read() + ''.join(tool_output[-10:])
+                    process.wait()
+                finally:
+                    s.unregister_process(process)
+
+                if not succeeded(backend, process.returncode) or not os.path.exists(part_path):
+                    if os.path.exists(part_path):
+                        os.remove(part_path)
+                    if cancelled():
+                        break
+                    print(f"❌ {backend} failed with return code {process.returncode}\n{error_output[-1000:]}")
+                    s.app.after(0, lambda n=name: tb_update('tb_info', f"❌ Failed: {n} - Check console for details", "rood"))
+                    continue
+
+                os.replace(part_path, output_path)
+                if plan.replaces_source and output_path != video_path:
+                    os.remove(video_path)
+                s.app.after(0, lambda o=output_path: tb_update('tb_info', f"✅ Created: {os.path.basename(o)}", "normal"))
+            except Exception as e:
+                print(f"❌ Error processing {name}: {e}")
+                s.app.after(0, lambda n=name: tb_update('tb_info', f"❌ Error: {n}", "rood"))
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+
+        def finish():
+            from utils.scan_helpers import reload
+            tb_update('tb_info', "· " * 25, "normal")
+            tb_update('tb_info', f"✅ {' + '.join(labels)} complete", "normal")
+            tb_update('tb_info', "─" * 50, "normal")
+            reload(s.app)
+            if status_slot:
+                status_slot.reset()
+            s.batch_step_done = True
+
+        s.app.after(0, finish)
+
+    # Before the thread starts, so run_batch never sees a stale done bit
+    s.batch_step_done = False
+    threading.Thread(target=worker, daemon=True).start()
+
 @menu_tag(label="MKV -> 8 Bit HEVC", group="videos")
 def mkv_2_8bitHEVC():
-    """Convert 10-bit/12-bit HEVC to 8-bit HEVC"""
+    """Queue 10-bit/12-bit videos for 8-bit HEVC and encode them in the background"""
     from shared_data import get_shared
     s = get_shared()
     
@@ -681,190 +817,213 @@ def mkv_2_8bitHEVC():
         print("⚠️ No files selected.")
         return
     
-    # Setup progress bar
-    total = len(selected)
-    s.bottomrow_label.label.grid_remove()
-    s.bottomrow_label.progress.grid()
-    s.bottomrow_label.progress_label.grid()  # Show percentage label
-    s.bottomrow_label.progress.configure(mode="determinate")
-    s.bottomrow_label.update_progress(0, "0%")
-    
-    tb_update('tb_info', f"🎞️ MKV to 8-bit HEVC - {total} file(s)", "normal")
+    tb_update('tb_info', f"🎞️ MKV to 8-bit HEVC - {len(selected)} file(s)", "normal")
     
-    video_exts = {'.mp4', '.mkv', '.avi', '.mov', '.wmv'}
-    
-    for idx, video_path in enumerate(selected):
-        # Add dotted line between files (not before first)
-        if idx > 0:
-            tb_update('tb_info', "· " * 25, "normal")
-        # Update progress
-        progress = idx / total
-        s.bottomrow_label.update_progress(progress)
-        s.app.update_idletasks()
-        ext = os.path.splitext(video_path)[1].lower()
-        
-        # Skip non-video files
-        if ext not in video_exts:
-            print(f"⏭️ Skipping non-video: {os.path.basename(video_path)}")
-            continue
-        
-        # Check current pixel format with ffprobe
-        print(f"🔍 Checking pixel format: {os.path.basename(video_path)}")
-        check_cmd = [
-            "ffprobe",
-            "-v", "error",
-            "-select_streams", "v:0",
-            "-show_entries", "stream=pix_fmt",
-            "-of", "default=noprint_wrappers=1:nokey=1",
-            video_path
-        ]
-        
-        try:
-            result = subprocess.run(
-                check_cmd,
-                capture_output=True,
-                text=True,
-                **_no_console_subprocess_kwargs()
-            )
-            
-            if result.returncode == 0:
-                pix_fmt = result.stdout.strip()
-                print(f"  📊 Current pixel format: {pix_fmt}")
-                
-                # Check if already 8-bit (yuv420p is 8-bit)
-                if pix_fmt == "yuv420p":
-                    print(f"  ✅ Already 8-bit, skipping: {os.path.basename(video_path)}")
-                    tb_update('tb_info', f"✅ Already 8-bit: {os.path.basename(video_path)}", "normal")
-                    continue
-                else:
-                    print(f"  ⚡ Needs conversion from {pix_fmt} to 8-bit")
-            else:
-                print(f"  ⚠️ Could not determine pixel format, will attempt conversion")
-        except Exception as e:
-            print(f"  ⚠️ Error checking format: {e}, will attempt conversion")
-        
-        # Create output filename
-        dir_name = os.path.dirname(video_path)
-        base_name = os.path.splitext(os.path.basename(video_path))[0]
-        output_path = os.path.join(dir_name, f"{base_name}_8bit.mkv")
-        
-        print(f"🎬 Converting to 8-bit HEVC: {os.path.basename(video_path)}")
-        tb_update('tb_info', f"🎬 Converting: {os.path.basename(video_path)}", "normal")
-        
-        # Get video duration for progress calculation
-        duration = get_video_duration(video_path)
-        
-        # Get max resolution setting from config
-        from shared_data import shared
-        max_res = shared.config.get("persistent_cfg", {}).get("Max_Resolution", "1080p")
-        
-        # Get current video resolution
-        res_cmd = [
-            "ffprobe",
-            "-v", "error",
-            "-select_streams", "v:0",
-            "-show_entries", "stream=width,height",
-            "-of", "csv=p=0",
-            video_path
-        ]
-        
-        scale_filter = None
-        try:
-            result = subprocess.run(res_cmd, capture_output=True, text=True, **_no_console_subprocess_kwargs())
-            if result.returncode == 0:
-                width, height = map(int, result.stdout.strip().split(','))
+    # Get max resolution setting from config
+    from shared_data import shared
+    from .preflight import evaluate, summarize, hevc8_target, max_height_from_config
+    target_height = max_height_from_config(shared.config.get("persistent_cfg", {}).get("Max_Resolution", "1080p"))
+
+    import threading
+
+    def worker():
+        from utils.media_probe import get_video_stream, get_duration
+        from .transcode_queue import get_transcode_queue
+
+        # Files already 8-bit within Max_Resolution (or with an _8bit output) never reach the queue
+        decisions = evaluate(selected, hevc8_target(target_height))
+        s.app.after(0, lambda: tb_update('tb_info', f"🔍 Pre-flight: {summarize(decisions)}", "normal"))
+
+        queue = get_transcode_queue()
+        queue.clear_finished()
+        queued = 0
+
+        for decision in decisions:
+            video_path = decision.path
+            if decision.skip:
+                print(f"⏭️ Skipping ({decision.reason}): {os.path.basename(video_path)}")
+                continue
+            print(f"⚡ Needs conversion ({decision.reason}): {os.path.basename(video_path)}")
+
+            probe = decision.probe or {}
+            vstream = get_video_stream(probe)
+            scale_height = None
+            try:
+                width, height = int(vstream["width"]), int(vstream["height"])
                 print(f"  📐 Current resolution: {width}x{height}")
                 
-                # Determine target height based on config
-                target_height = 1080 if max_res == "1080p" else 720 if max_res == "720p" else 1080
-                
                 # Only scale down if current resolution is higher
                 if height > target_height:
-                    scale_filter = f"scale=-2:{target_height}"
+                    scale_height = target_height
                     print(f"  ⬇️ Scaling down to {target_height}p")
                 else:
                     print(f"  ✅ Resolution already at or below {target_height}p")
-        except Exception as e:
-            print(f"  ⚠️ Could not detect resolution: {e}")
-        
-        # Build ffmpeg command with optional scaling
-        cmd = ["ffmpeg", "-i", video_path]
-        
-        # Add video filter if scaling is needed
-        if scale_filter:
-            cmd.extend(["-vf", scale_filter])
-        
-        cmd.extend([
-            "-c:v", "libx265",
-            "-pix_fmt", "yuv420p",  # Force 8-bit
-            "-preset", "medium",
-            "-crf", "23",
-            "-c:a", "copy",
-            "-c:s", "copy",
-            "-y",
-            output_path
-        ])
-        
-        try:
-            print("⚠️ This may take a while (re-encoding video)...")
-            
-            # Run ffmpeg with real-time output
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-                **_no_console_subprocess_kwargs()
-            )
-            
-            # Read stderr line by line for progress
-            for line in process.stderr:
-                if duration:
-                    current_time = parse_ffmpeg_progress(line)
-                    if current_time:
-                        file_progress = min(current_time / duration, 1.0)
-                        overall_progress = (idx + file_progress) / total
-                        s.bottomrow_label.update_progress(overall_progress)
-                        s.app.update_idletasks()
-            
-            process.wait()
-            
-            if process.returncode != 0:
-                print(f"❌ FFmpeg failed with return code {process.returncode}")
-                tb_update('tb_info', f"❌ Failed: {os.path.basename(video_path)}", "normal")
-                if os.path.exists(output_path):
-                    os.remove(output_path)
-                continue
-            
-            if not os.path.exists(output_path):
-                print(f"❌ Output file was not created: {output_path}")
-                tb_update('tb_info', f"❌ Output not created", "normal")
-                continue
-            
-            print(f"✅ Converted to 8-bit: {base_name}_8bit.mkv")
-            tb_update('tb_info', f"✅ Created: {base_name}_8bit.mkv", "normal")
-            
-        except Exception as e:
-            print(f"❌ Error processing {os.path.basename(video_path)}: {e}")
-            tb_update('tb_info', f"❌ Error: {os.path.basename(video_path)}", "normal")
-            if os.path.exists(output_path):
-                os.remove(output_path)
-    
-    # Complete progress bar
-    s.bottomrow_label.update_progress(1.0, "100%")
-    
-    print("✅ 8-bit HEVC conversion completed")
-    tb_update('tb_info', "· " * 25, "normal")
-    tb_update('tb_info', "✅ MKV to 8-bit HEVC complete", "normal")
-    tb_update('tb_info', "─" * 50, "normal")
-    
-    # Refresh the listbox to show new 8bit files
-    from utils.scan_helpers import reload
-    reload(s.app)
-    
-    # Restore label
-    s.bottomrow_label.progress.grid_remove()
-    s.bottomrow_label.label.grid()
+            except Exception as e:
+                print(f"  ⚠️ Could not detect resolution: {e}")
+
+            # Create output filename
+            dir_name = os.path.dirname(video_path)
+            base_name = os.path.splitext(os.path.basename(video_path))[0]
+            output_path = os.path.join(dir_name, f"{base_name}_8bit.mkv")
+            queue.add(video_path, output_path, scale_height, get_duration(probe) or 0.0)
+            queued += 1
+
+        s.app.after(0, lambda n=queued: tb_update('tb_info', f"📋 {n} file(s) queued for re-encoding", "normal"))
+        _run_hevc_queue(s, queue)
+
+    # Before the thread starts, so run_batch never sees a stale done bit
+    s.batch_step_done = False
+    threading.Thread(target=_hevc_worker, args=(s, worker), daemon=True).start()
+
+
+@menu_tag(label="Resume HEVC Queue", group="videos")
+def resume_hevc_queue():
+    """Continue the 8-bit HEVC encodes left in the queue (e.g. after a restart or stop)"""
+    from shared_data import get_shared
+    from .transcode_queue import get_transcode_queue
+    s = get_shared()
+
+    queue = get_transcode_queue()
+    pending = queue.pending()
+    if not pending:
+        tb_update('tb_info', "ℹ️ HEVC queue is empty.", "normal")
+        return
+
+    tb_update('tb_info', f"▶️ Resuming HEVC queue - {len(pending)} file(s)", "normal")
+    import threading
+
+    s.batch_step_done = False
+    threading.Thread(target=_hevc_worker, args=(s, lambda: _run_hevc_queue(s, queue)), daemon=True).start()
+
+
+@menu_tag(label="Pre-flight Check", icon="🔍", group="videos")
+def preflight_check():
+    """Dry run: show per video action what it would process and skip for the selection"""
+    from shared_data import get_shared, shared
+    from .preflight import evaluate, summarize, hevc8_target, mkv_target, nosubs_target, max_height_from_config
+    s = get_shared()
+
+    selected = s.app.lb_files.get_selected_file_paths()
+    if not selected:
+        from utils import update_tbinfo
+        update_tbinfo("⚠️ No files selected.", "rood")
+        return
+
+    target_height = max_height_from_config(shared.config.get("persistent_cfg", {}).get("Max_Resolution", "1080p"))
+    actions = [
+        ("MKV -> 8 Bit HEVC", hevc8_target(target_height)),
+        ("Transform -> MKV", mkv_target()),
+        ("Remove All Subs", nosubs_target()),
+    ]
+    tb_update('tb_info', f"🔍 Pre-flight (dry run) - {len(selected)} file(s)", "normal")
+    import threading
+
+    def worker():
+        # The probes are cached, so the second and third action cost nothing extra
+        for label, target in actions:
+            decisions = evaluate(selected, target)
+            s.app.after(0, lambda l=label, d=decisions: tb_update('tb_info', f"  {l}: {summarize(d)}", "normal"))
+            for d in decisions:
+                if not d.skip:
+                    print(f"  {label} ▶ {os.path.basename(d.path)}: {d.reason or 'needs work'}")
+        s.app.after(0, lambda: tb_update('tb_info', "─" * 50, "normal"))
+
+    threading.Thread(target=worker, daemon=True).start()
+
+
+def _hevc_worker(s, body):
+    """Thread target of the HEVC actions: body ends the batch step itself,
+    but an exception on the way (probe, queue file, scheduler) must too."""
+    try:
+        body()
+    except Exception as e:
+        message = f"❌ HEVC encoding error: {e}"
+        print(message)
+        s.app.after(0, lambda: tb_update('tb_info', message, "rood"))
+        status_slot = getattr(s, 'bottomrow_label', None)
+        if status_slot:
+            s.app.after(0, status_slot.reset)
+        s.batch_step_done = True
+
+def _joined_running_encode(s):
+    # The running scheduler takes the new jobs from the shared queue
+    s.app.after(0, lambda: tb_update('tb_info', "📋 Added to the HEVC encode that is already running", "normal"))
+    s.batch_step_done = True
+
+def _run_hevc_queue(s, queue):
+    """Encode everything queued on a pool sized by cores; call from a worker thread."""
+    from config.smart_config_manager import get_config_manager
+    from .transcode_queue import (TranscodeScheduler, plan_concurrency, segment_count, format_eta, DONE,
+                                  run_scheduler, active_scheduler)
+
+    status_slot = getattr(s, 'bottomrow_label', None)
+    pending = queue.pending()
+    ffmpeg_path = get_tool_path("ffmpeg")
+    if not pending or not ffmpeg_path:
+        if pending:
+            s.app.after(0, lambda: tb_update('tb_info', "❌ ffmpeg not found. Please install ffmpeg or set path in Settings/tools_cfg.json", "rood"))
+        s.batch_step_done = True
+        return
+
+    if active_scheduler() is not None:
+        _joined_running_encode(s)
+        return
+
+    try:
+        configured = int(get_config_manager().get("persistent_cfg", "TranscodeWorkers", 0) or 0)
+    except (TypeError, ValueError):
+        configured = 0
+    workers, threads = plan_concurrency(len(pending), configured=configured)
+
+    s.app.after(0, lambda: tb_update('tb_info', f"🎬 Encoding {len(pending)} file(s): {workers} at a time, {threads} threads each", "normal"))
+    if len(pending) == 1 and segment_count(pending[0].duration) > 1:
+        s.app.after(0, lambda: tb_update('tb_info', f"🧩 Long video: encoding {segment_count(pending[0].duration)} segments in parallel", "normal"))
+    print("⚠️ This may take a while (re-encoding video)...")
+    if status_slot:
+        s.app.after(0, lambda: (status_slot.show_progress(mode="determinate"), status_slot.update_progress(0, "0%")))
+
+    def on_progress(fraction, done, total, eta):
+        if status_slot:
+            text = f"{done}/{total} · {int(fraction * 100)}% · ETA {format_eta(eta)}"
+            s.app.after(0, lambda p=fraction, t=text: status_slot.update_progress(p, t))
+
+    def on_job_done(job):
+        name = os.path.basename(job.output)
+        if job.status == DONE:
+            print(f"✅ Converted to 8-bit: {name}")
+            s.app.after(0, lambda: tb_update('tb_info', f"✅ Created: {name}", "normal"))
+        else:
+            print(f"❌ FFmpeg failed for {os.path.basename(job.input)}: {job.error}")
+            s.app.after(0, lambda: tb_update('tb_info', f"❌ Failed: {os.path.basename(job.input)} - {job.error}", "rood"))
+
+    scheduler = TranscodeScheduler(
+        queue, ffmpeg_path, workers, threads, ffprobe=get_tool_path("ffprobe") or "ffprobe",
+        on_progress=on_progress, on_job_done=on_job_done,
+        register=s.register_process, unregister=s.unregister_process,
+        cancelled=lambda: getattr(s, 'batch_running', False) and getattr(s, 'batch_cancel_requested', False),
+        popen_kwargs=_no_console_subprocess_kwargs(),
+    )
+    if not run_scheduler(scheduler):
+        _joined_running_encode(s)
+        return
+
+    def _finish():
+        if scheduler.stopping:
+            left = len(queue.pending())
+            tb_update('tb_info', f"⏹️ HEVC encoding stopped - {left} file(s) left in queue (Resume HEVC Queue)", "geel")
+        else:
+            print("✅ 8-bit HEVC conversion completed")
+            tb_update('tb_info', "· " * 25, "normal")
+            tb_update('tb_info', "✅ MKV to 8-bit HEVC complete", "normal")
+        tb_update('tb_info', "─" * 50, "normal")
+        if status_slot:
+            status_slot.reset()
+        # Refresh the listbox to show new 8bit files
+        from utils.scan_helpers import reload
+        reload(s.app)
+        s.app.after(200, lambda: setattr(s, 'batch_step_done', True))
+
+    s.app.after(0, _finish)
 
 @menu_tag(label="Check Subs Language", group="videos")
 def mkv_check_lang():
@@ -899,33 +1058,17 @@ def mkv_check_lang():
         print(f"\n🔍 Checking: {os.path.basename(video_path)}")
         tb_update('tb_info', f"🔍 Checking: {os.path.basename(video_path)}", "normal")
         
-        # Use ffprobe to check streams
-        cmd = [
-            "ffprobe",
-            "-v", "quiet",
-            "-print_format", "json",
-            "-show_streams",
-            video_path
-        ]
-        
+        from utils.media_probe import probe_media, get_streams
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                **_no_console_subprocess_kwargs()
-            )
+            data = probe_media(video_path)
             
-            if result.returncode != 0:
-                print(f"❌ ffprobe failed with return code {result.returncode}")
+            if "error" in data:
+                print(f"❌ ffprobe failed: {data['error']}")
                 tb_update('tb_info', f"❌ Failed: {os.path.basename(video_path)}", "normal")
                 continue
             
-            import json
-            data = json.loads(result.stdout)
-            
             # Find subtitle streams
-            subtitle_streams = [s for s in data.get('streams', []) if s.get('codec_type') == 'subtitle']
+            subtitle_streams = get_streams(data, 'subtitle')
             
             if not subtitle_streams:
                 print("  ℹ️ No subtitle streams found")
@@ -958,3 +1101,93 @@ def mkv_check_lang():
         tb_update('tb_info', "✅ Check Subs Language complete", "normal")
     tb_update('tb_info', "─" * 50, "normal")
 
+
+@menu_tag(label="Set Subs Language", group="videos")
+def mkv_set_subs_language():
+    """Tag untagged (und) embedded subtitle tracks with the configured Language (header-only edit)"""
+    from shared_data import get_shared
+    from config.smart_config_manager import get_config_manager
+    from .mkv_backend import (choose_backend, plan_language_edits, propedit_command,
+                              ffmpeg_edit_command, succeeded, MKVPROPEDIT, FFMPEG)
+    s = get_shared()
+
+    selected = s.app.lb_files.get_selected_file_paths()
+    if not selected:
+        from utils import update_tbinfo
+        update_tbinfo("⚠️ No files selected.", "rood")
+        print("⚠️ No files selected.")
+        return
+
+    language = normalize_stream_language(get_config_manager().get("persistent_cfg", "Language", "dut"))
+    video_exts = {".mp4", ".mkv", ".avi", ".mov", ".wmv"}
+    videos = [p for p in selected if os.path.splitext(p)[1].lower() in video_exts]
+    tools = _mkv_tools()
+    tb_update('tb_info', f"🏷️ Set Subs Language ({language}) - {len(videos)} file(s)", "normal")
+    import threading
+
+    def worker():
+        from utils.media_probe import probe_media, get_streams, get_probe_cache
+
+        for video_path in videos:
+            if getattr(s, 'batch_running', False) and getattr(s, 'batch_cancel_requested', False):
+                break
+            name = os.path.basename(video_path)
+            data = probe_media(video_path)
+            if "error" in data:
+                s.app.after(0, lambda n=name: tb_update('tb_info', f"❌ ffprobe failed: {n}", "rood"))
+                continue
+            tracks = [(normalize_stream_language(st.get('tags', {}).get('language')),
+                       bool(st.get('disposition', {}).get('default')))
+                      for st in get_streams(data, 'subtitle')]
+            edits = plan_language_edits(tracks, language)
+            if not edits:
+                s.app.after(0, lambda n=name: tb_update('tb_info', f"✅ No untagged subtitle tracks: {n}", "normal"))
+                continue
+
+            # mkvpropedit rewrites only the header of an MKV; otherwise a full ffmpeg copy
+            backend = choose_backend(video_path, True, tools)
+            if backend == FFMPEG and not tools["ffmpeg"]:
+                s.app.after(0, lambda: tb_update('tb_info', "❌ Neither mkvpropedit nor ffmpeg found (Settings/tools_cfg.json)", "rood"))
+                break
+            base, ext = os.path.splitext(video_path)
+            part_path = f"{base}.lang.part{ext}"
+            if backend == MKVPROPEDIT:
+                cmd = propedit_command(tools["mkvpropedit"], video_path, edits)
+            else:
+                cmd = ffmpeg_edit_command(tools["ffmpeg"], video_path, part_path, edits)
+            print(f"🔧 Running {backend} command: {' '.join(cmd)}")
+
+            try:
+                process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                           stdin=subprocess.DEVNULL, text=True, errors="replace",
+                                           **_no_console_subprocess_kwargs())
+                s.register_process(process)
+                try:
+                    output, _ = process.communicate()
+                finally:
+                    s.unregister_process(process)
+
+                if not succeeded(backend, process.returncode):
+                    print(f"❌ {backend} failed with return code {process.returncode}\n{output[-1000:]}")
+                    s.app.after(0, lambda n=name: tb_update('tb_info', f"❌ Failed: {n} - Check console for details", "rood"))
+                    if os.path.exists(part_path):
+                        os.remove(part_path)
+                    continue
+                if backend == FFMPEG:
+                    if not os.path.exists(part_path):
+                        raise RuntimeError("ffmpeg wrote no output")
+                    os.replace(part_path, video_path)
+                get_probe_cache().invalidate(video_path)
+                s.app.after(0, lambda n=name, c=len(edits), b=backend: tb_update(
+                    'tb_info', f"✅ {n}: {c} track(s) set to {language} ({b})", "normal"))
+            except Exception as e:
+                print(f"❌ Error processing {name}: {e}")
+                s.app.after(0, lambda n=name: tb_update('tb_info', f"❌ Error: {n}", "rood"))
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+
+        s.app.after(0, lambda: tb_update('tb_info', "─" * 50, "normal"))
+        s.batch_step_done = True
+
+    s.batch_step_done = False
+    threading.Thread(target=worker, daemon=True).start()
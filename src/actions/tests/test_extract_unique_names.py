@@ -48,6 +48,10 @@ class NormalizeTrackLanguageTests(unittest.TestCase):
     def test_maps_language_name(self):
         self.assertEqual(module.normalize_track_language_to_iso6393('dutch'), 'nld')
 
+    def test_maps_iso639_2b_code(self):
+        self.assertEqual(module.normalize_track_language_to_iso6393('dut'), 'nld')
+        self.assertEqual(module.normalize_track_language_to_iso6393('ger'), 'deu')
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,62 @@
+import importlib.util
+import unittest
+from pathlib import Path
+
+
+MODULE_PATH = Path(__file__).resolve().parents[2] / 'utils' / 'filter_index.py'
+
+
+spec = importlib.util.spec_from_file_location('filter_index_direct', MODULE_PATH)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+
+
+PATHS = [
+    'C:/QBMedia/Show/Show.S01E01.mkv',
+    'C:/QBMedia/Show/Show.S01E01-nld.srt',
+    'C:/QBMedia/Show/Show.S02E01.mkv',
+    'C:/QBMedia/Movie/Movie.2020.mp4',
+]
+
+
+class FilterIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index = module.FilterIndex(PATHS)
+
+    def test_empty_query_returns_everything(self):
+        self.assertEqual(self.index.search('  '), PATHS)
+
+    def test_substring_is_case_insensitive(self):
+        self.assertEqual(self.index.search('movie'), [PATHS[3]])
+
+    def test_tokens_and_extension(self):
+        self.assertEqual(self.index.search('s01 .srt'), [PATHS[1]])
+        self.assertEqual(self.index.search('.mkv'), [PATHS[0], PATHS[2]])
+
+    def test_narrowed_query_refines_previous_hits(self):
+        self.index.search('show')
+        self.index.names[3] = 'show.s01e01.mkv'   # not in the previous hits
+        self.assertEqual(self.index.search('show.s01'), PATHS[:2])
+
+    def test_widened_query_rescans(self):
+        self.index.search('s02')
+        self.assertEqual(self.index.search('s0'), PATHS[:3])
+
+    def test_extra_extension_widens_the_result(self):
+        # Extensions are OR-ed, so adding one must not search the old hits only
+        self.assertEqual(self.index.search('s01e01 .srt'), [PATHS[1]])
+        self.assertEqual(self.index.search('s01e01 .srt .mkv'), PATHS[:2])
+        self.assertEqual(self.index.search('s01e01 .mkv'), [PATHS[0]])
+
+    def test_lang_token_uses_language_map(self):
+        self.index.set_languages({PATHS[1]: 'nl'})
+        self.assertEqual(self.index.search('lang:nl'), [PATHS[1]])
+        self.assertEqual(self.index.search('lang:en'), [])
+        self.assertEqual(self.index.search('show lang:nl lang:en'), [PATHS[1]])
+
+    def test_parse_query_splits_lang_tokens(self):
+        self.assertEqual(module.parse_query('S01 .SRT lang:NL'), (['s01'], ['.srt'], ['nl']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / 'lb_files' / 'subtitles' / 'lang_detection.py'
+
+
+spec = importlib.util.spec_from_file_location('lang_detection_direct', MODULE_PATH)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+
+
+def _srt(lines):
+    return ''.join(
+        f"{i}\n00:00:{i % 60:02d},000 --> 00:00:{i % 60:02d},500\n{line}\n\n"
+        for i, line in enumerate(lines, start=1)
+    )
+
+
+class CountingDetector:
+    """Stands in for langdetect: 'nl' when 'het' occurs, else 'en'."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, text):
+        self.calls.append(text)
+        if 'het' in text.split():
+            return [('af', 0.6), ('nl', 0.4)]
+        return [('en', 0.99)]
+
+
+def _names(code):
+    return {'en': ('eng', 'English'), 'nl': ('dut', 'Dutch')}[code]
+
+
+class LanguageDetectorTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.detector_fn = CountingDetector()
+        self.detector = module.LanguageDetector(self.detector_fn, _names)
+
+    def _write(self, name, text, encoding='utf-8'):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', encoding=encoding, newline='') as f:
+            f.write(text)
+        return path
+
+    def test_detects_and_prefers_dutch(self):
+        path = self._write('a.srt', _srt(['<i>Dit is het huis van mijn vader en moeder</i>'] * 5))
+        result = self.detector.detect(path)
+        self.assertEqual(result[:4], ('nl', 'dut', 'Dutch', 0.4))
+        self.assertNotIn('<i>', self.detector_fn.calls[0])
+
+    def test_result_is_cached_until_file_changes(self):
+        path = self._write('a.srt', _srt(['This is the house of my father and mother'] * 5))
+        self.detector.detect(path)
+        self.detector.detect(path)
+        self.assertEqual(len(self.detector_fn.calls), 1)
+
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+        self.detector.detect(path)
+        self.assertEqual(len(self.detector_fn.calls), 2)
+
+    def test_large_file_is_sampled(self):
+        lines = [f'This is line number {i} of a very long subtitle file' for i in range(20000)]
+        path = self._write('big.srt', _srt(lines), encoding='utf-16')
+        sample = module.read_sample(path)
+        self.assertLess(len(sample), 2000)
+        self.assertIn('This is line number 0 of a very long subtitle file', sample)
+        self.assertTrue(any(int(line.split()[4]) > 15000 for line in sample))
+        self.assertEqual(self.detector.detect(path)[0], 'en')
+        self.assertLessEqual(len(self.detector_fn.calls[0]), module.MAX_SAMPLE_CHARS)
+
+    def test_short_text_and_batch_api(self):
+        short = self._write('short.srt', _srt(['Hi']))
+        good = self._write('good.srt', _srt(['This is the house of my father and mother'] * 5))
+        results = self.detector.detect_many([short, good, good])
+        self.assertEqual(list(results), [short, good])
+        self.assertEqual(results[short][0], 'xx')
+        self.assertEqual(results[good][:2], ('en', 'eng'))
+        self.assertEqual(len(self.detector_fn.calls), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import importlib.util
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+
+MODULE_PATH = Path(__file__).resolve().parents[2] / 'utils' / 'lang_index.py'
+
+
+spec = importlib.util.spec_from_file_location('lang_index_direct', MODULE_PATH)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+
+
+RESULT = ('nl', 'dut', 'Dutch', 0.99, 'Hallo daar')
+
+
+class LanguageIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.index = module.LanguageIndex(os.path.join(self.tmp.name, 'lang.sqlite'))
+        self.addCleanup(self.index.close)
+        self.path = os.path.join(self.tmp.name, 'a.srt')
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('1\n00:00:01,000 --> 00:00:02,000\nHallo daar\n')
+        self.hashes = []
+
+    def _hash(self, path):
+        self.hashes.append(path)
+        return module.content_hash(path)
+
+    def _stat(self, path):
+        st = os.stat(path)
+        return st.st_size, st.st_mtime_ns
+
+    def test_unchanged_file_needs_no_hash(self):
+        self.index.put(self.path, *self._stat(self.path), RESULT)
+        self.assertEqual(self.index.get(self.path, *self._stat(self.path), hash_fn=self._hash), RESULT)
+        self.assertEqual(self.hashes, [])
+        self.assertEqual(self.index.languages_for([self.path]), {self.path: 'nl'})
+
+    def test_touched_file_with_same_content_is_reused(self):
+        size, mtime = self._stat(self.path)
+        self.index.put(self.path, size, mtime, RESULT)
+        os.utime(self.path, ns=(mtime, mtime + 5_000_000_000))
+        # The file list does not hash: stale rows are not shown
+        self.assertEqual(self.index.languages_for([self.path]), {})
+        self.assertEqual(self.index.get(self.path, *self._stat(self.path), hash_fn=self._hash), RESULT)
+        self.assertEqual(self.index.languages_for([self.path]), {self.path: 'nl'})
+
+    def test_copy_is_found_by_content_hash(self):
+        self.index.put(self.path, *self._stat(self.path), RESULT)
+        copy = os.path.join(self.tmp.name, 'copy.srt')
+        shutil.copyfile(self.path, copy)
+        self.assertEqual(self.index.get(copy, *self._stat(copy)), RESULT)
+
+    def test_changed_content_misses(self):
+        self.index.put(self.path, *self._stat(self.path), RESULT)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('\n2\n00:00:03,000 --> 00:00:04,000\nHello there\n')
+        self.assertIsNone(self.index.get(self.path, *self._stat(self.path)))
+        self.assertEqual(self.index.languages_for([self.path]), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import importlib.util
+import os
+import threading
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+
+MODULE_PATH = Path(__file__).resolve().parents[2] / 'utils' / 'media_probe.py'
+
+
+spec = importlib.util.spec_from_file_location('media_probe_direct', MODULE_PATH)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+
+
+SAMPLE = {
+    'streams': [
+        {'index': 0, 'codec_type': 'video', 'pix_fmt': 'yuv420p10le', 'width': 3840, 'height': 2160},
+        {'index': 1, 'codec_type': 'audio'},
+        {'index': 2, 'codec_type': 'subtitle', 'tags': {'language': 'dut'}},
+    ],
+    'format': {'duration': '120.5'},
+}
+
+
+class CountingRunner:
+    def __init__(self, result=None):
+        self.calls = 0
+        self.result = result if result is not None else SAMPLE
+
+    def __call__(self, path):
+        self.calls += 1
+        return self.result
+
+
+class ProbeMediaTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.video = Path(self.tmp.name) / 'Film.mkv'
+        self.video.write_bytes(b'x' * 10)
+        self.db_path = Path(self.tmp.name) / 'probe.sqlite'
+        self.cache = module.ProbeCache(self.db_path)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_second_probe_is_served_from_cache(self):
+        runner = CountingRunner()
+        module.probe_media(str(self.video), cache=self.cache, runner=runner)
+        data = module.probe_media(str(self.video), cache=self.cache, runner=runner)
+        self.assertEqual(runner.calls, 1)
+        self.assertEqual(data, SAMPLE)
+
+    def test_cache_survives_new_cache_instance(self):
+        runner = CountingRunner()
+        module.probe_media(str(self.video), cache=self.cache, runner=runner)
+        self.cache.close()
+
+        reopened = module.ProbeCache(self.db_path)
+        try:
+            module.probe_media(str(self.video), cache=reopened, runner=runner)
+        finally:
+            reopened.close()
+        self.assertEqual(runner.calls, 1)
+
+    def test_changed_file_is_probed_again(self):
+        runner = CountingRunner()
+        module.probe_media(str(self.video), cache=self.cache, runner=runner)
+        st = os.stat(self.video)
+        os.utime(self.video, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        module.probe_media(str(self.video), cache=self.cache, runner=runner)
+        self.assertEqual(runner.calls, 2)
+
+    def test_errors_are_not_cached(self):
+        runner = CountingRunner({'error': 'boom'})
+        module.probe_media(str(self.video), cache=self.cache, runner=runner)
+        module.probe_media(str(self.video), cache=self.cache, runner=runner)
+        self.assertEqual(runner.calls, 2)
+
+
+class ProbeManyTests(unittest.TestCase):
+    def test_yields_every_path_once(self):
+        paths = [f'file{i}.mkv' for i in range(20)]
+        results = dict(module.probe_many(paths, max_workers=4, probe=lambda p: {'path': p}))
+        self.assertEqual(set(results), set(paths))
+        self.assertEqual(results['file3.mkv'], {'path': 'file3.mkv'})
+
+    def test_cancel_stops_submitting(self):
+        cancel = threading.Event()
+        probed = []
+
+        def probe(path):
+            probed.append(path)
+            return {}
+
+        for _ in module.probe_many([f'f{i}' for i in range(50)], max_workers=2,
+                                   cancel_event=cancel, probe=probe):
+            cancel.set()
+        self.assertLess(len(probed), 50)
+
+
+class AccessorTests(unittest.TestCase):
+    def test_stream_helpers(self):
+        self.assertEqual(module.get_video_stream(SAMPLE)['pix_fmt'], 'yuv420p10le')
+        self.assertEqual([s['index'] for s in module.get_streams(SAMPLE, 'subtitle')], [2])
+        self.assertEqual(module.get_duration(SAMPLE), 120.5)
+        self.assertIsNone(module.get_duration({'error': 'boom'}))
+
+
+if __name__ == '__main__':
+    unittest.main()
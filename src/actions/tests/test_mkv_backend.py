@@ -0,0 +1,82 @@
+import importlib.util
+import unittest
+from pathlib import Path
+
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / 'lb_files' / 'videos' / 'mkv_backend.py'
+
+
+spec = importlib.util.spec_from_file_location('mkv_backend_direct', MODULE_PATH)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+
+ALL_TOOLS = {'mkvpropedit': 'mkvpropedit', 'mkvmerge': 'mkvmerge', 'ffmpeg': 'ffmpeg'}
+
+
+class BackendChoiceTests(unittest.TestCase):
+    def test_cheapest_available_backend(self):
+        self.assertEqual(module.choose_backend('a.mkv', True, ALL_TOOLS), 'mkvpropedit')
+        self.assertEqual(module.choose_backend('a.mkv', False, ALL_TOOLS), 'mkvmerge')
+        # A header edit never goes to mkvmerge: without mkvpropedit it is an ffmpeg copy
+        self.assertEqual(module.choose_backend('a.MKV', True, dict(ALL_TOOLS, mkvpropedit=None)), 'ffmpeg')
+        self.assertEqual(module.choose_backend('a.MKV', False, dict(ALL_TOOLS, mkvpropedit=None)), 'mkvmerge')
+        self.assertEqual(module.choose_backend('a.mp4', True, ALL_TOOLS), 'ffmpeg')
+        self.assertEqual(module.choose_backend('a.mkv', True, {'ffmpeg': 'ffmpeg'}), 'ffmpeg')
+        self.assertTrue(module.in_place('mkvpropedit'))
+        self.assertFalse(module.in_place('mkvmerge'))
+
+    def test_exit_codes(self):
+        self.assertTrue(module.succeeded('mkvmerge', 1))
+        self.assertFalse(module.succeeded('mkvpropedit', 2))
+        self.assertFalse(module.succeeded('ffmpeg', 1))
+
+
+class HeaderEditTests(unittest.TestCase):
+    def test_language_edits_only_touch_untagged_tracks(self):
+        edits = module.plan_language_edits([('dut', True), ('eng', False), ('und', False), ('', False)], 'dut')
+        self.assertEqual([(e.track, e.language, e.default) for e in edits], [(2, 'dut', None), (3, 'dut', None)])
+        self.assertEqual(module.plan_language_edits([('dut', True)], 'dut'), [])
+        self.assertEqual(module.plan_language_edits([], 'dut'), [])
+
+    def test_correct_mixed_language_file_is_left_alone(self):
+        self.assertEqual(module.plan_language_edits([('eng', True), ('dut', False)], 'dut'), [])
+
+    def test_first_track_becomes_default_when_none_is(self):
+        edits = module.plan_language_edits([('und', False)], 'dut')
+        self.assertEqual([(e.track, e.language, e.default) for e in edits], [(0, 'dut', True)])
+        edits = module.plan_language_edits([('eng', False)], 'dut')
+        self.assertEqual([(e.track, e.language, e.default) for e in edits], [(0, None, True)])
+        edits = module.plan_language_edits([('dut', False), ('und', False)], 'dut')
+        self.assertEqual([(e.track, e.language, e.default) for e in edits], [(0, None, True), (1, 'dut', None)])
+
+    def test_propedit_command(self):
+        edits = [module.SubtitleEdit(0, language='dut', default=True), module.SubtitleEdit(1, title='', forced=False)]
+        self.assertEqual(module.propedit_command('mkvpropedit', 'a.mkv', edits), [
+            'mkvpropedit', 'a.mkv',
+            '--edit', 'track:s1', '--set', 'language=dut', '--set', 'flag-default=1',
+            '--edit', 'track:s2', '--delete', 'name', '--set', 'flag-forced=0',
+        ])
+
+    def test_ffmpeg_fallback_writes_a_copy(self):
+        edits = [module.SubtitleEdit(1, language='dut', default=True, forced=True)]
+        cmd = module.ffmpeg_edit_command('ffmpeg', 'a.mp4', 'a.part.mp4', edits)
+        self.assertEqual(cmd[cmd.index('-metadata:s:s:1') + 1], 'language=dut')
+        self.assertEqual(cmd[cmd.index('-disposition:s:1') + 1], 'default+forced')
+        self.assertEqual(cmd[-1], 'a.part.mp4')
+
+
+class StreamChangeTests(unittest.TestCase):
+    def test_mkvmerge_embed(self):
+        cmd = module.mkvmerge_command('mkvmerge', 'a.mkv', 'a_embed.mkv', drop_subs=True,
+                                      subtitles=[('a.nl.srt', 'dut')])
+        self.assertEqual(cmd, ['mkvmerge', '--gui-mode', '-o', 'a_embed.mkv', '--no-subtitles', 'a.mkv',
+                               '--language', '0:dut', '--default-track-flag', '0:yes', 'a.nl.srt'])
+
+    def test_progress(self):
+        self.assertEqual(module.parse_mkvmerge_progress('#GUI#progress 42%'), 0.42)
+        self.assertEqual(module.parse_mkvmerge_progress('Progress: 100%'), 1.0)
+        self.assertIsNone(module.parse_mkvmerge_progress('The file is being analyzed.'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import importlib.util
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / 'lb_files' / 'videos' / 'preflight.py'
+
+
+spec = importlib.util.spec_from_file_location('preflight_direct', MODULE_PATH)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+
+
+def probe_of(pix_fmt='yuv420p', height=1080, codec='hevc', subtitles=0):
+    streams = [{'codec_type': 'video', 'codec_name': codec, 'pix_fmt': pix_fmt, 'width': height * 16 // 9, 'height': height}]
+    streams += [{'codec_type': 'subtitle'} for _ in range(subtitles)]
+    return {'streams': streams, 'format': {'duration': '60'}}
+
+
+class FakeProbes:
+    """probe_many stand-in that records which paths were probed."""
+
+    def __init__(self, probes):
+        self.probes = probes
+        self.probed = []
+
+    def __call__(self, paths, cancel_event=None):
+        for path in paths:
+            self.probed.append(os.path.basename(path))
+            yield path, self.probes.get(os.path.basename(path), {'error': 'no such file'})
+
+
+class BitDepthTests(unittest.TestCase):
+    def test_bit_depth_from_pix_fmt(self):
+        self.assertEqual(module.bit_depth({'pix_fmt': 'yuv420p'}), 8)
+        self.assertEqual(module.bit_depth({'pix_fmt': 'yuvj420p'}), 8)
+        self.assertEqual(module.bit_depth({'pix_fmt': 'nv12'}), 8)
+        self.assertEqual(module.bit_depth({'pix_fmt': 'yuv420p10le'}), 10)
+        self.assertEqual(module.bit_depth({'pix_fmt': 'p010le'}), 10)
+        self.assertEqual(module.bit_depth({'pix_fmt': 'yuv444p12le'}), 12)
+        self.assertEqual(module.bit_depth({'pix_fmt': 'yuv420p', 'bits_per_raw_sample': '10'}), 10)
+
+    def test_max_resolution_setting(self):
+        self.assertEqual(module.max_height_from_config('720p'), 720)
+        self.assertEqual(module.max_height_from_config('2160p'), 2160)
+        self.assertEqual(module.max_height_from_config(None), 1080)
+
+
+class EvaluateTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _path(self, name, content=None):
+        path = os.path.join(self.tmp.name, name)
+        if content is not None:
+            with open(path, 'w') as f:
+                f.write(content)
+        return path
+
+    def test_hevc_skips_finished_files_and_keeps_order(self):
+        probes = FakeProbes({
+            'ten.mkv': probe_of('yuv420p10le'),
+            'uhd.mkv': probe_of(height=2160),
+            'done.mkv': probe_of(),
+            'old_8bit.mkv': probe_of(),
+            'broken.mkv': {'error': 'invalid data'},
+        })
+        self._path('half_8bit.mkv', 'hevc')
+        paths = [self._path(n) for n in ('ten.mkv', 'notes.txt', 'uhd.mkv', 'done.mkv',
+                                          'half.mkv', 'old_8bit.mkv', 'broken.mkv')]
+        decisions = module.evaluate(paths, module.hevc8_target(1080), probe_many=probes)
+
+        self.assertEqual([(os.path.basename(d.path), d.skip, d.reason) for d in decisions], [
+            ('ten.mkv', False, '10-bit'),
+            ('notes.txt', True, 'not a video'),
+            ('uhd.mkv', False, '2160p'),
+            ('done.mkv', True, 'already 8-bit ≤1080p'),
+            ('half.mkv', True, 'output exists'),
+            ('old_8bit.mkv', True, 'already 8-bit ≤1080p'),
+            ('broken.mkv', False, 'probe failed'),
+        ])
+        # Output and extension checks happen before probing
+        self.assertNotIn('half.mkv', probes.probed)
+        self.assertNotIn('notes.txt', probes.probed)
+        self.assertEqual(decisions[0].probe['streams'][0]['pix_fmt'], 'yuv420p10le')
+
+    def test_mkv_target_needs_no_probe(self):
+        probes = FakeProbes({})
+        self._path('b.mkv', 'mkv')
+        paths = [self._path(n) for n in ('a.mkv', 'b.mp4', 'c.avi', 'd.srt')]
+        decisions = module.evaluate(paths, module.mkv_target(), probe_many=probes)
+        self.assertEqual([(d.skip, d.reason) for d in decisions], [
+            (True, 'already MKV'), (True, 'output exists'), (False, ''), (True, 'not a video'),
+        ])
+        self.assertEqual(probes.probed, [])
+
+    def test_subtitle_count_and_summary(self):
+        probes = FakeProbes({'a.mkv': probe_of(subtitles=2), 'b.mkv': probe_of(), 'c.mkv': probe_of()})
+        paths = [self._path(n) for n in ('a.mkv', 'b.mkv', 'c.mkv')]
+        decisions = module.evaluate(paths, module.nosubs_target(), probe_many=probes)
+        self.assertEqual(decisions[0].reason, '2 subtitle(s)')
+        self.assertEqual(module.summarize(decisions), '1 to process, 2 skipped (2 already no subtitles)')
+
+    def test_codec_criterion(self):
+        target = module.Target('HEVC', codecs={'hevc'})
+        self.assertEqual(target.check(probe_of(codec='h264')), ['codec h264'])
+        self.assertEqual(target.check(probe_of()), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import importlib.util
+import unittest
+from pathlib import Path
+
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / 'lb_files' / 'videos' / 'remux_plan.py'
+
+
+spec = importlib.util.spec_from_file_location('remux_plan_direct', MODULE_PATH)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+
+MKV, NOSUBS, EMBED = module.TO_MKV, module.REMOVE_SUBS, module.EMBED_SUB
+
+
+def find_srt(video):
+    return ('/v/ep1.nl.srt', 'dut')
+
+
+class RunTests(unittest.TestCase):
+    def test_only_two_or_more_consecutive_steps_combine(self):
+        labels = ['Extract Subs', MKV, NOSUBS, EMBED, 'Sync Srt', EMBED]
+        self.assertEqual(module.remux_run(labels, 0), 0)
+        self.assertEqual(module.remux_run(labels, 1), 4)
+        self.assertEqual(module.remux_run(labels, 5), 5)
+
+
+class PlanTests(unittest.TestCase):
+    def test_typical_batch_is_one_command(self):
+        plan = module.plan_remux('/v/ep1.mp4', [MKV, NOSUBS, EMBED], find_srt)
+        self.assertEqual(plan.output, '/v/ep1_embed.mkv')
+        self.assertFalse(plan.replaces_source)
+        cmd = module.build_command('ffmpeg', plan, '/v/ep1_embed.remux.part.mkv')
+        self.assertEqual(cmd.count('-i'), 2)
+        self.assertIn('-0:s', cmd)
+        self.assertEqual(cmd[cmd.index('-c') + 1], 'copy')
+        self.assertEqual(cmd[cmd.index('-metadata:s:s:0') + 1], 'language=dut')
+        self.assertEqual(cmd[-1], '/v/ep1_embed.remux.part.mkv')
+
+    def test_order_matters(self):
+        # Removing subs after embedding leaves no subtitles and no _embed file
+        plan = module.plan_remux('/v/ep1.mkv', [EMBED, NOSUBS], find_srt)
+        self.assertEqual((plan.drop_subs, plan.subtitles), (True, []))
+        self.assertEqual(plan.output, '/v/ep1.mkv')
+        self.assertTrue(plan.replaces_source)
+
+    def test_convert_without_sub_changes_keeps_text_subs(self):
+        plan = module.plan_remux('/v/ep1.mp4', [MKV, EMBED], lambda video: None)
+        self.assertEqual(plan.operations, [MKV])
+        self.assertEqual(plan.output, '/v/ep1.mkv')
+        cmd = module.build_command('ffmpeg', plan, plan.output)
+        self.assertNotIn('-0:s', cmd)
+        self.assertEqual(cmd[cmd.index('-c:s') + 1], 'srt')
+
+    def test_noop(self):
+        plan = module.plan_remux('/v/ep1.mkv', [MKV, NOSUBS])
+        self.assertTrue(plan.is_noop(source_subtitles=0))
+        self.assertFalse(plan.is_noop(source_subtitles=2))
+        self.assertFalse(plan.is_noop())
+        self.assertFalse(module.plan_remux('/v/ep1.avi', [MKV, NOSUBS]).is_noop(0))
+
+    def test_unknown_action_is_rejected(self):
+        with self.assertRaises(ValueError):
+            module.plan_remux('/v/ep1.mkv', ['Sync Srt'])
+
+
+if __name__ == '__main__':
+    unittest.main()
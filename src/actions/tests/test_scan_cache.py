@@ -0,0 +1,83 @@
+import importlib.util
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+
+MODULE_PATH = Path(__file__).resolve().parents[2] / 'utils' / 'scan_cache.py'
+
+
+spec = importlib.util.spec_from_file_location('scan_cache_direct', MODULE_PATH)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+
+# Directory mtimes in the tests are always "just now"; disable the racy guard
+module.RACY_MTIME_NS = 0
+
+
+def bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+
+
+class IncrementalScannerTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        (self.root / 'Show' / 'S01').mkdir(parents=True)
+        (self.root / 'Movie').mkdir()
+        (self.root / 'a.mkv').write_text('x')
+        (self.root / 'Show' / 'S01' / 'e1.mkv').write_text('x')
+        (self.root / 'Movie' / 'm.mp4').write_text('x')
+        self.scanner = module.IncrementalScanner()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_first_scan_is_full(self):
+        diff = self.scanner.scan(str(self.root))
+        self.assertTrue(diff.full)
+        self.assertEqual(len(list(self.scanner.iter_files())), 3)
+        depths = sorted(depth for depth, _, _ in self.scanner.iter_tree())
+        self.assertEqual(depths, [1, 1, 2])
+
+    def test_unchanged_rescan_lists_nothing(self):
+        self.scanner.scan(str(self.root))
+        diff = self.scanner.scan(str(self.root))
+        self.assertFalse(diff)
+        self.assertEqual(diff.rescanned, [])
+
+    def test_new_file_rescans_only_its_folder(self):
+        self.scanner.scan(str(self.root))
+        season = self.root / 'Show' / 'S01'
+        (season / 'e1.srt').write_text('x')
+        bump_mtime(season)
+
+        diff = self.scanner.scan(str(self.root))
+        self.assertEqual(diff.rescanned, [os.path.normpath(str(season))])
+        self.assertEqual(diff.added, [str(season / 'e1.srt')])
+        self.assertEqual(diff.removed, [])
+        self.assertFalse(diff.tree_changed)
+
+    def test_removed_folder_reports_its_files(self):
+        self.scanner.scan(str(self.root))
+        (self.root / 'Movie' / 'm.mp4').unlink()
+        (self.root / 'Movie').rmdir()
+        bump_mtime(self.root)
+
+        diff = self.scanner.scan(str(self.root))
+        self.assertTrue(diff.tree_changed)
+        self.assertIn(str(self.root / 'Movie' / 'm.mp4'), diff.removed)
+
+    def test_non_recursive_lists_only_root_files(self):
+        diff = self.scanner.scan(str(self.root), recursive=False)
+        files = list(self.scanner.iter_files())
+        self.assertEqual(files, [(str(self.root / 'a.mkv'), 'a.mkv', 'video')])
+        # Subfolders are shown in the tree but never listed
+        self.assertEqual(diff.rescanned, [os.path.normpath(str(self.root))])
+        self.assertEqual(sorted(depth for depth, _, _ in self.scanner.iter_tree()), [1, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
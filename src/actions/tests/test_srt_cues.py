@@ -0,0 +1,97 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / 'lb_files' / 'subtitles' / 'srt_cues.py'
+
+
+spec = importlib.util.spec_from_file_location('srt_cues_direct', MODULE_PATH)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+
+
+SAMPLE = (
+    "1\r\n"
+    "00:00:01,000 --> 00:00:02,500\r\n"
+    "Hello\r\n"
+    "<i>world</i>\r\n"
+    "\r\n"
+    "2\r\n"
+    "00:01:02.34 --> 00:01:04,000\r\n"
+    "Bye\r\n"
+)
+
+
+class ParseSrtTests(unittest.TestCase):
+    def test_cues_and_timings(self):
+        sub = module.parse_srt_text(SAMPLE)
+        self.assertEqual(len(sub), 2)
+        self.assertEqual((sub.cues[0].start, sub.cues[0].end), (1000, 2500))
+        self.assertEqual(sub.cues[0].lines, ['Hello', '<i>world</i>'])
+        self.assertEqual(sub.cues[1].start, 62340)
+        self.assertEqual(sub.preamble, [])
+
+    def test_round_trip_renumbers(self):
+        sub = module.parse_srt_text(SAMPLE)
+        out = module.serialize_srt(sub.cues)
+        self.assertTrue(out.startswith('1\n00:00:01,000 --> 00:00:02,500\nHello\n'))
+        self.assertIn('2\n00:01:02,340 --> 00:01:04,000\nBye\n\n', out)
+        self.assertEqual(len(module.parse_srt_text(out)), 2)
+
+    def test_missing_index_and_preamble(self):
+        text = "WEBVTT-ish header\n\n00:00:01,000 --> 00:00:02,000\nNo index\n"
+        sub = module.parse_srt_text(text)
+        self.assertEqual(sub.preamble, ['WEBVTT-ish header'])
+        self.assertEqual(sub.cues[0].lines, ['No index'])
+
+    def test_large_file_is_linear(self):
+        block = "{n}\n00:00:01,000 --> 00:00:02,000\nline {n}\n\n"
+        text = "".join(block.format(n=i) for i in range(1, 10001))
+        sub = module.parse_srt_text(text)
+        self.assertEqual(len(sub), 10000)
+        self.assertEqual(sub.cues[-1].lines, ['line 10000'])
+
+
+class EncodingTests(unittest.TestCase):
+    def _detect(self, text, encoding):
+        return module.detect_encoding(text.encode(encoding))
+
+    def test_utf8_and_cp1252(self):
+        self.assertEqual(self._detect('één café', 'utf-8'), 'utf-8')
+        self.assertEqual(self._detect('één café', 'cp1252'), 'cp1252')
+
+    def test_bom_and_bomless_utf16(self):
+        self.assertEqual(self._detect('abc', 'utf-8-sig'), 'utf-8-sig')
+        self.assertEqual(self._detect('abc', 'utf-16'), 'utf-16')
+        self.assertEqual(self._detect('1\n00:00:01,000', 'utf-16-le'), 'utf-16-le')
+
+    def test_parse_srt_reads_file_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'a.srt')
+            with open(path, 'w', encoding='cp1252', newline='') as f:
+                f.write(SAMPLE.replace('Bye', 'Caf\xe9'))
+            sub = module.parse_srt(path)
+            self.assertEqual(sub.encoding, 'cp1252')
+            self.assertEqual(sub.cues[1].lines, ['Caf\xe9'])
+
+
+class AssDocumentTests(unittest.TestCase):
+    def test_text_field_round_trip(self):
+        lines = [
+            "[Events]\n",
+            "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n",
+            "Dialogue: 0,0:00:01.00,0:00:02.00,Default,,0,0,0,,Hi, there\\Nyou\n",
+        ]
+        doc = module.AssDocument(lines)
+        self.assertTrue(doc.has_text_field)
+        self.assertEqual(doc.texts, ['Hi, there\nyou'])
+        doc.texts[0] = 'Hallo\ndaar'
+        self.assertTrue(doc.serialize().endswith(',,Hallo\\Ndaar\n'))
+        self.assertTrue(module.looks_like_ass(''.join(lines)))
+
+
+if __name__ == '__main__':
+    unittest.main()
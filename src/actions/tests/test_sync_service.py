@@ -0,0 +1,112 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from actions.tests.worker_fakes import StopBatch, load_subtitles_module, write_fake_worker
+
+
+service_module = load_subtitles_module('sync_service.py')
+worker_module = load_subtitles_module('_sync_worker.py')
+
+
+# _sync_worker.py replies per job; a video seen before comes from the cache
+FAKE_HANDLER = '''
+    seen = set()
+    for job in jobs():
+        if job["srt"] == "hang.srt":
+            time.sleep(30)
+        if job["srt"] == "bad.srt":
+            reply(f"ERROR:{job['id']}:no speech")
+            continue
+        source = "cache" if job["video"] in seen else "decoded"
+        seen.add(job["video"])
+        reply(f"DONE:{job['id']}:{source}:-1.250")
+'''
+
+
+class SyncServiceTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.worker = write_fake_worker(self.tmp.name, FAKE_HANDLER)
+
+    def _service(self, **kwargs):
+        return service_module.SyncService([sys.executable], self.tmp.name, worker_script=self.worker, **kwargs)
+
+    def test_one_worker_runs_all_jobs(self):
+        seen, registered = [], []
+        service = self._service(on_result=lambda job, ok, msg, detail: seen.append((job.id, ok, msg, detail)),
+                                register=registered.append)
+        jobs = [service_module.SyncJob(i, 'film.mkv', srt, 'out.srt')
+                for i, srt in enumerate(['en.srt', 'nl.srt', 'bad.srt', 'fr.srt'])]
+        results = service.run(jobs)
+        self.assertEqual(len(registered), 1)
+        self.assertEqual(results['2'], (False, 'no speech'))
+        self.assertEqual(seen[0], ('0', True, '', ('decoded', -1.25)))
+        self.assertEqual((service.decoded, service.from_cache), (1, 2))
+
+    def test_cancel_reports_remaining_jobs(self):
+        service = self._service(cancelled=lambda: True)
+        results = service.run([service_module.SyncJob(i, 'film.mkv', 'en.srt', 'out.srt') for i in range(3)])
+        self.assertTrue(all(not ok for ok, _ in results.values()))
+
+    def test_worker_terminated_by_stop_batch_reports_cancelled(self):
+        stop, reported = StopBatch(), []
+        service = self._service(register=stop.procs.append, cancelled=stop.cancel.is_set,
+                                on_result=lambda job, ok, msg, detail: reported.append(msg))
+        service.POLL_SECONDS = 5  # the stop lands while the service waits for output
+        results = service.run([service_module.SyncJob(i, 'film.mkv', 'hang.srt', 'out.srt') for i in range(2)])
+        self.assertEqual(results, {'0': (False, 'cancelled'), '1': (False, 'cancelled')})
+        self.assertEqual(reported, ['cancelled'])
+
+class SyncWorkerCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache_dir = os.path.join(self.tmp.name, 'cache')
+        os.makedirs(self.cache_dir)
+        self.video = os.path.join(self.tmp.name, 'film.mkv')
+        with open(self.video, 'wb') as f:
+            f.write(b'video')
+        self.calls = []
+        original = worker_module.run_ffsubsync
+        self.addCleanup(setattr, worker_module, 'run_ffsubsync', original)
+        worker_module.run_ffsubsync = self._fake_ffsubsync
+
+    def _fake_ffsubsync(self, reference, srt, output, serialize=False):
+        self.calls.append((reference, serialize))
+        if serialize:
+            with open(os.path.splitext(reference)[0] + '.npz', 'wb') as f:
+                f.write(b'speech')
+        with open(output, 'w') as f:
+            f.write('synced')
+        return {'retval': 0, 'offset_seconds': 0.5}
+
+    def _job(self, srt):
+        return {'id': '1', 'video': self.video, 'srt': srt,
+                'output': os.path.join(self.tmp.name, srt + '.sync')}
+
+    def test_audio_is_decoded_once_per_video(self):
+        sources = [worker_module.sync(self._job(srt), self.cache_dir)[0]
+                   for srt in ('en.srt', 'nl.srt', 'fr.srt')]
+        self.assertEqual(sources, ['decoded', 'cache', 'cache'])
+        cached = worker_module.cache_path(self.cache_dir, self.video)
+        self.assertEqual(self.calls, [(self.video, True), (cached, False), (cached, False)])
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, 'film.npz')))
+
+    def test_changed_video_and_own_npz_are_respected(self):
+        worker_module.sync(self._job('en.srt'), self.cache_dir)
+        with open(self.video, 'ab') as f:
+            f.write(b'remux')
+        own = os.path.join(self.tmp.name, 'film.npz')
+        with open(own, 'wb') as f:
+            f.write(b'mine')
+        self.assertEqual(worker_module.sync(self._job('nl.srt'), self.cache_dir)[0], 'decoded')
+        self.assertEqual(self.calls[-1], (self.video, False))
+        with open(own, 'rb') as f:
+            self.assertEqual(f.read(), b'mine')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,333 @@
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from actions.tests.worker_fakes import StopBatch
+
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / 'lb_files' / 'videos' / 'transcode_queue.py'
+
+
+spec = importlib.util.spec_from_file_location('transcode_queue_direct', MODULE_PATH)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+
+
+# Writes -progress blocks and the output like ffmpeg; "bad" inputs fail
+FAKE_ENCODER = textwrap.dedent('''
+    import sys, time
+    source, out = sys.argv[1], sys.argv[2]
+    if "bad" in source:
+        print("Invalid data found when processing input", file=sys.stderr)
+        sys.exit(1)
+    for us in (1000000, 2000000):
+        print(f"out_time_us={us}")
+        print("speed=2.0x")
+        print("progress=continue", flush=True)
+        time.sleep(0.05 if "slow" not in source else 5)
+    open(out, "w").write("hevc")
+    print("progress=end", flush=True)
+''')
+
+
+# ffmpeg/ffprobe stand-ins for a segmented encode: split, encode (a segment
+# listed in FAIL_ONCE fails on its first attempt, one in FAIL always, the ones
+# in HANG until terminated) and concat
+FAKE_FFMPEG = textwrap.dedent('''
+    import os, sys, time
+    args = sys.argv[1:]
+    out = args[-1]
+    if "segment" in args:
+        cuts = args[args.index("-segment_times") + 1].split(",")
+        for i in range(len(cuts) + 1):
+            open(out % i, "w").write(f"src{i}")
+        sys.exit(0)
+    if "concat" in args:
+        listing = open(args[args.index("-i") + 1]).read()
+        open(out, "w").write(listing)
+        sys.exit(0)
+    source = args[args.index("-i") + 1]
+    name, marker = os.path.basename(source), source + ".failed"
+    if name in os.environ.get("HANG", "").split(","):
+        time.sleep(30)
+    if name == os.environ.get("FAIL") or (name == os.environ.get("FAIL_ONCE") and not os.path.exists(marker)):
+        open(marker, "w").close()
+        print("segment error", file=sys.stderr)
+        sys.exit(1)
+    print("out_time_us=60000000")
+    print("speed=1.0x")
+    print("progress=end", flush=True)
+    open(out, "w").write("hevc")
+''')
+
+FAKE_FFPROBE = textwrap.dedent('''
+    for t in range(0, 3600, 10):
+        print(f"{t}.000000,{'K_' if t % 30 == 0 else '__'}")
+''')
+
+
+class PlanTests(unittest.TestCase):
+    def test_cores_are_split_between_encodes(self):
+        self.assertEqual(module.plan_concurrency(50, cpu_count=32), (4, 8))
+        self.assertEqual(module.plan_concurrency(2, cpu_count=32), (2, 16))
+        self.assertEqual(module.plan_concurrency(50, cpu_count=4), (1, 4))
+        self.assertEqual(module.plan_concurrency(50, cpu_count=32, configured=2), (2, 16))
+
+    def test_command_uses_progress_pipe_and_pools(self):
+        job = module.TranscodeJob(1, 'in.mkv', 'out_8bit.mkv', scale_height=1080)
+        cmd = module.build_command('ffmpeg', job, 8)
+        self.assertIn('pools=8', cmd)
+        self.assertEqual(cmd[cmd.index('-progress') + 1], 'pipe:1')
+        self.assertEqual(cmd[-1], 'out_8bit.part.mkv')
+        self.assertIn('scale=-2:1080', cmd)
+
+    def test_segment_plan(self):
+        self.assertEqual(module.segment_count(3600, cpu_count=32), 4)
+        self.assertEqual(module.segment_count(600, cpu_count=32), 1)
+        self.assertEqual(module.segment_count(3600, cpu_count=8), 1)
+        self.assertEqual(module.parse_keyframes('0.000000,K_\n1.5,__\n3.0,K_D\nN/A,K_\n'), [0.0, 3.0])
+        self.assertEqual(module.plan_cuts([0.0, 10.0, 22.0, 31.0, 38.0], 40.0, 4), [10.0, 22.0, 31.0])
+        self.assertEqual(module.plan_cuts([0.0, 35.0], 40.0, 4), [35.0])
+        self.assertEqual(module.plan_cuts([0.0], 40.0, 4), [])
+
+    def test_concat_keeps_original_audio_and_subtitles(self):
+        job = module.TranscodeJob(1, 'in.mkv', 'out_8bit.mkv')
+        cmd = module.concat_command('ffmpeg', job, 'list.txt')
+        self.assertEqual(cmd[cmd.index('-c') + 1], 'copy')
+        for mapping in ('0:v', '1', '-1:v', '-1:d'):
+            self.assertIn(mapping, cmd)
+        # Segments use exactly the encoder settings of a whole-file encode
+        settings = module._video_args(None, 8)
+        for cmd in (module.segment_command('ffmpeg', job, 'src_000.mkv', 'enc_000.mkv', 8),
+                    module.build_command('ffmpeg', job, 8)):
+            start = cmd.index(settings[0])
+            self.assertEqual(cmd[start:start + len(settings)], settings)
+
+    def test_whole_file_and_segmented_encodes_keep_the_same_streams(self):
+        job = module.TranscodeJob(1, 'in.mkv', 'out_8bit.mkv')
+
+        def maps(cmd):
+            return [cmd[i + 1] for i, arg in enumerate(cmd) if arg == '-map']
+
+        whole = module.build_command('ffmpeg', job, 8)
+        self.assertEqual(maps(whole), ['0', '-0:d'])
+        # Stream copy for everything, overridden for video by the encoder settings
+        self.assertLess(whole.index('-c'), whole.index('-c:v'))
+        self.assertEqual(whole[whole.index('-c') + 1], 'copy')
+        # Segmented: encoded video from input 0, the rest of the original (input 1)
+        concat = module.concat_command('ffmpeg', job, 'list.txt')
+        self.assertEqual(maps(concat), ['0:v', '1', '-1:v', '-1:d'])
+
+    def test_progress_parser(self):
+        parser = module.ProgressParser()
+        self.assertIsNone(parser.feed('out_time_us=1500000\n'))
+        self.assertIsNone(parser.feed('speed=1.5x\n'))
+        self.assertEqual(parser.feed('progress=continue\n'), {'seconds': 1.5, 'speed': 1.5, 'end': False})
+        parser.feed('out_time=00:01:02.500000')
+        parser.feed('speed=N/A')
+        self.assertEqual(parser.feed('progress=end'), {'seconds': 62.5, 'speed': 0.0, 'end': True})
+
+
+class QueueTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, 'queue.json')
+
+    def test_queue_survives_restart(self):
+        queue = module.TranscodeQueue(self.path)
+        queue.add('a.mkv', 'a_8bit.mkv', duration=10)
+        queue.add('b.mkv', 'b_8bit.mkv', duration=20)
+        self.assertEqual(queue.add('a.mkv', 'a_8bit.mkv').id, '1')
+        self.assertEqual(queue.take().input, 'a.mkv')
+
+        # The app stopped while a.mkv was encoding
+        again = module.TranscodeQueue(self.path)
+        self.assertEqual([job.input for job in again.pending()], ['a.mkv', 'b.mkv'])
+        self.assertEqual(again.pending()[1].duration, 20)
+
+
+class SchedulerTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.encoder = os.path.join(self.tmp.name, 'fake_ffmpeg.py')
+        with open(self.encoder, 'w', encoding='utf-8') as f:
+            f.write(FAKE_ENCODER)
+        self.queue = module.TranscodeQueue(os.path.join(self.tmp.name, 'queue.json'))
+
+    def _build(self, ffmpeg, job, threads):
+        return [sys.executable, self.encoder, job.input, job.part_path]
+
+    def _add(self, name):
+        return self.queue.add(name, os.path.join(self.tmp.name, name + '_8bit.mkv'), duration=4)
+
+    def test_jobs_run_concurrently_with_progress_and_eta(self):
+        jobs = [self._add(name) for name in ('a', 'b', 'bad', 'c')]
+        updates, done, registered = [], [], []
+        scheduler = module.TranscodeScheduler(
+            self.queue, 'ffmpeg', 2, 4, build=self._build,
+            on_progress=lambda *args: updates.append(args), on_job_done=done.append,
+            register=registered.append)
+        scheduler.run()
+
+        self.assertEqual(sorted(job.input for job in done), ['a', 'b', 'bad', 'c'])
+        self.assertEqual([job.status for job in jobs], ['done', 'done', 'failed', 'done'])
+        self.assertIn('Invalid data', jobs[2].error)
+        self.assertTrue(os.path.exists(jobs[0].output))
+        self.assertFalse(os.path.exists(jobs[0].part_path))
+        self.assertEqual(len(registered), 4)
+        self.assertTrue(any(eta is not None for *_, eta in updates))
+        self.assertEqual(updates[-1][:3], (1.0, 4, 4))
+        with open(self.queue.path, encoding='utf-8') as f:
+            self.assertEqual([j['status'] for j in json.load(f)['jobs']], ['done', 'done', 'failed', 'done'])
+
+    def test_cancel_puts_jobs_back_in_the_queue(self):
+        jobs = [self._add(name) for name in ('slow1', 'slow2', 'slow3')]
+        started = []
+        scheduler = module.TranscodeScheduler(
+            self.queue, 'ffmpeg', 2, 4, build=self._build, register=started.append,
+            cancelled=lambda: len(started) == 2)
+        scheduler.run()
+        self.assertTrue(scheduler.stopping)
+        self.assertEqual([job.status for job in jobs], ['queued'] * 3)
+        self.assertFalse(any(os.path.exists(job.part_path) for job in jobs))
+
+    def test_stop_batch_terminating_ffmpeg_requeues_the_jobs(self):
+        jobs = [self._add(name) for name in ('slow1', 'slow2', 'slow3')]
+        done, stop = [], StopBatch(after=2)
+        scheduler = module.TranscodeScheduler(self.queue, 'ffmpeg', 2, 4, build=self._build,
+                                              on_job_done=done.append, register=stop.procs.append,
+                                              cancelled=stop.cancel.is_set)
+        scheduler.POLL_SECONDS = 2  # the stop lands before run() polls cancelled()
+        scheduler.run()
+        self.assertTrue(stop.stopped.is_set())
+        self.assertTrue(scheduler.stopping)
+        self.assertEqual(done, [])
+        self.assertEqual([job.status for job in jobs], ['queued'] * 3)
+        self.assertFalse(any(os.path.exists(job.part_path) for job in jobs))
+
+    def test_second_run_joins_the_running_scheduler(self):
+        gate = os.path.join(self.tmp.name, 'gate')
+        wait = ('import os, sys, time\n'
+                'while not os.path.exists(sys.argv[1]): time.sleep(0.02)\n'
+                'open(sys.argv[2], "w").write("hevc")')
+
+        def build(ffmpeg, job, threads):
+            return [sys.executable, '-c', wait, gate, job.part_path]
+
+        first = self._add('a')
+        started = []
+        scheduler = module.TranscodeScheduler(self.queue, 'ffmpeg', 1, 4, build=build,
+                                              register=started.append)
+        runner = threading.Thread(target=module.run_scheduler, args=(scheduler,))
+        runner.start()
+        self.addCleanup(scheduler._stop_all)
+        while not started:
+            time.sleep(0.02)
+
+        # A second run mid-encode: the job in progress is not queued again,
+        # the new job goes to the running scheduler and is kept in the file
+        self.assertEqual(module.TranscodeQueue(self.queue.path, requeue_running=False).pending(), [])
+        second = self._add('b')
+        other = module.TranscodeScheduler(self.queue, 'ffmpeg', 1, 4, build=build)
+        self.assertFalse(module.run_scheduler(other))
+        self.assertIs(module.active_scheduler(), scheduler)
+        with open(self.queue.path, encoding='utf-8') as f:
+            self.assertEqual([j['input'] for j in json.load(f)['jobs']], ['a', 'b'])
+
+        open(gate, 'w').close()
+        runner.join(10)
+        self.assertIsNone(module.active_scheduler())
+        self.assertEqual((first.status, second.status), ('done', 'done'))
+        self.assertEqual(len(started), 2)
+
+    def test_process_wide_queue_requeues_only_on_first_load(self):
+        self.addCleanup(setattr, module, '_queue', None)
+        module._queue = None
+        job = self._add('a')
+        self.queue.take()
+        shared = module.get_transcode_queue(self.queue.path)
+        self.assertEqual([j.id for j in shared.pending()], [job.id])
+        shared.take()
+        self.assertIs(module.get_transcode_queue(), shared)
+        self.assertEqual(shared.pending(), [])
+
+
+class SegmentedTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.ffmpeg = self._script('ffmpeg', FAKE_FFMPEG)
+        self.ffprobe = self._script('ffprobe', FAKE_FFPROBE)
+        self.queue = module.TranscodeQueue(os.path.join(self.tmp.name, 'queue.json'))
+        self.source = os.path.join(self.tmp.name, 'film.mkv')
+        with open(self.source, 'w') as f:
+            f.write('4k')
+
+    def _script(self, name, code):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f'#!{sys.executable}\n{code}')
+        os.chmod(path, 0o755)
+        return path
+
+    def _run(self, fail_once='', fail='', hang='', stop=None):
+        os.environ.update(FAIL_ONCE=fail_once, FAIL=fail, HANG=hang)
+        for name in ('FAIL_ONCE', 'FAIL', 'HANG'):
+            self.addCleanup(os.environ.pop, name, None)
+        job = self.queue.add(self.source, os.path.join(self.tmp.name, 'film_8bit.mkv'), duration=3600)
+        started = stop.procs if stop else []
+        scheduler = module.TranscodeScheduler(self.queue, self.ffmpeg, 1, 32, ffprobe=self.ffprobe, cpu_count=32,
+                                              register=started.append,
+                                              cancelled=stop.cancel.is_set if stop else None)
+        if stop:
+            scheduler.POLL_SECONDS = 2  # the stop lands before run() polls cancelled()
+        scheduler.run()
+        return job, started
+
+    @unittest.skipIf(os.name == 'nt', 'fake tools are started through a shebang')
+    def test_long_video_is_encoded_in_segments_and_joined(self):
+        job, started = self._run(fail_once='src_002.mkv')
+        self.assertEqual(job.status, 'done', job.error)
+        with open(job.output) as f:
+            listing = f.read().splitlines()
+        self.assertEqual([os.path.basename(line.split("'")[1]) for line in listing],
+                         ['enc_000.mkv', 'enc_001.mkv', 'enc_002.mkv', 'enc_003.mkv'])
+        # split + 4 segments + 1 retry + concat
+        self.assertEqual(len(started), 7)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, 'film_8bit.segments')))
+
+    @unittest.skipIf(os.name == 'nt', 'fake tools are started through a shebang')
+    def test_segment_that_keeps_failing_fails_the_job(self):
+        job, started = self._run(fail='src_001.mkv')
+        self.assertEqual(job.status, 'failed')
+        self.assertIn('segment 2/4', job.error)
+        self.assertFalse(os.path.exists(job.output))
+
+    @unittest.skipIf(os.name == 'nt', 'fake tools are started through a shebang')
+    def test_stop_batch_keeps_finished_segments_for_resume(self):
+        # split + 4 segments registered, then Stop Batch terminates the two that hang
+        job, _ = self._run(hang='src_001.mkv,src_002.mkv', stop=StopBatch(after=5))
+        work_dir = os.path.join(self.tmp.name, 'film_8bit.segments')
+        self.assertEqual(job.status, 'queued', job.error)
+        self.assertEqual(sorted(n for n in os.listdir(work_dir) if n.startswith('enc_')),
+                         ['enc_000.mkv', 'enc_003.mkv'])
+
+        # Resume: only the two missing segments and the concat run
+        started = []
+        os.environ['HANG'] = ''
+        module.TranscodeScheduler(self.queue, self.ffmpeg, 1, 32, ffprobe=self.ffprobe, cpu_count=32,
+                                  register=started.append).run()
+        self.assertEqual(job.status, 'done', job.error)
+        self.assertEqual(len(started), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,6 @@
 import importlib.util
+import os
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import patch
@@ -39,11 +41,163 @@ class NormalizeLanguageCodeTests(unittest.TestCase):
         class FakeArgos:
             translate = FakeTranslate()
 
+        module.clear_translation_model_cache()
         with patch.object(module, '_import_argos', return_value=FakeArgos()):
             with patch.object(module, 'ensure_language_installed', side_effect=lambda code: (True, code)):
                 with self.assertRaises(Exception):
                     module.load_translation_model('eng', 'dut')
 
 
+class ModelCacheTests(unittest.TestCase):
+    def setUp(self):
+        module.clear_translation_model_cache()
+        self.addCleanup(module.clear_translation_model_cache)
+
+    def test_cached_pair_skips_package_checks(self):
+        with patch.object(module, '_load_translation_model', side_effect=lambda f, t: object()) as loader:
+            first = module.load_translation_model('eng', 'dut')
+            second = module.load_translation_model('en', 'nl')
+        self.assertIs(first, second)
+        self.assertEqual(loader.call_count, 1)
+        self.assertTrue(module.is_translation_model_cached('en', 'nl'))
+
+    def test_least_recently_used_pair_is_evicted(self):
+        with patch.object(module, 'model_cache_limit', return_value=2), \
+                patch.object(module, '_load_translation_model', side_effect=lambda f, t: (f, t)):
+            module.load_translation_model('en', 'nl')
+            module.load_translation_model('en', 'fr')
+            module.load_translation_model('en', 'nl')
+            module.load_translation_model('en', 'de')
+        self.assertTrue(module.is_translation_model_cached('en', 'nl'))
+        self.assertFalse(module.is_translation_model_cached('en', 'fr'))
+        self.assertTrue(module.is_translation_model_cached('en', 'de'))
+
+
+class UpperTranslation:
+    def __init__(self, fail_at=None):
+        self.calls = 0
+        self.fail_at = fail_at
+
+    def translate(self, text):
+        self.calls += 1
+        if self.calls == self.fail_at:
+            raise KeyboardInterrupt
+        return text.upper()
+
+
+def _write_srt(path, count):
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(1, count + 1):
+            f.write(f"{i}\n00:00:{i:02d},000 --> 00:00:{i:02d},500\nline {i}\n\n")
+
+
+class TranslateSrtTests(unittest.TestCase):
+    def test_output_is_committed_atomically(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src, dst = os.path.join(tmp, 'a.srt'), os.path.join(tmp, 'a.nl.srt')
+            _write_srt(src, 3)
+            progress = []
+            module.translate_srt(src, dst, UpperTranslation(),
+                                 progress_callback=lambda cur, tot: progress.append((cur, tot)))
+            with open(dst, encoding='utf-8') as f:
+                text = f.read()
+            self.assertIn('3\n00:00:03,000 --> 00:00:03,500\nLINE 3\n', text)
+            self.assertEqual(progress[0], (0, 3))
+            self.assertEqual(progress[-1], (3, 3))
+            self.assertFalse(os.path.exists(dst + '.part'))
+
+    def test_interrupted_run_resumes_from_checkpoint(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src, dst = os.path.join(tmp, 'a.srt'), os.path.join(tmp, 'a.nl.srt')
+            _write_srt(src, 10)
+            with self.assertRaises(KeyboardInterrupt):
+                module.translate_srt(src, dst, UpperTranslation(fail_at=5),
+                                     checkpoint_every=2, batch_cues=1)
+            self.assertFalse(os.path.exists(dst))
+            self.assertTrue(os.path.exists(dst + '.part'))
+
+            second = UpperTranslation()
+            module.translate_srt(src, dst, second, checkpoint_every=2, batch_cues=1)
+            self.assertEqual(second.calls, 6)
+            with open(dst, encoding='utf-8') as f:
+                text = f.read()
+            self.assertEqual(text.count('-->'), 10)
+            self.assertIn('LINE 1\n', text)
+            self.assertIn('LINE 10\n', text)
+
+
+class BatchedTranslationTests(unittest.TestCase):
+    def _cue(self, start, end, text):
+        srt_cues = module._srt_cues()
+        return srt_cues.Cue(start, end, [text])
+
+    def test_sentence_spans_follow_punctuation_and_pauses(self):
+        cues = [
+            self._cue(0, 900, 'I was thinking'),
+            self._cue(1000, 1900, 'about you.'),
+            self._cue(2000, 2900, 'Really?'),
+            self._cue(9000, 9900, 'And then'),
+            self._cue(20000, 20900, 'much later.'),
+            self._cue(21000, 21900, '- Hi'),
+        ]
+        self.assertEqual(module._sentence_spans(cues), [[0, 1], [2], [3], [4], [5]])
+
+    def test_split_by_weights_keeps_every_word_once(self):
+        text = 'Ik dacht aan jou, de hele nacht lang'
+        pieces = module._split_by_weights(text, [14, 10])
+        self.assertEqual(len(pieces), 2)
+        self.assertEqual(' '.join(pieces), text)
+        self.assertEqual(pieces[0], 'Ik dacht aan jou,')
+
+    def test_batches_use_one_call_and_keep_alignment(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src, dst = os.path.join(tmp, 'a.srt'), os.path.join(tmp, 'a.nl.srt')
+            _write_srt(src, 10)
+            translation = UpperTranslation()
+            module.translate_srt(src, dst, translation, batch_cues=24)
+            self.assertEqual(translation.calls, 1)
+            srt_cues = module._srt_cues()
+            out = srt_cues.parse_srt(dst).cues
+            self.assertEqual(len(out), 10)
+            self.assertEqual(out[3].lines, ['LINE 4'])
+            self.assertEqual((out[3].start, out[3].end), (4000, 4500))
+
+    def test_line_count_mismatch_falls_back_per_span(self):
+        class Joiner(UpperTranslation):
+            def translate(self, text):
+                self.calls += 1
+                return text.replace('\n', ' ').upper()
+
+        translation = Joiner()
+        self.assertEqual(module._translate_spans(translation, ['a.', '', 'b.']), ['A.', '', 'B.'])
+        self.assertEqual(translation.calls, 3)
+
+
+class TranslationMemoryIntegrationTests(unittest.TestCase):
+    def test_second_run_is_served_from_memory(self):
+        tm_path = MODULE_PATH.with_name('translation_memory.py')
+        tm_spec = importlib.util.spec_from_file_location('translation_memory_for_srt', tm_path)
+        tm = importlib.util.module_from_spec(tm_spec)
+        tm_spec.loader.exec_module(tm)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            memory = tm.TranslationMemory(os.path.join(tmp, 'tm.sqlite'), max_entries=1000)
+            self.addCleanup(memory.close)
+            src = os.path.join(tmp, 'a.srt')
+            _write_srt(src, 6)
+
+            first = UpperTranslation()
+            module.translate_srt(src, os.path.join(tmp, 'a.nl.srt'), first,
+                                 memory=memory, lang_pair=('en', 'nl'))
+            second = UpperTranslation()
+            module.translate_srt(src, os.path.join(tmp, 'b.nl.srt'), second,
+                                 memory=memory, lang_pair=('eng', 'dut'))
+
+            self.assertGreater(first.calls, 0)
+            self.assertEqual(second.calls, 0)
+            with open(os.path.join(tmp, 'b.nl.srt'), encoding='utf-8') as f:
+                self.assertIn('LINE 6\n', f.read())
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,87 @@
+import sys
+import tempfile
+import unittest
+
+from actions.tests.worker_fakes import StopBatch, load_subtitles_module, write_fake_worker
+
+
+module = load_subtitles_module('translate_pool.py')
+
+
+# _translate_worker.py replies per job; "hang" waits to be terminated
+FAKE_HANDLER = '''
+    for job in jobs():
+        if job["input"] == "hang":
+            time.sleep(30)
+        if job["input"] == "bad":
+            reply(f"ERROR:{job['id']}:cannot read")
+            continue
+        if job["input"] == "noisy":
+            reply(f"PROGRESS:{job['id']}:1:?")
+            reply(f"PROGRESS:{job['id']}:1:0")
+            reply(f"DONE:{job['id']}:n/a")
+            continue
+        reply(f"PROGRESS:{job['id']}:1:2")
+        reply(f"DONE:{job['id']}:3:1")
+'''
+
+
+class WorkerCountTests(unittest.TestCase):
+    def test_bounded_by_cores_ram_jobs_and_config(self):
+        self.assertEqual(module.default_worker_count(24, cpu_count=16, ram_mb=32000), 4)
+        self.assertEqual(module.default_worker_count(2, cpu_count=16, ram_mb=32000), 2)
+        self.assertEqual(module.default_worker_count(24, cpu_count=16, ram_mb=2400), 2)
+        self.assertEqual(module.default_worker_count(24, cpu_count=16, ram_mb=32000, configured=3), 3)
+        self.assertEqual(module.default_worker_count(24, cpu_count=2), 1)
+
+
+class TranslatePoolTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.worker = write_fake_worker(self.tmp.name, FAKE_HANDLER)
+
+    def _pool(self, **kwargs):
+        return module.TranslatePool([sys.executable], 2, worker_script=self.worker, **kwargs)
+
+    def test_jobs_are_spread_and_results_collected(self):
+        progress, registered = [], []
+        pool = self._pool(on_progress=lambda f, done, total: progress.append((f, done, total)),
+                          register=registered.append)
+        jobs = [module.TranslateJob(i, 'ok' if i != 2 else 'bad', 'out', 'en', 'nl') for i in range(1, 5)]
+        results = pool.run(jobs)
+
+        self.assertEqual(results['1'], (True, ''))
+        self.assertEqual(results['2'], (False, 'cannot read'))
+        self.assertTrue(all(results[str(i)][0] for i in (3, 4)))
+        self.assertEqual(len(registered), 2)
+        self.assertEqual((pool.memory_hits, pool.memory_misses), (9, 3))
+        self.assertEqual(progress[-1], (1.0, 4, 4))
+
+    def test_malformed_lines_are_ignored(self):
+        progress = []
+        pool = self._pool(on_progress=lambda f, done, total: progress.append((f, done, total)))
+        jobs = [module.TranslateJob(1, 'noisy', 'out', 'en', 'nl'), module.TranslateJob(2, 'ok', 'out', 'en', 'nl')]
+        results = pool.run(jobs)
+
+        self.assertEqual(results, {'1': (True, ''), '2': (True, '')})
+        self.assertEqual((pool.memory_hits, pool.memory_misses), (3, 1))
+        self.assertEqual(progress[-1], (1.0, 2, 2))
+
+    def test_cancel_stops_workers(self):
+        jobs = [module.TranslateJob(i, 'hang', 'out', 'en', 'nl') for i in range(1, 4)]
+        pool = self._pool(cancelled=lambda: True)
+        results = pool.run(jobs)
+        self.assertTrue(all(r == (False, 'cancelled') for r in results.values()))
+
+    def test_workers_terminated_by_stop_batch_report_cancelled(self):
+        stop, reported = StopBatch(after=2), []
+        pool = self._pool(register=stop.procs.append, cancelled=stop.cancel.is_set,
+                          on_result=lambda job, ok, message: reported.append(message))
+        pool.POLL_SECONDS = 5  # the stop lands while the pool waits for output
+        results = pool.run(module.TranslateJob(i, 'hang', 'out', 'en', 'nl') for i in range(1, 4))
+        self.assertEqual(results, {str(i): (False, 'cancelled') for i in range(1, 4)})
+        self.assertEqual(reported, ['cancelled', 'cancelled'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / 'lb_files' / 'subtitles' / 'translation_memory.py'
+
+
+spec = importlib.util.spec_from_file_location('translation_memory_direct', MODULE_PATH)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+
+
+class TranslationMemoryTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.db_path = os.path.join(self.tmp.name, 'tm.sqlite')
+        self.memory = module.TranslationMemory(self.db_path, max_entries=1000)
+        self.addCleanup(self.memory.close)
+
+    def test_lookup_uses_normalized_text_and_language_pair(self):
+        self.memory.store('en', 'nl', [('Previously on  Show...', 'Eerder in Show...')])
+        self.assertEqual(
+            self.memory.lookup('en', 'nl', ['Previously on Show...']),
+            {'Previously on Show...': 'Eerder in Show...'},
+        )
+        self.assertEqual(self.memory.lookup('en', 'fr', ['Previously on Show...']), {})
+
+    def test_stats_count_hits_and_misses(self):
+        session = self.memory.session('en', 'nl')
+        session.store([('Yes.', 'Ja.')])
+        session.lookup(['Yes.', 'Yes.', 'No.'])
+        stats = self.memory.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (2, 1, 1))
+        self.assertAlmostEqual(stats['hit_rate'], 2 / 3)
+
+    def test_memory_persists_across_instances(self):
+        self.memory.store('en', 'nl', [('Thank you.', 'Dank je.')])
+        self.memory.close()
+        reopened = module.TranslationMemory(self.db_path)
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.lookup('en', 'nl', ['Thank you.']), {'Thank you.': 'Dank je.'})
+
+    def test_eviction_drops_least_recently_used(self):
+        self.memory.max_entries = 2
+        self.memory.store('en', 'nl', [('a', 'A')])
+        self.memory.store('en', 'nl', [('b', 'B')])
+        self.memory.lookup('en', 'nl', ['a'])
+        self.memory.store('en', 'nl', [('c', 'C')])
+        self.memory.evict()
+        self.assertEqual(sorted(self.memory.lookup('en', 'nl', ['a', 'b', 'c'])), ['a', 'c'])
+
+
+if __name__ == '__main__':
+    unittest.main()
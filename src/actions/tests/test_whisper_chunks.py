@@ -0,0 +1,91 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / 'lb_files' / 'subtitles' / 'whisper_chunks.py'
+
+
+spec = importlib.util.spec_from_file_location('whisper_chunks_direct', MODULE_PATH)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+
+try:
+    import numpy  # noqa: F401
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+class PlanChunksTests(unittest.TestCase):
+    def test_close_regions_are_grouped_and_silence_is_skipped(self):
+        regions = [(10, 20), (22, 30), (200, 210), (212, 215)]
+        chunks = module.plan_chunks(regions, 1000, max_chunk=60, max_gap=5, pad=0)
+        self.assertEqual(chunks, [(10, 30), (200, 215)])
+
+    def test_chunks_are_bounded(self):
+        chunks = module.plan_chunks([(0, 50), (52, 100), (101, 250)], 1000,
+                                    max_chunk=60, max_gap=5, pad=0)
+        self.assertTrue(all(end - start <= 60 for start, end in chunks))
+        self.assertEqual(chunks[0], (0, 50))
+        self.assertEqual(chunks[-1][1], 250)
+
+    def test_padding_stays_inside_the_audio(self):
+        self.assertEqual(module.plan_chunks([(0.1, 9.95)], 10, pad=0.2), [(0.0, 10.0)])
+
+
+class ChunkStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.work_dir = os.path.join(self.tmp.name, 'film.__tmp__.chunks')
+        self.signature = {'video': 'film.mkv', 'size': 1, 'mtime_ns': 2, 'model': 'small', 'language': None}
+
+    def test_finished_chunks_survive_a_restart(self):
+        store = module.ChunkStore(self.work_dir, self.signature)
+        store.save_plan([(0, 10), (60, 70)])
+        store.save_chunk(0, [(1.0, 2.5, 'Hello')])
+
+        again = module.ChunkStore(self.work_dir, self.signature)
+        self.assertEqual(again.chunks, [(0, 10), (60, 70)])
+        self.assertTrue(again.is_done(0))
+        self.assertFalse(again.is_done(1))
+
+        again.save_chunk(1, [(61.0, 62.0, ' '), (3661.5, 3662.0, 'World')])
+        out = os.path.join(self.tmp.name, 'film.srt')
+        self.assertEqual(again.write_srt(out), 2)
+        with open(out, encoding='utf-8') as f:
+            self.assertEqual(f.read(), '1\n00:00:01,000 --> 00:00:02,500\nHello\n\n'
+                                       '2\n01:01:01,500 --> 01:01:02,000\nWorld\n')
+
+    def test_other_signature_starts_over(self):
+        store = module.ChunkStore(self.work_dir, self.signature)
+        store.save_plan([(0, 10)])
+        store.save_chunk(0, [(1.0, 2.0, 'Hello')])
+        changed = module.ChunkStore(self.work_dir, dict(self.signature, size=99))
+        self.assertIsNone(changed.chunks)
+        self.assertFalse(changed.is_done(0))
+
+    @unittest.skipUnless(HAS_NUMPY, 'numpy not installed')
+    def test_speech_regions_are_joined_across_windows(self):
+        pcm = os.path.join(self.tmp.name, 'audio.pcm')
+        with open(pcm, 'wb') as f:
+            f.write(b'\0\0' * module.SAMPLE_RATE * 30)
+        rate = module.SAMPLE_RATE
+
+        def vad(audio):
+            # Speech over the whole 10 s window, except the first window's first 2 s
+            if vad.calls == 0:
+                vad.calls += 1
+                return [{'start': 2 * rate, 'end': len(audio)}]
+            vad.calls += 1
+            return [{'start': 0, 'end': len(audio)}]
+        vad.calls = 0
+
+        self.assertEqual(module.speech_regions(pcm, vad, window_seconds=10), [(2.0, 30.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
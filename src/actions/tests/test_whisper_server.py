@@ -0,0 +1,92 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+from actions.tests.worker_fakes import load_subtitles_module, write_fake_worker
+
+
+module = load_subtitles_module('whisper_server.py')
+
+
+# _whisper_worker.py --serve: model loaded once, IDLE after argv[4] seconds
+# without a job; "crash" kills the process, "bad" fails only that file
+FAKE_HANDLER = '''
+    reply("INFO:Model laden")
+    for job in jobs(idle=float(sys.argv[4])):
+        if job["video"] == "crash":
+            os._exit(3)
+        if job["video"] == "bad":
+            reply("ERROR:cannot decode")
+            continue
+        reply(f"LANG:{job['language'] or 'en'}")
+        reply("PROGRESS:0.5000")
+        with open(job["output"], "w") as f:
+            f.write(str(os.getpid()))
+        reply(f"DONE:{job['output']}")
+    os._exit(0)
+'''
+
+
+class ChunkWorkerCountTests(unittest.TestCase):
+    def test_bounded_by_cores_and_config(self):
+        self.assertEqual(module.default_chunk_workers(cpu_count=16), 4)
+        self.assertEqual(module.default_chunk_workers(cpu_count=64), module.MAX_CHUNK_WORKERS)
+        self.assertEqual(module.default_chunk_workers(cpu_count=2), 1)
+        self.assertEqual(module.default_chunk_workers(cpu_count=16, configured=1), 1)
+
+
+class WhisperServerTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.worker = write_fake_worker(self.tmp.name, FAKE_HANDLER)
+
+    def _server(self, idle_timeout=30):
+        server = module.WhisperServer([sys.executable], 'small', 'cpu', idle_timeout,
+                                      worker_script=self.worker)
+        self.addCleanup(server.close)
+        return server
+
+    def _out(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_worker_is_reused_across_files(self):
+        server = self._server()
+        lines, registered = [], []
+        first = server.transcribe('a.mkv', self._out('a.srt'), None, on_line=lines.append,
+                                  register=registered.append)
+        second = server.transcribe('b.mkv', self._out('b.srt'), 'nl')
+        self.assertEqual(first, (True, 'en', self._out('a.srt')))
+        self.assertEqual(second[:2], (True, 'nl'))
+        self.assertEqual(server.starts, 1)
+        self.assertIn('PROGRESS:0.5000', lines)
+        self.assertEqual(registered, [server.proc])
+
+    def test_error_keeps_worker_and_crash_restarts_it(self):
+        server = self._server()
+        self.assertEqual(server.transcribe('bad', self._out('x.srt')), (False, None, 'cannot decode'))
+        ok, _, message = server.transcribe('crash', self._out('x.srt'))
+        self.assertFalse(ok)
+        self.assertIn('code 3', message)
+        self.assertTrue(server.transcribe('c.mkv', self._out('c.srt'))[0])
+        self.assertEqual(server.starts, 2)
+
+    def test_idle_worker_exits_and_is_started_again(self):
+        server = self._server(idle_timeout=0.3)
+        self.assertTrue(server.transcribe('a.mkv', self._out('a.srt'))[0])
+        time.sleep(1.0)
+        self.assertFalse(server.alive())
+        self.assertTrue(server.transcribe('b.mkv', self._out('b.srt'))[0])
+        self.assertEqual(server.starts, 2)
+
+    def test_cancel_kills_worker(self):
+        server = self._server()
+        result = server.transcribe('a.mkv', self._out('a.srt'), cancelled=lambda: True)
+        self.assertEqual(result, (False, None, 'cancelled'))
+        self.assertIsNone(server.proc)
+
+
+if __name__ == '__main__':
+    unittest.main()
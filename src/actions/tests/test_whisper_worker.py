@@ -0,0 +1,106 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / 'lb_files' / 'subtitles' / '_whisper_worker.py'
+
+
+spec = importlib.util.spec_from_file_location('whisper_worker_direct', MODULE_PATH)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+
+
+class Segment:
+    def __init__(self, start, end, text):
+        self.start, self.end, self.text = start, end, text
+
+
+class Info:
+    language = 'en'
+    language_probability = 0.98
+    duration = 100.0
+
+
+class FakeModel:
+    """One 2 s segment every 4 s; crashes after crash_after segments."""
+
+    def __init__(self, crash_after=None):
+        self.crash_after = crash_after
+        self.calls = []
+
+    def transcribe(self, path, language=None, beam_size=5, clip_timestamps=None):
+        self.calls.append((language, clip_timestamps))
+        # Segments stay on the same 4 s grid after a clip start
+        start = -(-clip_timestamps[0] // 4) * 4 if clip_timestamps else 0.0
+
+        def segments():
+            t = start
+            for n in range(1, 26):
+                if self.crash_after and n > self.crash_after:
+                    raise RuntimeError('worker crashed')
+                if t >= 100:
+                    return
+                yield Segment(t, t + 2, f' line at {int(t)} ')
+                t += 4
+
+        return segments(), Info()
+
+
+class StreamingTranscribeTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.video = os.path.join(self.tmp.name, 'film.mkv')
+        with open(self.video, 'wb') as f:
+            f.write(b'video')
+        self.out = os.path.join(self.tmp.name, 'film.__tmp__.srt')
+
+    def _run(self, model):
+        with redirect_stdout(StringIO()) as output:
+            module.transcribe(model, self.video, self.out, None)
+        return output.getvalue()
+
+    def test_segments_are_streamed_and_renamed_at_the_end(self):
+        output = self._run(FakeModel())
+        self.assertIn('LANG:en', output)
+        self.assertFalse(os.path.exists(self.out + '.part'))
+        self.assertFalse(os.path.exists(self.out + '.ckpt'))
+        with open(self.out, encoding='utf-8') as f:
+            blocks = f.read().split('\n\n')
+        self.assertEqual(len(blocks), 25)
+        self.assertEqual(blocks[-1], '25\n00:01:36,000 --> 00:01:38,000\nline at 96\n')
+
+    def test_crash_resumes_from_checkpoint(self):
+        with self.assertRaises(RuntimeError):
+            self._run(FakeModel(crash_after=13))
+        self.assertFalse(os.path.exists(self.out))
+        self.assertTrue(os.path.exists(self.out + '.ckpt'))
+
+        model = FakeModel()
+        output = self._run(model)
+        # Segment 10 ended at 38 s; the detected language is reused
+        self.assertEqual(model.calls, [('en', [38.0])])
+        self.assertIn('Hervat', output)
+        with open(self.out, encoding='utf-8') as f:
+            blocks = f.read().split('\n\n')
+        self.assertEqual([b.split('\n')[0] for b in blocks], [str(n) for n in range(1, 26)])
+        self.assertIn('line at 36', blocks[9])
+        self.assertIn('line at 40', blocks[10])
+
+    def test_changed_video_starts_over(self):
+        with self.assertRaises(RuntimeError):
+            self._run(FakeModel(crash_after=13))
+        with open(self.video, 'ab') as f:
+            f.write(b'more')
+        model = FakeModel()
+        self._run(model)
+        self.assertEqual(model.calls, [(None, None)])
+
+
+if __name__ == '__main__':
+    unittest.main()
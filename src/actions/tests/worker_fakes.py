@@ -0,0 +1,82 @@
+"""Fake worker processes for the tests of the resident-worker services
+(translate_pool, sync_service, whisper_server), and a Stop Batch stand-in
+that the transcode tests use as well.
+
+A fake worker is RUNNER plus a few lines per protocol: the handler loops over
+jobs() and prints that worker's reply lines, without loading any model.
+"""
+
+import importlib.util
+import os
+import textwrap
+import threading
+import time
+from pathlib import Path
+
+
+SUBTITLES = Path(__file__).resolve().parents[1] / 'lb_files' / 'subtitles'
+
+
+def load_subtitles_module(filename):
+    """Load actions/lb_files/subtitles/<filename> without the GUI packages."""
+    name = Path(filename).stem + '_direct'
+    spec = importlib.util.spec_from_file_location(name, SUBTITLES / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+RUNNER = textwrap.dedent('''
+    import json, os, queue, sys, threading, time
+
+    def jobs(idle=None):
+        """The JSON job sent after each READY; ends on an empty line, or
+        after printing IDLE when no job arrives within idle seconds."""
+        lines = queue.Queue()
+        threading.Thread(target=lambda: [lines.put(l) for l in sys.stdin] + [lines.put("")],
+                         daemon=True).start()
+        while True:
+            print("READY", flush=True)
+            try:
+                line = lines.get(timeout=idle)
+            except queue.Empty:
+                print("IDLE", flush=True)
+                return
+            if not line.strip():
+                return
+            yield json.loads(line)
+
+    def reply(line):
+        print(line, flush=True)
+''')
+
+
+def write_fake_worker(directory, handler):
+    """Write RUNNER + handler to <directory>/fake_worker.py and return its path."""
+    path = os.path.join(directory, 'fake_worker.py')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(RUNNER + textwrap.dedent(handler))
+    return path
+
+
+class StopBatch:
+    """Stop Batch stand-in: once `after` processes are registered it sets the
+    cancel flag and terminates them itself, as stop_batch does - typically
+    between two polls of the scheduler or pool."""
+
+    def __init__(self, after=1):
+        self.after = after
+        self.procs = []
+        self.cancel = threading.Event()
+        self.stopped = threading.Event()
+        threading.Thread(target=self._stop, daemon=True).start()
+
+    def _stop(self):
+        while len(self.procs) < self.after:
+            time.sleep(0.02)
+        time.sleep(0.3)
+        self.cancel.set()
+        for proc in list(self.procs):
+            if proc.poll() is None:
+                proc.terminate()
+        self.stopped.set()
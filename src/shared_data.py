@@ -17,6 +17,7 @@ import tkinter as tk
 from tkinter import font as tkFont
 import customtkinter as ct
 import queue
+import threading
 
 # Avoid importing the entire `utils` package at module-import time to prevent
 # triggering package-level side-effects that can cause circular imports.
@@ -77,6 +78,43 @@ class SharedState:
         # True = batch step done/idle, False = async action still running
         self.batch_step_done: bool = True
 
+        # Subprocesses of the running action, stopped by Stop Batch
+        self._active_processes: set = set()
+        self._active_process = None
+        self._process_lock = threading.Lock()
+
+    def register_process(self, proc):
+        """Track a running subprocess so stop_active_process() can end it."""
+        with self._process_lock:
+            self._active_processes.add(proc)
+
+    def unregister_process(self, proc):
+        with self._process_lock:
+            self._active_processes.discard(proc)
+
+    def set_active_process(self, proc):
+        """Single-process form of register_process (None clears it)."""
+        with self._process_lock:
+            if self._active_process is not None:
+                self._active_processes.discard(self._active_process)
+            self._active_process = proc
+            if proc is not None:
+                self._active_processes.add(proc)
+
+    def stop_active_process(self):
+        """Terminate all tracked subprocesses; True if any was still running."""
+        with self._process_lock:
+            procs = list(self._active_processes)
+        stopped = False
+        for proc in procs:
+            try:
+                if proc.poll() is None:
+                    proc.terminate()
+                    stopped = True
+            except Exception as e:
+                logger.warning(f"⚠️ Could not stop process: {e}")
+        return stopped
+
     def init_fonts(self):
         family = self.config_mgr.get("persistent_cfg", "Font_family", "Arial")
         size = int(self.config_mgr.get("persistent_cfg", "Font_size", 12))
@@ -1,6 +1,6 @@
 from .app_context import AppContext
 from .debug_helpers import test_scandir_lists
-from .scan_helpers import fast_scandir, create_dir_tree, process_gui_queue, apply_segment_filter, update_tblb, update_tb, update_lb, safe_update_tblb, on_toggle, focusin_handler, browse_folder, update_entry, reload, update_folder_path, update_entry_styles, _update_tag_config, update_files_from_selected_folder, wait_for_widget_attr, register_widget
+from .scan_helpers import fast_scandir, process_gui_queue, apply_segment_filter, update_tblb, update_tb, update_lb, safe_update_tblb, on_toggle, focusin_handler, browse_folder, update_entry, reload, rescan, update_folder_path, update_entry_styles, _update_tag_config, update_files_from_selected_folder, wait_for_widget_attr, register_widget
 from .settings_helpers import WatchedDict, set_language, set_appearance_mode, set_color_scheme, set_font_styles, set_icon_styles, set_min_freespace, set_display_mode
 from .shared_utils import get_shared_snapshot, register_shared, find_widget_name, get_settings_file, get_app_name, fils, clean_value, show_dict, show_json_file, log_current_function, sync_all_entries_to_config, audit_entry_data, audit_entries, inspect_widget_tree, run_in_gui
 from .text_helpers import show_message, clear_message, show_tagged_message, tb_update, update_tbinfo, update_tbsettings, log_error, log_settings, clear_tb
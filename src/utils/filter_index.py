@@ -0,0 +1,90 @@
+#-------------------------------------------------------------------------------
+# Name:        filter_index.py
+# Purpose:      - Precomputed lowercase-basename index for the lb_files filter
+#               - Multi-token AND matching, ".ext" tokens match any of the
+#                 given extensions
+#               - A narrowed query refines the previous result set instead of
+#                 scanning all items again
+#               - "lang:nl" tokens match the indexed subtitle language
+#
+# Author:      EddyS
+#
+# Created:     18/10/2026
+# Copyright:   (c) EddyS 2026
+# Licence:     <your licence>
+#-------------------------------------------------------------------------------
+# utils/filter_index.py
+
+import os
+
+
+def parse_query(text):
+    """Split a filter string into (words, extensions, languages).
+
+    "S01 .srt lang:nl" -> (["s01"], [".srt"], ["nl"]). Every word has to
+    match; several extensions or lang: tokens mean any of them.
+    """
+    words, exts, langs = [], [], []
+    for token in text.lower().split():
+        if token.startswith("lang:") and len(token) > 5:
+            langs.append(token[5:])
+        elif token.startswith(".") and len(token) > 1:
+            exts.append(token)
+        else:
+            words.append(token)
+    return words, exts, langs
+
+
+def _narrows(old, new):
+    """True when every item matching new also matches old."""
+    old_words, old_exts, old_langs = old
+    new_words, new_exts, new_langs = new
+    # Extensions are OR-ed like lang: tokens, so adding one widens the result
+    if old_exts and not (new_exts and set(new_exts) <= set(old_exts)):
+        return False
+    if old_langs and not (new_langs and set(new_langs) <= set(old_langs)):
+        return False
+    return all(any(w in nw for nw in new_words) for w in old_words)
+
+
+class FilterIndex:
+    def __init__(self, paths=(), languages=None):
+        self.languages = languages or {}
+        self.rebuild(paths)
+
+    def set_languages(self, languages):
+        """{path: two-letter code} used by lang: tokens."""
+        self.languages = languages
+        self._last_query = None
+        self._last_hits = None
+
+    def rebuild(self, paths):
+        self.paths = list(paths)
+        self.names = [os.path.basename(p).lower() for p in self.paths]
+        self._last_query = None
+        self._last_hits = None
+
+    def _matches(self, i, words, exts, langs):
+        name = self.names[i]
+        if exts and not name.endswith(tuple(exts)):
+            return False
+        if langs and self.languages.get(self.paths[i]) not in langs:
+            return False
+        return all(w in name for w in words)
+
+    def search(self, text):
+        """Matching paths in original order."""
+        query = parse_query(text)
+        words, exts, langs = query
+        if not words and not exts and not langs:
+            self._last_query, self._last_hits = query, None
+            return list(self.paths)
+
+        if self._last_hits is not None and _narrows(self._last_query, query):
+            candidates = self._last_hits
+        else:
+            candidates = range(len(self.paths))
+
+        hits = [i for i in candidates if self._matches(i, words, exts, langs)]
+        self._last_query, self._last_hits = query, hits
+        return [self.paths[i] for i in hits]
@@ -0,0 +1,212 @@
+#-------------------------------------------------------------------------------
+# Name:        lang_index.py
+# Purpose:      - Persistent index of detected subtitle languages
+#               - One row per subtitle: size, mtime, content hash and the
+#                 lang_detect() result
+#               - A touched/copied file with the same content keeps its
+#                 result; changed content is detected again
+#               - Bulk lookup for the file list (colour + "lang:" filter)
+#
+# Author:      EddyS
+#
+# Created:     18/10/2026
+# Copyright:   (c) EddyS 2026
+# Licence:     <your licence>
+#-------------------------------------------------------------------------------
+# utils/lang_index.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+LANG_DB_NAME = "lang_index.sqlite"
+_CHUNK = 400
+
+
+def content_hash(path):
+    """blake2b of the file content (subtitles are small, read in one go)."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _default_db_path():
+    """Next to the other Settings files (frozen-aware)."""
+    try:
+        from config.smart_config_manager import get_config_manager
+        return get_config_manager().config_dir / LANG_DB_NAME
+    except Exception:
+        return Path(__file__).resolve().parents[1] / "Settings" / LANG_DB_NAME
+
+
+def _key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+class LanguageIndex:
+    """path -> (size, mtime_ns, hash, result) in SQLite, plus an in-memory copy.
+
+    result is the lang_detect() tuple:
+    (short2, short3, name, probability, first_text_line).
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = str(db_path) if db_path else None
+        self._lock = threading.Lock()
+        self._conn = None
+        self._db_failed = False
+
+    def _connect(self):
+        if self._conn is not None or self._db_failed:
+            return self._conn
+        try:
+            if self.db_path is None:
+                self.db_path = str(_default_db_path())
+            conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS languages ("
+                " path TEXT PRIMARY KEY,"
+                " size INTEGER NOT NULL,"
+                " mtime_ns INTEGER NOT NULL,"
+                " hash TEXT NOT NULL,"
+                " short2 TEXT NOT NULL,"
+                " short3 TEXT NOT NULL,"
+                " name TEXT NOT NULL,"
+                " prob REAL NOT NULL,"
+                " line TEXT NOT NULL,"
+                " detected_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS languages_hash ON languages (hash)")
+            conn.commit()
+            self._conn = conn
+        except Exception as e:
+            print(f"⚠️ Language index unavailable: {e}")
+            self._db_failed = True
+        return self._conn
+
+    @staticmethod
+    def _row_result(row):
+        return row[0], row[1], row[2], row[3], row[4]
+
+    def get(self, path, size, mtime_ns, hash_fn=content_hash):
+        """Stored result for path, or None when the content is unknown.
+
+        size + mtime match -> stored result without reading the file.
+        Otherwise the content hash decides: same content (touched file, or
+        a copy indexed under another path) reuses the result.
+        """
+        key = _key(path)
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            row = conn.execute(
+                "SELECT short2, short3, name, prob, line, size, mtime_ns"
+                " FROM languages WHERE path = ?", (key,)
+            ).fetchone()
+        if row and row[5] == size and row[6] == mtime_ns:
+            return self._row_result(row)
+
+        try:
+            digest = hash_fn(path)
+        except OSError:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT short2, short3, name, prob, line FROM languages"
+                " WHERE hash = ? ORDER BY path = ? DESC LIMIT 1", (digest, key)
+            ).fetchone()
+        if row is None:
+            return None
+        result = self._row_result(row)
+        self._store(key, size, mtime_ns, digest, result)
+        return result
+
+    def put(self, path, size, mtime_ns, result, digest=None, hash_fn=content_hash):
+        try:
+            digest = digest or hash_fn(path)
+        except OSError:
+            return
+        self._store(_key(path), size, mtime_ns, digest, result)
+
+    def _store(self, key, size, mtime_ns, digest, result):
+        short2, short3, name, prob, line = result
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO languages"
+                    " (path, size, mtime_ns, hash, short2, short3, name, prob, line, detected_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, size, mtime_ns, digest, short2, short3, name, float(prob), line or "", time.time()),
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ Failed to store language: {e}")
+
+    def languages_for(self, paths):
+        """{path: short2} for paths whose stored size + mtime still match.
+
+        No hashing and no detection: this is what the file list calls.
+        """
+        wanted = {}
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            wanted[_key(path)] = (path, st.st_size, st.st_mtime_ns)
+        if not wanted:
+            return {}
+
+        found = {}
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return {}
+            keys = list(wanted)
+            for i in range(0, len(keys), _CHUNK):
+                chunk = keys[i:i + _CHUNK]
+                marks = ",".join("?" * len(chunk))
+                for key, size, mtime_ns, short2 in conn.execute(
+                    f"SELECT path, size, mtime_ns, short2 FROM languages WHERE path IN ({marks})",
+                    chunk,
+                ):
+                    path, cur_size, cur_mtime = wanted[key]
+                    if size == cur_size and mtime_ns == cur_mtime and short2 != "xx":
+                        found[path] = short2
+        return found
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            if conn is not None:
+                conn.execute("DELETE FROM languages")
+                conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_language_index():
+    """Process-wide LanguageIndex on Settings/lang_index.sqlite."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = LanguageIndex(_default_db_path())
+        return _index
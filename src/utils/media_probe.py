@@ -0,0 +1,320 @@
+#-------------------------------------------------------------------------------
+# Name:        media_probe.py
+# Purpose:      - Single entry point for ffprobe stream/format information
+#               - Persistent SQLite cache under Settings/ keyed on
+#                 path + size + mtime, shared by every video/subtitle action
+#
+# Author:      EddyS
+#
+# Created:     18/10/2026
+# Copyright:   (c) EddyS 2026
+# Licence:     <your licence>
+#-------------------------------------------------------------------------------
+# utils/media_probe.py
+#
+# Deleting Settings/media_probe.sqlite only costs one ffprobe per file again.
+
+import os
+import json
+import shutil
+import sqlite3
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+
+PROBE_DB_NAME = "media_probe.sqlite"
+PROBE_ARGS = ["-v", "error", "-print_format", "json", "-show_format", "-show_streams"]
+DEFAULT_PROBE_WORKERS = 8
+
+
+def _no_console_subprocess_kwargs():
+    """Hide console windows for CLI tools when the app runs without a console."""
+    if os.name != 'nt':
+        return {}
+
+    startupinfo = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    return {
+        'startupinfo': startupinfo,
+        'creationflags': getattr(subprocess, 'CREATE_NO_WINDOW', 0),
+    }
+
+
+def _resolve_tools_cfg_path():
+    """Find tools_cfg.json regardless of whether app starts from repo root or src."""
+    candidates = [
+        Path.cwd() / "Settings" / "tools_cfg.json",
+        Path.cwd() / "src" / "Settings" / "tools_cfg.json",
+        Path(__file__).resolve().parents[1] / "Settings" / "tools_cfg.json",
+    ]
+    for path in candidates:
+        if path.exists():
+            return path
+    return None
+
+
+def get_ffprobe_path():
+    """Get ffprobe executable path from PATH or Settings/tools_cfg.json"""
+    if shutil.which("ffprobe"):
+        return "ffprobe"
+
+    try:
+        config_path = _resolve_tools_cfg_path()
+        if config_path:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                tool_path = json.load(f).get("ffprobe_path", "")
+            if tool_path:
+                if os.path.isdir(tool_path):
+                    tool_exe = os.path.join(tool_path, "ffprobe.exe")
+                    if os.path.exists(tool_exe):
+                        return tool_exe
+                elif os.path.exists(tool_path):
+                    return tool_path
+    except Exception as e:
+        print(f"⚠️ Error reading tools config: {e}")
+
+    return "ffprobe"  # Fallback
+
+
+def run_ffprobe(path, ffprobe_path=None):
+    """Run ffprobe once and return the full stream/format JSON (or {"error": ...})."""
+    cmd = [ffprobe_path or get_ffprobe_path(), *PROBE_ARGS, path]
+    try:
+        out = subprocess.check_output(cmd, stderr=subprocess.STDOUT, **_no_console_subprocess_kwargs())
+        return json.loads(out.decode("utf-8", "ignore"))
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _default_db_path():
+    """Place the cache next to the other Settings files (frozen-aware)."""
+    try:
+        from config.smart_config_manager import get_config_manager
+        return get_config_manager().config_dir / PROBE_DB_NAME
+    except Exception:
+        return Path(__file__).resolve().parents[1] / "Settings" / PROBE_DB_NAME
+
+
+def _cache_key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+class ProbeCache:
+    """ffprobe results keyed on path + size + mtime, in memory and on disk.
+
+    A changed size or mtime simply misses, so replaced/re-encoded files are
+    probed again without any explicit invalidation by the caller.
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = str(db_path) if db_path else None
+        self._lock = threading.Lock()
+        self._conn = None
+        self._db_failed = False
+        self._memory = {}
+
+    def _connect(self):
+        if self._conn is not None or self._db_failed:
+            return self._conn
+        try:
+            if self.db_path is None:
+                self.db_path = str(_default_db_path())
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS probes ("
+                " path TEXT PRIMARY KEY,"
+                " size INTEGER NOT NULL,"
+                " mtime_ns INTEGER NOT NULL,"
+                " data TEXT NOT NULL,"
+                " probed_at REAL NOT NULL)"
+            )
+            conn.commit()
+            self._conn = conn
+        except Exception as e:
+            print(f"⚠️ Probe cache unavailable, using memory only: {e}")
+            self._db_failed = True
+        return self._conn
+
+    def get(self, path, size, mtime_ns):
+        key = _cache_key(path)
+        with self._lock:
+            hit = self._memory.get(key)
+            if hit and hit[0] == size and hit[1] == mtime_ns:
+                return hit[2]
+
+            conn = self._connect()
+            if conn is None:
+                return None
+            row = conn.execute(
+                "SELECT size, mtime_ns, data FROM probes WHERE path = ?", (key,)
+            ).fetchone()
+            if not row or row[0] != size or row[1] != mtime_ns:
+                return None
+            try:
+                data = json.loads(row[2])
+            except ValueError:
+                return None
+            self._memory[key] = (size, mtime_ns, data)
+            return data
+
+    def put(self, path, size, mtime_ns, data):
+        key = _cache_key(path)
+        with self._lock:
+            self._memory[key] = (size, mtime_ns, data)
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO probes (path, size, mtime_ns, data, probed_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (key, size, mtime_ns, json.dumps(data), time.time()),
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ Failed to store probe result: {e}")
+
+    def invalidate(self, path):
+        key = _cache_key(path)
+        with self._lock:
+            self._memory.pop(key, None)
+            conn = self._connect()
+            if conn is not None:
+                conn.execute("DELETE FROM probes WHERE path = ?", (key,))
+                conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            conn = self._connect()
+            if conn is not None:
+                conn.execute("DELETE FROM probes")
+                conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_probe_cache = None
+_probe_cache_lock = threading.Lock()
+
+
+def get_probe_cache():
+    """Return the process-wide ProbeCache singleton."""
+    global _probe_cache
+    with _probe_cache_lock:
+        if _probe_cache is None:
+            _probe_cache = ProbeCache()
+        return _probe_cache
+
+
+def probe_media(path, refresh=False, cache=None, runner=None):
+    """Return ffprobe JSON for path, served from the cache when still valid.
+
+    The returned dict is shared between callers - treat it as read-only.
+    Errors are returned as {"error": ...} and never cached.
+    """
+    try:
+        st = os.stat(path)
+    except OSError as e:
+        return {"error": str(e)}
+
+    cache = cache or get_probe_cache()
+    if not refresh:
+        data = cache.get(path, st.st_size, st.st_mtime_ns)
+        if data is not None:
+            return data
+
+    data = (runner or run_ffprobe)(path)
+    if "error" not in data:
+        cache.put(path, st.st_size, st.st_mtime_ns, data)
+    return data
+
+
+def get_probe_workers():
+    """Concurrent ffprobe limit from persistent_cfg "ProbeWorkers" (default 8)."""
+    try:
+        from config.smart_config_manager import get_config_manager
+        value = int(get_config_manager().get("persistent_cfg", "ProbeWorkers", DEFAULT_PROBE_WORKERS))
+    except Exception:
+        value = DEFAULT_PROBE_WORKERS
+    return max(1, value)
+
+
+def probe_many(paths, max_workers=None, cancel_event=None, probe=None):
+    """Probe paths concurrently, yielding (path, data) in completion order.
+
+    At most max_workers ffprobe processes run at once and only that many
+    jobs are queued, so setting cancel_event stops the run after the probes
+    that are already in flight. Cache hits return without a subprocess.
+    """
+    probe = probe or probe_media
+    max_workers = max(1, max_workers or get_probe_workers())
+    pending_paths = iter(paths)
+    running = {}
+
+    def submit_next(executor):
+        if cancel_event is not None and cancel_event.is_set():
+            return False
+        path = next(pending_paths, None)
+        if path is None:
+            return False
+        running[executor.submit(probe, path)] = path
+        return True
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ffprobe")
+    try:
+        while len(running) < max_workers and submit_next(executor):
+            pass
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = running.pop(future)
+                try:
+                    data = future.result()
+                except Exception as e:
+                    data = {"error": str(e)}
+                if cancel_event is not None and cancel_event.is_set():
+                    continue
+                yield path, data
+                submit_next(executor)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+# ───────────────────────────────────────────────
+# ACCESSORS FOR PROBE DATA
+# ───────────────────────────────────────────────
+
+def get_streams(data, codec_type=None):
+    streams = data.get("streams", []) if data else []
+    if codec_type is None:
+        return streams
+    return [st for st in streams if st.get("codec_type") == codec_type]
+
+
+def get_video_stream(data):
+    """First real video stream (cover art attachments are skipped)."""
+    for st in get_streams(data, "video"):
+        if not st.get("disposition", {}).get("attached_pic"):
+            return st
+    return {}
+
+
+def get_duration(data):
+    """Duration in seconds from format or video stream, or None."""
+    if not data or "error" in data:
+        return None
+    for value in (data.get("format", {}).get("duration"), get_video_stream(data).get("duration")):
+        try:
+            if value is not None:
+                return float(value)
+        except (TypeError, ValueError):
+            continue
+    return None
@@ -0,0 +1,227 @@
+#-------------------------------------------------------------------------------
+# Name:        scan_cache.py
+# Purpose:      - Incremental folder scanner for fast_scandir
+#               - Per-directory snapshot (mtime + entries), only directories
+#                 whose mtime changed are listed again
+#               - Produces added/removed file diffs for lb_files
+#               - One scandir per directory: tree rows and classified files
+#                 come from the same listing
+#
+# Author:      EddyS
+#
+# Created:     18/10/2026
+# Copyright:   (c) EddyS 2026
+# Licence:     <your licence>
+#-------------------------------------------------------------------------------
+# utils/scan_cache.py
+#
+# scan() runs on the fast_scandir thread; the UI only gets the lists it builds.
+
+import os
+import threading
+import time
+
+# A directory modified this recently may still change within the same mtime
+# tick, so its snapshot is marked stale and listed again on the next scan.
+RACY_MTIME_NS = 2_000_000_000
+
+VIDEO_EXTS = {".mp4", ".mkv", ".avi", ".mov", ".wmv"}
+SUBTITLE_EXTS = {".srt", ".sub", ".ass", ".vtt"}
+
+
+def classify_name(name):
+    """'video', 'subtitle' or 'other' based on the file extension."""
+    ext = os.path.splitext(name)[1].lower()
+    if ext in VIDEO_EXTS:
+        return "video"
+    if ext in SUBTITLE_EXTS:
+        return "subtitle"
+    return "other"
+
+
+class DirSnapshot:
+    """Entries of one directory as seen at mtime_ns (None = always relist).
+
+    files holds (path, name, kind) tuples, kind as returned by classify_name.
+    """
+    __slots__ = ("mtime_ns", "subdirs", "files", "denied")
+
+    def __init__(self, mtime_ns=None, subdirs=None, files=None, denied=False):
+        self.mtime_ns = mtime_ns
+        self.subdirs = subdirs or []
+        self.files = files or []
+        self.denied = denied
+
+
+def list_dir(path, mtime_ns=None):
+    """One scandir of path; DirEntry type info avoids extra stat calls."""
+    if mtime_ns is not None and time.time_ns() - mtime_ns < RACY_MTIME_NS:
+        mtime_ns = None
+    snap = DirSnapshot(mtime_ns)
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        snap.subdirs.append(entry.path)
+                    elif entry.is_file():
+                        snap.files.append((entry.path, entry.name, classify_name(entry.name)))
+                except OSError:
+                    continue
+    except PermissionError:
+        snap.denied = True
+    except OSError as e:
+        print(f"⚠️ Failed to scan {path}: {e}")
+    return snap
+
+
+class ScanDiff:
+    """Result of IncrementalScanner.scan()."""
+
+    def __init__(self, full=False):
+        self.full = full              # root/mode changed: everything is new
+        self.added = []               # file paths that appeared
+        self.removed = []             # file paths that disappeared
+        self.rescanned = []           # directories that were listed again
+        self.tree_changed = full      # a (sub)directory was added or removed
+
+    def __bool__(self):
+        return self.full or bool(self.added or self.removed or self.tree_changed)
+
+    def __repr__(self):
+        return (f"ScanDiff(full={self.full}, added={len(self.added)}, "
+                f"removed={len(self.removed)}, rescanned={len(self.rescanned)})")
+
+
+class IncrementalScanner:
+    """Keeps directory snapshots of one root between scans.
+
+    The first scan of a root lists every directory. Later scans only stat the
+    known directories and list again the ones whose mtime changed, so a
+    refresh after writing one file costs a single scandir.
+    """
+
+    def __init__(self):
+        self.root = None
+        self.recursive = True
+        self.snapshots = {}
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self.root = None
+            self.snapshots = {}
+
+    def scan(self, root, recursive=True, force=False):
+        root = os.path.normpath(root)
+        with self._lock:
+            if force or root != self.root or recursive != self.recursive:
+                self.root = root
+                self.recursive = recursive
+                self.snapshots = {}
+                diff = ScanDiff(full=True)
+            else:
+                diff = ScanDiff()
+            self._sync(root, diff)
+            return diff
+
+    # ───────────────────────────────────────────────
+    # SNAPSHOT MAINTENANCE
+    # ───────────────────────────────────────────────
+
+    def _in_scope(self, path):
+        """Are this directory's files part of the file list?"""
+        return self.recursive or path == self.root
+
+    def _sync(self, path, diff):
+        old = self.snapshots.get(path)
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            self._drop(path, diff)
+            return
+
+        if old is not None and old.mtime_ns is not None and old.mtime_ns == mtime_ns:
+            snap = old
+        else:
+            snap = list_dir(path, mtime_ns)
+            self.snapshots[path] = snap
+            diff.rescanned.append(path)
+
+            if old is not None:
+                if self._in_scope(path):
+                    new_files = {f[0] for f in snap.files}
+                    old_files = {f[0] for f in old.files}
+                    diff.added.extend(f[0] for f in snap.files if f[0] not in old_files)
+                    diff.removed.extend(f[0] for f in old.files if f[0] not in new_files)
+
+                if snap.subdirs != old.subdirs or snap.denied != old.denied:
+                    diff.tree_changed = True
+                    current = set(snap.subdirs)
+                    for sub in old.subdirs:
+                        if sub not in current:
+                            self._drop(sub, diff)
+            elif self._in_scope(path):
+                diff.added.extend(f[0] for f in snap.files)
+
+        # Non-recursive mode only needs the root listing
+        if self.recursive:
+            for sub in snap.subdirs:
+                self._sync(sub, diff)
+
+    def _drop(self, path, diff):
+        """Forget a directory that disappeared, including its subtree."""
+        snap = self.snapshots.pop(path, None)
+        if snap is None:
+            return
+        diff.tree_changed = True
+        if self._in_scope(path):
+            diff.removed.extend(f[0] for f in snap.files)
+        for sub in snap.subdirs:
+            self._drop(sub, diff)
+
+    # ───────────────────────────────────────────────
+    # VIEWS FOR THE UI
+    # ───────────────────────────────────────────────
+
+    def iter_files(self):
+        """(path, name, kind) in os.walk order (root files first, then subfolders)."""
+        if self.root is None:
+            return
+        stack = [self.root]
+        while stack:
+            path = stack.pop()
+            snap = self.snapshots.get(path)
+            if snap is None:
+                continue
+            yield from snap.files
+            if self.recursive:
+                stack.extend(reversed(snap.subdirs))
+
+    def iter_tree(self):
+        """(depth, path, denied) for every directory below root, depth-first."""
+        if self.root is None:
+            return
+        root_snap = self.snapshots.get(self.root)
+        if root_snap is None:
+            return
+        if root_snap.denied:
+            yield 0, self.root, True
+        stack = [(sub, 1) for sub in reversed(root_snap.subdirs)]
+        while stack:
+            path, depth = stack.pop()
+            snap = self.snapshots.get(path)
+            yield depth, path, bool(snap and snap.denied)
+            if snap is not None:
+                stack.extend((sub, depth + 1) for sub in reversed(snap.subdirs))
+
+
+_scanner = None
+
+
+def get_scanner():
+    """Process-wide scanner used by fast_scandir."""
+    global _scanner
+    if _scanner is None:
+        _scanner = IncrementalScanner()
+    return _scanner
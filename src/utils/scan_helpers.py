@@ -17,7 +17,7 @@ import tkinter as tk
 # Licence:     <your licence>
 #-------------------------------------------------------------------------------
 __all__ = ["apply_segment_filter","browse_folder","fast_scandir","focusin_handler",
-            "get_shared","on_toggle", "process_gui_queue","safe_update_tblb",
+            "get_shared","on_toggle", "process_gui_queue","rescan","safe_update_tblb",
             "test_scandir_lists","update_entry_styles", "update_files_from_selected_folder",
             "update_tblb","wait_for_widget_attr"]
 
@@ -38,83 +38,89 @@ import time
 
 # Remove global s, always use local get_shared() inside functions
 
-def fast_scandir(app,path):
+def fast_scandir(app,path,force=False):
+    """Scan path into the shared lists and refresh tb_folders/lb_files.
 
+    Rescanning the same root is incremental: only folders whose mtime changed
+    are listed again, and nothing is redrawn when nothing changed.
+    """
     # Lazy import to avoid circular import
     from shared_data import get_shared
+    from utils.scan_cache import get_scanner
     s = get_shared()
 
     # Set base_path to the scanned path
     s.base_path = path
 
-    video_exts = {".mp4", ".mkv", ".avi", ".mov", ".wmv"}
-    subtitle_exts = {".srt", ".sub", ".ass", ".vtt"}
-
-    # Clear shared lists
-    s.subfol_lst.clear()
-    s.dirtree_lst.clear()
-    s.files_lst.clear()
-    s.vids_lst.clear()
-    s.subs_lst.clear()
-    s.upd_lst.clear()
-
-    app.file_path_map = {}
-    s.folder_path_map = {}
-    # Ordered list of (display_string, full_path) for building line->path mapping
-    s.dirtree_entries = []
-
-    create_dir_tree(path)
-
     recursive = bool(s.inc_subs_var.get())
-
-
-    def file_generator(root_dir):
-        for root, dirs, files in os.walk(root_dir):
-            if not recursive and root != root_dir:
-                continue
-            for fname in files:
-                yield os.path.join(root, fname)
+    scanner = get_scanner()
 
     def process_files():
-        for file_path in file_generator(path):
-            file_name = os.path.basename(file_path)
-            ext = os.path.splitext(file_name)[1].lower()
+        diff = scanner.scan(path, recursive, force=force)
+        if not diff:
+            print(f"✅ No changes in {path}")
+            return
 
-            s.files_lst.append(file_path)
-            app.file_path_map[file_name] = file_path
-            if ext in video_exts:
-                s.vids_lst.append(file_path)
-            elif ext in subtitle_exts:
-                s.subs_lst.append(file_path)
+        files = list(scanner.iter_files())
+        tree = list(scanner.iter_tree())
 
-        # ✅ Only now, when lists are fully ready, trigger UI updates
-        run_in_gui(lambda: apply_segment_filter())
-        run_in_gui(lambda: update_tblb(get_shared().app))
+        # ✅ Only now, when lists are fully ready, swap them in and update the UI
+        run_in_gui(lambda: _apply_scan(app, diff, files, tree))
 
     threading.Thread(target=process_files, daemon=True).start()
 
-def create_dir_tree(path, indent=0, is_root=True):
+def _apply_scan(app, diff, files, tree):
     from shared_data import get_shared
     s = get_shared()
-    prefix = " " * indent
 
-    if not is_root:
-        folder_display_name = f"{prefix}📁 {os.path.basename(path)}/"
-        s.dirtree_lst.append(folder_display_name)
-        # Keep an ordered list of entries (display, path). We will build a
-        # reliable line->path mapping after rendering the textbox so that
-        # identical basenames at the same indentation do not collide.
-        s.dirtree_entries.append((folder_display_name, path))
+    if diff.full or diff.tree_changed:
+        s.subfol_lst.clear()
+        s.dirtree_lst.clear()
+        # Ordered list of (display_string, full_path) for building line->path mapping
+        s.dirtree_entries = []
+        for depth, dir_path, denied in tree:
+            indent = 4 * depth
+            if depth:
+                display = f"{' ' * indent}📁 {os.path.basename(dir_path)}/"
+                s.dirtree_lst.append(display)
+                s.dirtree_entries.append((display, dir_path))
+            if denied:
+                s.dirtree_lst.append(" " * (indent + 4) + "🚫 [Access Denied]")
 
-    try:
-        with os.scandir(path) as entries:
-            for entry in entries:
-                if entry.is_dir():
-                    create_dir_tree(entry.path, indent + 4, is_root=False)
-    except PermissionError:
-        s.dirtree_lst.append(" " * (indent + 4) + "🚫 [Access Denied]")
-    except Exception as e:
-            print(f"⚠️ Failed to scan {path}: {e}")  # This line remains unchanged
+    s.files_lst.clear()
+    s.vids_lst.clear()
+    s.subs_lst.clear()
+    app.file_path_map = {}
+    # Files come pre-classified from the scandir listing
+    for file_path, file_name, kind in files:
+        s.files_lst.append(file_path)
+        app.file_path_map[file_name] = file_path
+        if kind == "video":
+            s.vids_lst.append(file_path)
+        elif kind == "subtitle":
+            s.subs_lst.append(file_path)
+
+    if diff.full:
+        s.folder_path_map = {}
+        apply_segment_filter()
+        update_tblb(s.app)
+        return
+
+    if diff.tree_changed:
+        update_tb(s.app)
+
+    # Incremental: hand lb_files only what changed
+    s.upd_lst = list(dict.fromkeys(_segment_files(s)))
+    s.app.lb_files.apply_diff(s.upd_lst, diff.added, diff.removed)
+    update_segbut_colors()
+
+def _segment_files(s):
+    mode = s.segbut_var.get() if getattr(s, "segbut_var", None) else None
+    if mode == "Videos":
+        return s.vids_lst
+    if mode == "Subtitles":
+        return s.subs_lst
+    return s.files_lst
 
 def process_gui_queue():
     from shared_data import get_shared
@@ -383,6 +389,22 @@ def reload(app=None):
     print(f"🔄 Reloading: {source_path}")
     fast_scandir(app, source_path)
 
+def rescan(app=None, fallback=None):
+    """Refresh the lists after an action wrote or removed files.
+
+    Rescans the folder on display, so only the changed directories are
+    listed again; fallback is only scanned when nothing was scanned yet.
+    """
+    from shared_data import get_shared
+    s = get_shared()
+    app = app or s.app
+    path = getattr(s, "base_path", None) or fallback
+    if not path:
+        print("⚠️ Cannot determine directory to rescan")
+        return False
+    fast_scandir(app, path)
+    return True
+
 def update_folder_path(entry_key, new_path):
     from utils import log_settings
     from shared_data import get_shared
@@ -448,14 +470,6 @@ def update_files_from_selected_folder(event):
             selected_path = os.path.join(s.base_path, selected_folder)
 
         if selected_path and os.path.isdir(selected_path):
-            s.app.lb_files.listbox.delete(0, tk.END)  # Clear previous files
-            s.files_lst.clear()
-
-            for file in os.listdir(selected_path):
-                if os.path.isfile(os.path.join(selected_path, file)):
-                    s.files_lst.append(file)
-                    s.app.lb_files.listbox.insert(tk.END, file)  # Populate listbox
-
             # Update base_path en de laatst gefocuste smartentry met het gekozen pad
             # s.base_path = selected_path  # Already done in base_textbox.py
             # Update altijd via de SmartEntry wrapper zoals in browse_folder
@@ -471,6 +485,10 @@ def update_files_from_selected_folder(event):
                 # Sync naar config zoals in browse_folder
                 s.config["persistent_cfg"][smart_name] = selected_path
 
+            # The lists only change through the scanner, so its snapshot stays
+            # in step with them (a second scan of this folder is a no-op)
+            fast_scandir(s.app, selected_path)
+
     except Exception as e:
         print(f"Error selecting folder: {e}")
 
@@ -35,6 +35,10 @@ def update_tb(tb_name, msg, tag="normal"):
     
     try:
         tb = getattr(s.app, tb_name)
+        if hasattr(tb, 'queue_line'):
+            # BaseTBox writes queued lines once per frame
+            tb.queue_line(msg, tag)
+            return
         tb.textbox.configure(state="normal")
         tb.textbox.insert("end", msg + "\n", tag)
         tb.textbox.see("end")
@@ -58,6 +62,8 @@ def clear_tb(tb_name):
     
     try:
         tb = getattr(s.app, tb_name)
+        if hasattr(tb, 'discard_pending'):
+            tb.discard_pending()
         tb.textbox.configure(state="normal")
         tb.textbox.delete("1.0", "end")
         tb.textbox.configure(state="disabled")
@@ -97,6 +103,10 @@ def tb_update(tb_widget_or_name, msg, tag="normal"):
         return
     
     try:
+        if hasattr(tb, 'queue_line'):
+            # BaseTBox writes queued lines once per frame
+            tb.queue_line(msg, tag)
+            return
         tb.textbox.configure(state="normal")
         tb.textbox.insert("end", msg + "\n", tag)
         tb.textbox.see("end")
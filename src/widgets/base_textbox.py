@@ -8,7 +8,8 @@
 # Copyright:   (c) EddyS 2025
 # Licence:     <your licence>
 #-------------------------------------------------------------------------------
-import shared_data,os,re
+import shared_data,os,re,threading
+from collections import deque
 # Lazy import: from shared_data import get_shared, get_config
 
 import tkinter as tk
@@ -21,6 +22,10 @@ except Exception:
     def get_appearance_mode():
         return "Dark"
 
+FLUSH_DELAY_MS = 30         # queued lines are written at most once per frame
+DEFAULT_MAX_LINES = 10000   # persistent_cfg "Textbox_Max_Lines", 0 = no cap
+
+
 class BaseTBox(tk.Frame):
     instances = {}
     counter = 0
@@ -91,6 +96,15 @@ class BaseTBox(tk.Frame):
         self.tagcfg = self.config.get("tags_cfg", {})
         self._register_tags()
 
+        # Lines queued by tb_update/update_tb, written in one go per frame
+        self._pending = deque()
+        self._flush_job = None
+        self._idle_job = None
+        try:
+            self.max_lines = int(self.config.get("persistent_cfg", {}).get("Textbox_Max_Lines", DEFAULT_MAX_LINES))
+        except (TypeError, ValueError):
+            self.max_lines = DEFAULT_MAX_LINES
+
     def _register_tags(self):
         # Ensure fallback tag exists
         theme = get_appearance_mode() or "Dark"
@@ -129,11 +143,22 @@ class BaseTBox(tk.Frame):
 
     def update_content(self, msg, default_tag="normal"):
         try:
+            self.flush()  # keep queued lines in front of this message
             highlight_map = self.config.get("highlight_words", {})
             tag_styles = self.config.get("tags_cfg", {})
             smart_tags = self.config.get("smarttag_cfg", {})
             current_tag = default_tag
 
+            # Collect (text, tag) runs; consecutive words with the same tag
+            # become a single insert
+            runs = []
+
+            def add(text, tag):
+                if runs and runs[-1][1] == tag:
+                    runs[-1][0].append(text)
+                else:
+                    runs.append(([text], tag))
+
             for line in msg.split("\n"):
                 current_tag = default_tag  # Reset per line
                 words = line.split(" ")
@@ -157,21 +182,98 @@ class BaseTBox(tk.Frame):
                     # Step 3: Compose display word
                     display_word = f"{emoji} {word}" if emoji else word
 
-                    # Step 4: Insert with resolved tag
-                    self.textbox.insert("end", display_word + " ", tag_from_word)
+                    # Step 4: Add to the run for the resolved tag
+                    add(display_word + " ", tag_from_word)
 
-                self.textbox.insert("end", "\n")
+                # Newline joins the last run so same-tag lines stay one insert
+                add("\n", runs[-1][1] if runs else default_tag)
 
-            self.textbox.see("end")
+            self._insert_runs(runs)
 
         except Exception as e:
             from utils.debug_logger import debug_print
             debug_print(f"⚠️ BaseTBox '{self.name}' update_content failed: {e}", "instantie")
 
+    def _insert_runs(self, runs, trim=False):
+        """One Text.insert call for all runs, then scroll once."""
+        if not runs:
+            return
+        args = []
+        for parts, tag in runs:
+            args.extend(("".join(parts), tag))
+        self.textbox.insert("end", *args)
+        if trim:
+            self._trim()
+        self.textbox.see("end")
+
+    def _trim(self):
+        """Drop the oldest log lines above max_lines (queued output only, so
+        tb_folders' line -> path map is never shifted)."""
+        if not self.max_lines:
+            return
+        line_count = int(self.textbox.index("end-1c").split(".")[0])
+        if line_count > self.max_lines:
+            self.textbox.delete("1.0", f"{line_count - self.max_lines + 1}.0")
+
+    # ───────────────────────────────────────────────
+    # QUEUED OUTPUT (tb_update / update_tb)
+    # ───────────────────────────────────────────────
+
+    def queue_line(self, msg, tag="normal"):
+        """Queue one line; safe to call often and from worker threads."""
+        self._pending.append((msg, tag))
+        if threading.current_thread() is threading.main_thread():
+            # Main-thread actions often only call update_idletasks(), which runs
+            # idle callbacks but never timers: flush on idle so output shows up
+            if self._idle_job is None:
+                try:
+                    self._idle_job = self.after_idle(self.flush)
+                except Exception:
+                    self.flush()
+        elif self._flush_job is None:
+            try:
+                self._flush_job = self.after(FLUSH_DELAY_MS, self.flush)
+            except Exception:
+                self._flush_job = None
+
+    def discard_pending(self):
+        """Drop queued lines that were not written yet (e.g. when clearing)."""
+        self._pending.clear()
+
+    def flush(self):
+        """Write all queued lines now (call before reading the text back)."""
+        for attr in ("_flush_job", "_idle_job"):
+            job = getattr(self, attr)
+            if job is not None:
+                try:
+                    self.after_cancel(job)
+                except Exception:
+                    pass
+                setattr(self, attr, None)
+        if not self._pending:
+            return
+
+        runs = []
+        while self._pending:
+            msg, tag = self._pending.popleft()
+            if runs and runs[-1][1] == tag:
+                runs[-1][0].append(msg + "\n")
+            else:
+                runs.append(([msg + "\n"], tag))
+
+        try:
+            # Same as the old direct tb_update path: read-only after writing
+            self.textbox.configure(state="normal")
+            self._insert_runs(runs, trim=True)
+            self.textbox.configure(state="disabled")
+        except Exception as e:
+            print(f"⚠️ Failed to update {self.name}: {e}")
+
     def insert_with_tags(self, msg, tag="normal"):
         self.update_content(msg, tag)
 
     def set_text(self, text, tag="normal"):
+        self.discard_pending()
         self.textbox.delete("1.0", "end")
         self.textbox.insert("end", text, tag)
         self.textbox.see("end")
@@ -181,6 +283,7 @@ class BaseTBox(tk.Frame):
 
     def clear(self):
         #print(" clear initiated")
+        self.discard_pending()
         try:
             current_state = self.textbox.cget("state")
             self.textbox.configure(state="normal")
@@ -214,6 +317,7 @@ class BaseTBox(tk.Frame):
     def get(self, *args, **kwargs):
         # If specific indices are provided, forward them to the internal Text widget.
         # Otherwise, return the full content (strip trailing newline as before).
+        self.flush()
         try:
             if args or kwargs:
                 return self.textbox.get(*args, **kwargs)
@@ -471,6 +575,7 @@ class BaseTBox(tk.Frame):
     def clear_text(cls, name):
         if name in cls.instances:
             tb = cls.instances[name]
+            tb.discard_pending()  # queued lines belong to the cleared content
             try:
                 current_state = tb.textbox.cget("state")
                 tb.textbox.configure(state="normal")
@@ -31,8 +31,26 @@ class FilterListBox(ct.CTkFrame):
 
         self.s.all_filterboxes.append(self)
 
+        # Filter index over lowercase basenames, rebuilt when items change
+        from utils.filter_index import FilterIndex
+        self.filter_index = FilterIndex(self.items)
+        self._filter_job = None
+
+        # Detected subtitle languages from the persistent index (no detection here)
+        self.languages = {}
+        self._target_lang = None
+
+        # Virtual list (only visible rows drawn) unless Legacy_Listbox is set
+        self.virtual = not self._legacy_listbox_enabled()
+
         self._build_widgets()
 
+    def _legacy_listbox_enabled(self):
+        try:
+            return bool(self.s.config_mgr.get("persistent_cfg", "Legacy_Listbox", False))
+        except Exception:
+            return False
+
     def set_ready_callback(self, callback):
         """Register a callback to be called when the widget is fully initialized."""
         self._on_ready_callback = callback
@@ -47,16 +65,22 @@ class FilterListBox(ct.CTkFrame):
 
         self.entry = ct.CTkEntry(outer)
         self.entry.grid(row=0, column=0, sticky="ew", padx=3, pady=3)
-        self.entry.bind("<KeyRelease>", lambda event: self.filter_listbox())
+        self.entry.bind("<KeyRelease>", lambda event: self._schedule_filter())
+        self.entry.bind("<Return>", lambda event: self.filter_listbox())
         self.entry.bind("<FocusIn>", lambda e: self._update_focus_styles(self.entry))
         self.entry.bind("<FocusOut>", lambda e: self._update_focus_styles(None))
 
-        self.listbox = CTkListbox(outer, multiple_selection=True, fg_color="black", text_color="white")
+        if self.virtual:
+            from widgets.virtual_listbox import VirtualListBox
+            self.listbox = VirtualListBox(outer, fg_color="black", text_color="white")
+        else:
+            self.listbox = CTkListbox(outer, multiple_selection=True, fg_color="black", text_color="white")
         self.listbox.grid(row=1, column=0, sticky="nsew", padx=3, pady=3)
         self.listbox.bind("<FocusIn>", lambda e: self._update_focus_styles(self.listbox))
         self.listbox.bind("<FocusOut>", lambda e: self._update_focus_styles(None))
 
-        self._patch_listbox_delete_all()
+        if not self.virtual:
+            self._patch_listbox_delete_all()
 
         self.initialized = True  # ✅ Widget is now ready
 
@@ -148,14 +172,40 @@ class FilterListBox(ct.CTkFrame):
 
     def set_items(self, full_paths):
         self.items = full_paths
+        self._load_languages()
+        self.filter_index.rebuild(full_paths)
         self.current_items = list(full_paths)
         self.update_listbox(full_paths)
 
+    def apply_diff(self, full_paths, added, removed):
+        """Take over the new item list after an incremental rescan.
+
+        Keeps the current filter text; the widget is only rebuilt when the
+        visible rows actually change.
+        """
+        self.items = list(full_paths)
+        if not added and not removed:
+            return
+
+        self._load_languages()
+        self.filter_index.rebuild(self.items)
+        self._show_filtered(self.filter_index.search(self.entry.get()))
+
     def update_listbox(self, items, color=None):
         if not getattr(self, "initialized", False):
             print("⚠️ FilterListBox not ready — skipping update")
             return
 
+        if self.virtual:
+            # Rows are drawn on demand; selection survives by path
+            self.current_items = list(items)
+            self.listbox.set_rows(
+                [os.path.basename(p) for p in self.current_items],
+                keys=self.current_items,
+                colors=[color or self._resolve_color(p) for p in self.current_items],
+            )
+            return
+
         # ✅ Clear selection first to prevent errors with destroyed widgets
         try:
             # Get all currently selected indices
@@ -197,6 +247,33 @@ class FilterListBox(ct.CTkFrame):
             except Exception as e:
                 print(f"⚠️ Couldn't apply color to item '{filename}': {e}")
 
+    def _load_languages(self):
+        """Languages of the listed subtitles whose size + mtime still match the index."""
+        from utils.scan_cache import SUBTITLE_EXTS
+        subs = [p for p in self.items if os.path.splitext(p)[1].lower() in SUBTITLE_EXTS]
+        try:
+            from utils.lang_index import get_language_index
+            self.languages = get_language_index().languages_for(subs) if subs else {}
+        except Exception as e:
+            print(f"⚠️ Could not read language index: {e}")
+            self.languages = {}
+        self.filter_index.set_languages(self.languages)
+
+    def refresh_languages(self):
+        """Recolour (and re-filter) after a detection pass filled the index."""
+        self._load_languages()
+        self.update_listbox(self.filter_index.search(self.entry.get()))
+
+    def _target_language(self):
+        if self._target_lang is None:
+            try:
+                from actions.lb_files.subtitles.translate_srt_argos import normalize_language_code
+                lang = self.s.config_mgr.get("persistent_cfg", "Language", "nl")
+                self._target_lang = normalize_language_code(lang, default="nl")
+            except Exception:
+                self._target_lang = "nl"
+        return self._target_lang
+
     def _create_button_for(self, filename):
         from customtkinter import CTkButton
         return CTkButton(master=self.listbox, text=filename)
@@ -209,17 +286,44 @@ class FilterListBox(ct.CTkFrame):
         if ext in video_exts:
             return "cyan"
         elif ext in subtitle_exts:
+            # Known language: green when it is the configured language
+            lang = self.languages.get(path)
+            if lang:
+                return "lightgreen" if lang == self._target_language() else "orange"
             return "yellow"
         else:
             return "white"
 
+    def _schedule_filter(self, delay=150):
+        """Debounce typing: filter once the keys have been quiet for delay ms."""
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(delay, self.filter_listbox)
+
     def filter_listbox(self):
-        search = self.entry.get().lower()
-        filtered = [p for p in self.items if search in os.path.basename(p).lower()]
-        self.current_items = filtered
-        self.update_listbox(filtered)
+        """Filter on the entry text: words and .ext tokens must all match."""
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+            self._filter_job = None
+        self._show_filtered(self.filter_index.search(self.entry.get()))
+
+    def _show_filtered(self, filtered):
+        if filtered == self.current_items:
+            return
+        if self.virtual:
+            # Only rows that were not visible yet are built
+            self.current_items = filtered
+            self.listbox.update_rows(
+                filtered,
+                lambda p: (os.path.basename(p), self._resolve_color(p)),
+            )
+        else:
+            self.current_items = filtered
+            self.update_listbox(filtered)
 
     def get_selected_file_paths(self):
+        if self.virtual:
+            return self.listbox.selected_keys()
         return [
             self.current_items[i]
             for i in self.listbox.curselection()
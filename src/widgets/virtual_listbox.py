@@ -0,0 +1,343 @@
+#-------------------------------------------------------------------------------
+# Name:        virtual_listbox.py
+# Purpose:      - Virtualized multi-select listbox for lb_files
+#               - Keeps the full row list in memory and only draws the rows
+#                 inside the viewport on a Canvas (item pool reused on scroll)
+#               - Selection is kept by key (full path), not by widget index
+#               - CTkListbox-compatible subset: curselection, activate,
+#                 deactivate, selection_set/clear, get, insert, delete,
+#                 size, nearest, see
+#
+# Author:      EddyS
+#
+# Created:     18/10/2026
+# Copyright:   (c) EddyS 2026
+# Licence:     <your licence>
+#-------------------------------------------------------------------------------
+
+import tkinter as tk
+import tkinter.font as tkfont
+import customtkinter as ct
+
+
+class VirtualListBox(ct.CTkFrame):
+    def __init__(self, master, fg_color="black", text_color="white",
+                 select_color="#1f538d", font=None, **kwargs):
+        kwargs.setdefault("border_width", 2)
+        super().__init__(master, fg_color=fg_color, **kwargs)
+
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        self.row_bg = fg_color
+        self.text_color = text_color
+        self.select_color = select_color
+
+        # Row model: display text, selection key and colour per row
+        self._texts = []
+        self._keys = []
+        self._colors = []
+        self._index_of = {}       # key -> row index
+        self._selected = set()    # selected keys
+        self._anchor = None       # row index for shift-click ranges
+
+        self._top = 0             # first visible row
+        self._pool = []           # [(rect_id, text_id), ...] reused canvas items
+        self._redraw_pending = False
+
+        self._font = self._to_tk_font(font)
+        self._row_height = self._font.metrics("linespace") + 6
+
+        self.canvas = tk.Canvas(self, bg=fg_color, highlightthickness=0, bd=0)
+        self.canvas.grid(row=0, column=0, sticky="nsew", padx=(3, 0), pady=3)
+        self.scrollbar = ct.CTkScrollbar(self, command=self.yview)
+        self.scrollbar.grid(row=0, column=1, sticky="ns", padx=(0, 3), pady=3)
+
+        self.canvas.bind("<Configure>", lambda e: self._redraw())
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<Shift-Button-1>", self._on_shift_click)
+        self.canvas.bind("<Control-Button-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Button-4>", lambda e: self.yview("scroll", -3, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.yview("scroll", 3, "units"))
+
+    # ───────────────────────────────────────────────
+    # ROW MODEL
+    # ───────────────────────────────────────────────
+
+    def set_rows(self, texts, keys=None, colors=None):
+        """Replace all rows; selected keys that are still present stay selected."""
+        self._texts = list(texts)
+        self._keys = list(keys) if keys is not None else list(self._texts)
+        self._colors = list(colors) if colors is not None else [None] * len(self._texts)
+        self._reindex()
+        self._selected &= self._index_of.keys()
+        self._anchor = None
+        self._top = min(self._top, self._max_top())
+        self._redraw()
+
+    def update_rows(self, keys, make_row):
+        """Switch to a new key list, building rows only for keys not shown yet.
+
+        make_row(key) -> (text, color). Rows that stay keep their text and
+        colour; nothing is redrawn when the key list did not change.
+        Returns (added, removed) counts.
+        """
+        keys = list(keys)
+        if keys == self._keys:
+            return 0, 0
+        old = {k: (self._texts[i], self._colors[i]) for k, i in self._index_of.items()}
+        rows = [old.get(k) or make_row(k) for k in keys]
+        added = sum(1 for k in keys if k not in old)
+        removed = len(old) - (len(keys) - added)
+        self._keys = keys
+        self._texts = [r[0] for r in rows]
+        self._colors = [r[1] for r in rows]
+        self._reindex()
+        self._selected &= self._index_of.keys()
+        self._anchor = None
+        self._top = min(self._top, self._max_top())
+        self._redraw()
+        return added, removed
+
+    def _reindex(self):
+        self._index_of = {key: i for i, key in enumerate(self._keys)}
+
+    def _index(self, index):
+        if index == "end" or index == tk.END:
+            return len(self._texts)
+        return int(index)
+
+    def size(self):
+        return len(self._texts)
+
+    def get(self, first, last=None):
+        if first == "all":
+            return list(self._texts)
+        first = self._index(first)
+        if last is None:
+            return self._texts[first] if 0 <= first < len(self._texts) else None
+        return self._texts[first:self._index(last) + 1]
+
+    def keys(self):
+        return list(self._keys)
+
+    def insert(self, index, text, key=None, color=None):
+        index = min(self._index(index), len(self._texts))
+        self._texts.insert(index, text)
+        self._keys.insert(index, key if key is not None else text)
+        self._colors.insert(index, color)
+        self._reindex()
+        self._redraw()
+
+    def delete(self, first, last=None):
+        if first == "all":
+            first, last = 0, "end"
+        first = self._index(first)
+        last = first if last is None else min(self._index(last), len(self._texts) - 1)
+        removed = self._keys[first:last + 1]
+        del self._texts[first:last + 1]
+        del self._keys[first:last + 1]
+        del self._colors[first:last + 1]
+        self._selected.difference_update(removed)
+        self._reindex()
+        self._top = min(self._top, self._max_top())
+        self._redraw()
+
+    # ───────────────────────────────────────────────
+    # SELECTION (by key)
+    # ───────────────────────────────────────────────
+
+    def curselection(self):
+        return tuple(sorted(self._index_of[k] for k in self._selected if k in self._index_of))
+
+    def selected_keys(self):
+        return [self._keys[i] for i in self.curselection()]
+
+    def activate(self, index):
+        index = self._index(index)
+        if 0 <= index < len(self._keys):
+            self._selected.add(self._keys[index])
+            self._anchor = index
+            self._redraw()
+
+    def deactivate(self, index):
+        if index == "all":
+            self._selected.clear()
+        else:
+            index = self._index(index)
+            if 0 <= index < len(self._keys):
+                self._selected.discard(self._keys[index])
+        self._redraw()
+
+    def selection_set(self, first, last=None):
+        first = self._index(first)
+        last = first if last is None else self._index(last)
+        self._selected.update(self._keys[first:last + 1])
+        self._redraw()
+
+    def selection_clear(self, first=0, last="end"):
+        first = self._index(first)
+        last = self._index(last)
+        self._selected.difference_update(self._keys[first:last + 1])
+        self._redraw()
+
+    def select_keys(self, keys):
+        """Select rows by key; returns how many were found."""
+        found = [k for k in keys if k in self._index_of]
+        self._selected.update(found)
+        self._redraw()
+        return len(found)
+
+    # ───────────────────────────────────────────────
+    # SCROLLING
+    # ───────────────────────────────────────────────
+
+    def _visible_rows(self):
+        height = max(self.canvas.winfo_height(), 1)
+        return max(1, height // self._row_height)
+
+    def _max_top(self):
+        return max(0, len(self._texts) - self._visible_rows())
+
+    def yview(self, *args):
+        if not args:
+            return self._fractions()
+        if args[0] == "moveto":
+            top = int(float(args[1]) * len(self._texts))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if len(args) > 2 and args[2] == "pages":
+                step *= self._visible_rows()
+            top = self._top + step
+        else:
+            return None
+        self._top = max(0, min(top, self._max_top()))
+        self._redraw()
+
+    def see(self, index):
+        index = self._index(index)
+        rows = self._visible_rows()
+        if index < self._top:
+            self._top = index
+        elif index >= self._top + rows:
+            self._top = index - rows + 1
+        self._top = max(0, min(self._top, self._max_top()))
+        self._redraw()
+
+    def nearest(self, y):
+        if not self._texts:
+            return 0
+        return min(self._top + int(y) // self._row_height, len(self._texts) - 1)
+
+    def _fractions(self):
+        total = len(self._texts)
+        if not total:
+            return 0.0, 1.0
+        return self._top / total, min(1.0, (self._top + self._visible_rows()) / total)
+
+    def _on_mousewheel(self, event):
+        self.yview("scroll", -3 if event.delta > 0 else 3, "units")
+
+    # ───────────────────────────────────────────────
+    # MOUSE
+    # ───────────────────────────────────────────────
+
+    def _row_at(self, y):
+        index = self._top + int(y) // self._row_height
+        return index if 0 <= index < len(self._keys) else None
+
+    def _on_click(self, event):
+        self.canvas.focus_set()
+        index = self._row_at(event.y)
+        if index is None:
+            return
+        # Same toggle behaviour as CTkListbox(multiple_selection=True)
+        key = self._keys[index]
+        if key in self._selected:
+            self._selected.discard(key)
+        else:
+            self._selected.add(key)
+        self._anchor = index
+        self._redraw()
+
+    def _on_shift_click(self, event):
+        index = self._row_at(event.y)
+        if index is None:
+            return
+        if self._anchor is None:
+            return self._on_click(event)
+        lo, hi = sorted((self._anchor, index))
+        self._selected.update(self._keys[lo:hi + 1])
+        self._redraw()
+
+    # ───────────────────────────────────────────────
+    # DRAWING
+    # ───────────────────────────────────────────────
+
+    def _ensure_pool(self, count):
+        while len(self._pool) < count:
+            rect = self.canvas.create_rectangle(0, 0, 0, 0, width=0, fill=self.row_bg)
+            text = self.canvas.create_text(6, 0, anchor="w", font=self._font, fill=self.text_color)
+            self._pool.append((rect, text))
+
+    def _redraw(self):
+        """Coalesce redraws: select-all style loops draw once when idle."""
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._draw)
+
+    def _draw(self):
+        self._redraw_pending = False
+        if not self.winfo_exists():
+            return
+        rows = self._visible_rows() + 1
+        self._ensure_pool(rows)
+        width = self.canvas.winfo_width()
+        h = self._row_height
+
+        for slot, (rect, text) in enumerate(self._pool):
+            index = self._top + slot
+            if slot >= rows or index >= len(self._texts):
+                self.canvas.itemconfigure(rect, state="hidden")
+                self.canvas.itemconfigure(text, state="hidden")
+                continue
+            y = slot * h
+            selected = self._keys[index] in self._selected
+            self.canvas.coords(rect, 0, y, width, y + h)
+            self.canvas.itemconfigure(rect, state="normal",
+                                      fill=self.select_color if selected else self.row_bg)
+            self.canvas.coords(text, 6, y + h // 2)
+            self.canvas.itemconfigure(text, state="normal", text=self._texts[index],
+                                      fill=self._colors[index] or self.text_color)
+
+        first, last = self._fractions()
+        self.scrollbar.set(first, last)
+
+    # ───────────────────────────────────────────────
+    # WIDGET API
+    # ───────────────────────────────────────────────
+
+    def _to_tk_font(self, font):
+        if isinstance(font, tkfont.Font):
+            return font
+        if isinstance(font, (tuple, list)):
+            return tkfont.Font(family=font[0], size=font[1] if len(font) > 1 else 12)
+        return tkfont.Font(family="Arial", size=12)
+
+    def configure(self, require_redraw=False, **kwargs):
+        if "font" in kwargs:
+            self._font = self._to_tk_font(kwargs.pop("font"))
+            self._row_height = self._font.metrics("linespace") + 6
+            for _, text in self._pool:
+                self.canvas.itemconfigure(text, font=self._font)
+            self._redraw()
+        if "text_color" in kwargs:
+            self.text_color = kwargs.pop("text_color")
+            self._redraw()
+        if kwargs:
+            super().configure(require_redraw=require_redraw, **kwargs)
+
+    def bind(self, sequence=None, command=None, add=True):
+        # Key/focus events belong to the canvas, which takes the focus on click
+        return self.canvas.bind(sequence, command, add)